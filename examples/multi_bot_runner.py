@@ -6,7 +6,8 @@
 import sys
 from pathlib import Path
 import asyncio
-from typing import List, Dict
+import heapq
+from typing import List, Dict, Tuple
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,29 +17,55 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "packages"))
 sys.path.insert(0, str(project_root))  # ← 添加这一行
 
+from langtrader_core.data import SessionLocal, init_db
+from langtrader_core.services.container import ServiceContainer
 from langtrader_core.utils import get_logger
 
 # 🎯 直接导入 RunOnce（现在 examples 在路径中）
-from examples.run_once import RunOnce
+from examples.run_once import RunOnce, ExchangeRegistry, new_event_loop
 
 logger = get_logger("multi_bot_runner")
 
 
+async def _capture(coro):
+    """
+    执行协程并返回异常而非抛出
+    
+    TaskGroup 在任一任务失败时会取消其余任务，
+    这里保持与 gather(return_exceptions=True) 一致的隔离语义
+    """
+    try:
+        return await coro
+    except Exception as e:
+        return e
+
+
 class MultiBotRunner:
     """
     多 Bot 并发运行器
     管理多个 Bot 的生命周期和并发执行
     """
     
-    def __init__(self, bot_ids: List[int]):
+    def __init__(self, bot_ids: List[int], init_concurrency: int = 4):
         """
         初始化多 Bot 运行器
         
         Args:
             bot_ids: 要运行的 Bot ID 列表
+            init_concurrency: 同时初始化的 Bot 数量上限（避免交易所认证请求洪峰）
         """
         self.bot_ids = bot_ids
+        self.init_concurrency = init_concurrency
         self.runners: Dict[int, RunOnce] = {}
+        
+        # 🎯 所有 Bot 共享服务容器（单进程只需初始化一次），该 session 只供容器加载配置；
+        # 每个 Bot 各自持有 session：一个 Bot 的 flush/commit 失败不会让其他 Bot 的 session 进入待回滚状态
+        init_db()
+        self.session = SessionLocal()
+        self.container = ServiceContainer.get_instance(self.session)
+        
+        # 🎯 相同交易所配置的 Bot 共享 Trader / StreamManager
+        self.exchanges = ExchangeRegistry()
     
     async def initialize_all(self):
         """
@@ -49,21 +76,35 @@ class MultiBotRunner:
         - 如果 Bot 使用独立 workflow，可以完全并发
         """
         logger.info("=" * 60)
-        logger.info(f"🚀 Initializing {len(self.bot_ids)} bots concurrently...")
+        logger.info(f"🚀 Initializing {len(self.bot_ids)} bots concurrently (max {self.init_concurrency} at a time)...")
         logger.info("=" * 60)
         
         # 创建所有 Bot 实例
         for bot_id in self.bot_ids:
-            runner = RunOnce(bot_id=bot_id)
+            runner = RunOnce(
+                bot_id=bot_id,
+                container=self.container,
+                exchange_registry=self.exchanges,
+            )
             self.runners[bot_id] = runner
         
-        # 🎯 并发初始化（auto_sync 内部有锁保护，安全）
-        tasks = [runner.async_init() for runner in self.runners.values()]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # 🎯 并发初始化（auto_sync 内部有锁保护，安全），用信号量限制并发数
+        semaphore = asyncio.Semaphore(self.init_concurrency)
+        
+        async def _init_with_limit(runner: RunOnce):
+            async with semaphore:
+                return await runner.async_init()
+        
+        async with asyncio.TaskGroup() as tg:
+            tasks = {
+                bot_id: tg.create_task(_capture(_init_with_limit(runner)))
+                for bot_id, runner in self.runners.items()
+            }
         
         # 检查初始化结果
         success_count = 0
-        for bot_id, result in zip(self.bot_ids, results):
+        for bot_id, task in tasks.items():
+            result = task.result()
             if isinstance(result, Exception):
                 logger.error(f"❌ Bot {bot_id} initialization failed: {result}")
                 # 移除失败的 Bot
@@ -81,52 +122,71 @@ class MultiBotRunner:
         """
         并发运行所有 Bot 的交易周期
         每个 Bot 按自己的 cycle_interval 独立运行
+        
+        使用单个调度协程 + 最小堆 (截止时间, bot_id)：
+        - 整个运行器只有一个定时器，而不是每个 Bot 一个 sleep
+        - 截止时间按 interval 累加，周期相位固定不漂移
+        - 首个截止时间按序号错开，避免所有 Bot 同时请求交易所
         """
         logger.info("\n" + "=" * 60)
         logger.info("⏰ STARTING MULTI-BOT TIMER LOOP")
         logger.info("=" * 60)
         
-        # 为每个 Bot 创建独立的循环任务
-        tasks = []
-        for bot_id, runner in self.runners.items():
-            tasks.append(self._run_bot_loop(bot_id, runner))
-        
-        # 🎯 并发运行所有 Bot 的循环
-        await asyncio.gather(*tasks, return_exceptions=True)
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        
+        # 🎯 按序号错开启动相位
+        heap: List[Tuple[float, int]] = []
+        for index, (bot_id, runner) in enumerate(self.runners.items()):
+            interval = runner.bot_config['cycle_interval_seconds']
+            offset = (index / len(self.runners)) * interval
+            heapq.heappush(heap, (now + offset, bot_id))
+            logger.info(f"🤖 Bot {bot_id} starting in {offset:.1f}s with {interval}s interval")
+        
+        cycles: Dict[int, int] = {bot_id: 0 for bot_id in self.runners}
+        running: Dict[int, asyncio.Task] = {}
+        
+        async with asyncio.TaskGroup() as tg:
+            while heap:
+                deadline, bot_id = heap[0]
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                heapq.heappop(heap)
+                
+                runner = self.runners[bot_id]
+                interval = runner.bot_config['cycle_interval_seconds']
+                
+                # 上一周期仍在运行时跳过本次，避免同一 Bot 周期重叠
+                previous = running.get(bot_id)
+                if previous is not None and not previous.done():
+                    logger.warning(f"[Bot {bot_id}] ⚠️ Cycle #{cycles[bot_id]} overran its {interval}s interval, skipping a tick")
+                else:
+                    cycles[bot_id] += 1
+                    running[bot_id] = tg.create_task(self._run_cycle(bot_id, runner, cycles[bot_id]))
+                
+                heapq.heappush(heap, (deadline + interval, bot_id))
     
-    async def _run_bot_loop(self, bot_id: int, runner: RunOnce):
+    async def _run_cycle(self, bot_id: int, runner: RunOnce, cycle: int):
         """
-        单个 Bot 的循环任务
+        运行单个 Bot 的一个周期（错误隔离，不影响其他 Bot）
         
         Args:
             bot_id: Bot ID
             runner: RunOnce 实例
+            cycle: 周期序号
         """
-        interval = runner.bot_config['cycle_interval_seconds']
-        cycle = 0
-        
-        logger.info(f"🤖 Bot {bot_id} starting with {interval}s interval")
+        runner.cycle = cycle  # 同步周期数（用于日志和状态文件）
+        logger.debug(f"[Bot {bot_id}] 🔁 CYCLE #{cycle}")
         
         try:
-            while True:
-                cycle += 1
-                logger.info(f"\n[Bot {bot_id}] 🔁 CYCLE #{cycle}")
-                
-                try:
-                    await runner.run()
-                    logger.info(f"[Bot {bot_id}] ✅ Cycle #{cycle} completed")
-                except Exception as e:
-                    logger.error(f"[Bot {bot_id}] ❌ Cycle #{cycle} failed: {e}")
-                
-                logger.info(f"[Bot {bot_id}] ⏳ Sleeping {interval}s...")
-                await asyncio.sleep(interval)
-        
+            await runner.run()
+            logger.debug(f"[Bot {bot_id}] ✅ Cycle #{cycle} completed")
         except asyncio.CancelledError:
             logger.info(f"[Bot {bot_id}] 🛑 Cancelled")
             raise
         except Exception as e:
-            logger.error(f"[Bot {bot_id}] ❌ Fatal error: {e}")
-            raise
+            logger.error(f"[Bot {bot_id}] ❌ Cycle #{cycle} failed: {e}")
     
     async def cleanup_all(self):
         """清理所有 Bot 资源"""
@@ -134,12 +194,14 @@ class MultiBotRunner:
         logger.info("🧹 Cleaning up all bots...")
         logger.info("=" * 60)
         
-        tasks = []
-        for bot_id, runner in self.runners.items():
-            logger.info(f"Cleaning up bot {bot_id}...")
-            tasks.append(runner.cleanup())
+        async with asyncio.TaskGroup() as tg:
+            for bot_id, runner in self.runners.items():
+                logger.info(f"Cleaning up bot {bot_id}...")
+                tg.create_task(_capture(runner.cleanup()))
         
-        await asyncio.gather(*tasks, return_exceptions=True)
+        # 共享资源在所有 Bot 清理（平仓）完成后关闭；各 Bot 的 session 已在 cleanup 中关闭
+        await self.exchanges.close_all()
+        self.session.close()
         
         logger.info("✅ All bots cleaned up")
 
@@ -179,5 +241,8 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    with asyncio.Runner(loop_factory=new_event_loop) as runner:
+        # eager task：任务创建时立即执行到第一次挂起，省去一次调度
+        runner.get_loop().set_task_factory(asyncio.eager_task_factory)
+        runner.run(main())
 
@@ -7,11 +7,18 @@ import sys
 import os
 from pathlib import Path
 import asyncio
+import hashlib
+import time
+import json
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 # add packages directory to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "packages"))
 
+from sqlmodel import Session
 from langtrader_core.data import SessionLocal
 from langtrader_core.data.models.bot import Bot
 from langtrader_core.utils import get_logger
@@ -28,34 +35,127 @@ from langtrader_core.services.status_file import write_bot_status, mark_bot_stop
 from datetime import datetime
 from langchain_core.runnables import RunnableConfig
 
+# uvloop 不支持 Windows，缺失时回退到默认事件循环
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 logger = get_logger("run_once")
 
 
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """创建事件循环（优先使用 uvloop）"""
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+@lru_cache(maxsize=1)
+def _cached_plugins() -> tuple:
+    """
+    列出已发现的插件（进程内只枚举一次）
+    
+    多 Bot 并发初始化时，避免每个 Bot 重复遍历注册表并输出相同日志。
+    必须在插件发现（load_bot_config）之后调用。
+    """
+    plugins = tuple(registry.list_plugins())
+    summary = ", ".join(
+        f"{name} v{version}" for name, version in zip(registry.names, registry.versions)
+    )
+    logger.info(f"✅ Discovered {len(plugins)} plugins: {summary}")
+    return plugins
+
+
+class ExchangeRegistry:
+    """
+    按交易所配置共享 Trader 和 DynamicStreamManager
+    
+    同一进程内多个 Bot 使用相同交易所账户时，只创建一个 CCXT 客户端，
+    共用 WebSocket 连接、认证和市场数据订阅。
+    """
+    
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Trader, DynamicStreamManager]] = {}
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+    
+    @staticmethod
+    def make_key(exchange_config: dict) -> str:
+        """根据交易所配置生成共享 key"""
+        payload = json.dumps(exchange_config, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+    
+    async def get_or_create(self, exchange_config: dict) -> Tuple[Trader, DynamicStreamManager]:
+        """
+        获取共享的 Trader / StreamManager，不存在则创建并初始化
+        
+        Args:
+            exchange_config: 交易所配置
+            
+        Returns:
+            (trader, stream_manager)
+        """
+        key = self.make_key(exchange_config)
+        # 每个 key 一把锁，避免并发初始化时重复创建
+        async with self._locks[key]:
+            if key not in self._entries:
+                trader = Trader(exchange_config)
+                await trader.async_init()
+                self._entries[key] = (trader, DynamicStreamManager(trader))
+                logger.info(f"🔗 Created shared exchange: {exchange_config.get('name')}")
+            else:
+                logger.info(f"🔗 Reusing shared exchange: {exchange_config.get('name')}")
+            return self._entries[key]
+    
+    async def close_all(self):
+        """关闭所有共享的 streams 和交易所连接（每个只关闭一次）"""
+        for trader, stream_manager in self._entries.values():
+            try:
+                await stream_manager.shutdown()
+                await trader.close()
+            except Exception as e:
+                logger.error(f"❌ Failed to close exchange {trader.exchange_display_name}: {e}")
+        self._entries.clear()
+
+
 class RunOnce:
     """
     交易系统运行器（基于数据库配置）
     """
     
-    def __init__(self, bot_id: int = 1):
+    def __init__(
+        self,
+        bot_id: int = 1,
+        session: Optional[Session] = None,
+        container: Optional[ServiceContainer] = None,
+        exchange_registry: Optional[ExchangeRegistry] = None,
+    ):
         """
         初始化
         
         Args:
             bot_id: 要运行的 Bot ID
+            session: 共享的数据库 session（多 Bot 运行器传入，不传则自建）
+            container: 共享的服务容器（不传则使用全局单例）
+            exchange_registry: 共享交易所注册表（不传则独立创建 Trader）
         """
         # ⚠️ 不再调用 init_db()
         # API 服务启动时已经初始化了数据库表结构
         # 多个 bot 子进程同时调用 init_db() 会导致 DDL 锁冲突
         # init_db()
         
-        self.session = SessionLocal()
+        # 只关闭自己创建的 session，共享 session 由调用方负责
+        self._owns_session = session is None
+        self.session = session if session is not None else SessionLocal()
         self.bot_id = bot_id
+        self.exchange_registry = exchange_registry
         self.graph = None
         self.cycle = 0  # 当前周期数
         self.last_error = None  # 最后一次错误
+        self._cycle_count = 0  # run() 调用次数（用于摊销周期性维护任务）
         
         # ✅ 使用服务容器管理共享实例
-        self.container = ServiceContainer.get_instance(self.session)
+        self.container = container or ServiceContainer.get_instance(self.session)
         self.cache = self.container.get_cache()
         self.rate_limiter = self.container.get_rate_limiter()
 
@@ -84,24 +184,23 @@ class RunOnce:
         logger.info(f"✅ Trading Mode: {self.bot_config['trading_mode']}")
         logger.info(f"✅ Timeframes: {self.bot_config_wrapper.timeframes}")
         
-        # 2. 初始化 Trader
-        self.trader = Trader(self.exchange_config)
-        await self.trader.async_init()
+        self.workflow_builder = builder  # 保存 builder 引用以支持追踪（cleanup 也依赖它）
         
-        # ✅ 设置限流器的速率限制
-        if self.trader.exchange:
-            self.rate_limiter.set_rate_limit(self.trader.exchange.rateLimit)
-        
-        # 3. 初始化 Stream Manager
-        logger.info("Initializing dynamic stream manager...")
-        self.stream_manager = DynamicStreamManager(self.trader)
+        # 2. 初始化交易历史仓储和绩效服务（仅依赖 session）
+        logger.info("Initializing trade history and performance services...")
+        self.trade_history_repo = TradeHistoryRepository(self.session)
+        self.performance_service = PerformanceService(self.session)
         
-        # 4. 获取账户信息
-        _account_info = await self.trader.get_account_info()
-        current_balance = _account_info.total.get('USDC', 0) or _account_info.total.get('USDT', 0)
-        self.positions = await self.trader.get_positions()
+        # 3. 并发初始化：交易所（Trader + 账户）与 checkpointer 互不依赖
+        (_account_info, self.positions), _ = await asyncio.gather(
+            self._init_exchange(),
+            builder.prepare_checkpointer(),
+        )
+        # 报价币种在启动时确定，之后每周期只需一次查找（余额为 0 时再重新确定）
+        self._quote_ccy = self._resolve_quote_currency(_account_info.total)
+        current_balance = _account_info.total.get(self._quote_ccy, 0)
         
-        # 4.1 initial_balance 处理：优先从数据库读取，避免重启时覆盖
+        # 4. initial_balance 处理：优先从数据库读取，避免重启时覆盖
         # 这样确保 initial_balance 始终是 bot 创建后第一次获取的账户值
         bot_model = self.session.get(Bot, self.bot_id)
         if bot_model and bot_model.initial_balance is not None:
@@ -118,12 +217,7 @@ class RunOnce:
                 self.session.commit()
                 logger.info(f"💾 Saved initial_balance to database: {self.initial_balance}")
         
-        # 5. 初始化交易历史仓储和绩效服务
-        logger.info("Initializing trade history and performance services...")
-        self.trade_history_repo = TradeHistoryRepository(self.session)
-        self.performance_service = PerformanceService(self.session)
-        
-        # 6. 创建插件上下文（包含共享实例和配置）
+        # 5. 创建插件上下文（包含共享实例和配置）
         context = PluginContext(
             trader=self.trader,
             stream_manager=self.stream_manager,
@@ -135,23 +229,19 @@ class RunOnce:
             bot_config=self.bot_config_wrapper,  # 新增：传递 BotConfig
         )
         
-        # 7. 列出已发现的插件
-        logger.info("🔍 Listing plugins...")
-        plugins = registry.list_plugins() 
-        logger.info(f"✅ Discovered {len(plugins)} plugins")
-        for plugin in plugins:
-            logger.info(f"   - {plugin.name} (v{plugin.version}) by {plugin.author}")
+        # 6. 列出已发现的插件（进程内缓存）
+        plugins = _cached_plugins()
+        logger.debug(f"Using {len(plugins)} discovered plugins")
         
-        # 8. 构建工作流
+        # 7. 构建工作流
         logger.info("🏗️  Building workflow...")
-        self.workflow_builder = builder  # 保存 builder 引用以支持追踪
         self.graph = await builder.build(context)
 
         if self.graph is None:
             logger.error(f'🚨🚨 graph not built yet!')
             raise ValueError(f'🚨🚨 graph not built yet!')
         
-        # 9. 初始化 State
+        # 8. 初始化 State
         self.state = State(
             bot_id=self.bot_id,
             prompt_name = self.bot_config['prompt'], # prompt template
@@ -160,20 +250,56 @@ class RunOnce:
             initial_balance=self.initial_balance,
         )
         
+        # 9. 运行配置在 Bot 生命周期内不变，只构建一次
+        self._runnable_config: RunnableConfig = {
+            "configurable": {
+                "thread_id": f"bot_{self.bot_id}"
+            }
+        }
+        
         # 10. 根据 cycle_interval 动态调整缓存 TTL
         interval = self.bot_config['cycle_interval_seconds']
         self.cache.set_cycle_interval(interval)
         
         logger.info("✅ Async initialization completed")
-        logger.info(f"   Initial balance: {self.initial_balance} USDC")
+        logger.info(f"   Initial balance: {self.initial_balance} {self._quote_ccy}")
         logger.info(f"   Initial positions: {len(self.positions)}")
         logger.info(f"   Cycle interval: {interval}s")
         
         return self
 
+    async def _init_exchange(self):
+        """
+        初始化 Trader / Stream Manager 并获取初始账户和持仓
+        
+        Returns:
+            (account, positions)
+        """
+        # 有注册表时按交易所共享 Trader 和 Stream Manager
+        if self.exchange_registry is not None:
+            self.trader, self.stream_manager = await self.exchange_registry.get_or_create(
+                self.exchange_config
+            )
+        else:
+            self.trader = Trader(self.exchange_config)
+            await self.trader.async_init()
+            logger.info("Initializing dynamic stream manager...")
+            self.stream_manager = DynamicStreamManager(self.trader)
+        
+        # ✅ 设置限流器的速率限制
+        if self.trader.exchange:
+            self.rate_limiter.set_rate_limit(self.trader.exchange.rateLimit)
+        
+        # 获取账户信息和持仓（两个独立请求并发执行）
+        return await asyncio.gather(
+            self.trader.get_account_info(),
+            self.trader.get_positions(),
+        )
+
     async def run(self):
         """运行交易周期"""
-        logger.info(f"🔄 Running trading cycle...")
+        started_at = time.perf_counter()
+        logger.debug("🔄 Running trading cycle...")
         
         # ========== 每轮开始：重置状态 ==========
         # 1. 清理临时数据（避免上一轮数据残留）
@@ -181,63 +307,115 @@ class RunOnce:
         logger.debug("State reset for new cycle")
         
         # 2. 清理过期缓存（防止内存无限增长）
-        cleaned = self.cache.cleanup_expired()
-        if cleaned > 0:
-            logger.debug(f"🧹 Cleaned {cleaned} expired cache entries")
-        
-        # 3. 刷新账户和持仓（从交易所获取最新状态）
+        # 每 16 个周期清理一次：过期条目在 get() 时已惰性失效，这里只回收内存
+        self._cycle_count += 1
+        if self._cycle_count & 0x0F == 0:
+            cleaned = self.cache.cleanup_expired()
+            if cleaned > 0:
+                logger.debug(f"🧹 Cleaned {cleaned} expired cache entries")
+        
+        # 3. 刷新账户和持仓（从交易所获取最新状态，并发请求）
         try:
-            self.state.account = await self.trader.get_account_info()
-            self.state.positions = await self.trader.get_positions()
-            balance = self.state.account.total.get('USDC', 0) or self.state.account.total.get('USDT', 0)
-            logger.info(f"📊 Refreshed: balance={balance:.2f}, positions={len(self.state.positions)}")
+            self.state.account, self.state.positions = await asyncio.gather(
+                self.trader.get_account_info(),
+                self.trader.get_positions(),
+            )
+            logger.debug(f"📊 Refreshed: positions={len(self.state.positions)}")
         except Exception as e:
             logger.error(f"❌ Failed to refresh account/positions: {e}")
         
-        # 4. 刷新数据库会话（避免过期连接）
-        self.session.expire_all()
+        # 4. 刷新 Bot 配置（支持运行中修改配置）
+        # 只刷新 Bot 模型，避免 expire_all 使整个 identity map 失效；
+        # 连接健康由 engine 的 pool_pre_ping 保证
+        try:
+            bot_model = self.bot_config_wrapper.bot
+            if bot_model not in self.session:
+                # release_connection() 之后对象处于 detached 状态，重新关联
+                self.session.add(bot_model)
+            self.session.refresh(bot_model)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to refresh bot config: {e}")
         
         # ========== 运行工作流 ==========
-        config: RunnableConfig = {
-            "configurable": {
-                "thread_id": f"bot_{self.bot_id}"
-            }
-        }
-        
         # 运行图（带追踪支持）
         builder = self.workflow_builder
-        result_dict = await builder.run_with_tracing(self.state, config)
+        result_dict = await builder.run_with_tracing(self.state, self._runnable_config)
         
         # 更新状态（工作流返回的结果）
         if result_dict and isinstance(result_dict, dict):
             if 'symbols' in result_dict:
                 self.state.symbols = result_dict['symbols']
-                logger.info(f"✓ Updated symbols: {len(self.state.symbols)} coins")
+                logger.debug(f"✓ Updated symbols: {len(self.state.symbols)} coins")
             
             if 'account' in result_dict:
                 self.state.account = result_dict['account']
             
             if 'positions' in result_dict:
                 self.state.positions = result_dict['positions']
-                logger.info(f"✓ Updated positions: {len(self.state.positions)}")
+                logger.debug(f"✓ Updated positions: {len(self.state.positions)}")
             
             # 更新辩论决策结果（供状态文件写入和前端展示）
             if 'debate_decision' in result_dict:
                 self.state.debate_decision = result_dict['debate_decision']
-                logger.info("✓ Updated debate_decision")
+                logger.debug("✓ Updated debate_decision")
             
             # 更新批量决策结果
             if 'batch_decision' in result_dict:
                 self.state.batch_decision = result_dict['batch_decision']
-                logger.info("✓ Updated batch_decision")
-        
-        logger.info(f"Current state: {len(self.state.symbols)} symbols selected")
+                logger.debug("✓ Updated batch_decision")
         
         # ========== 写入状态文件（供 API 读取）==========
         self._write_status_file(state="running")
         
+        # 每个周期只输出一行汇总日志（细节见 DEBUG 日志）
+        balance = 0.0
+        if self.state.account:
+            balance = self._quote_balance(self.state.account.total)
+        logger.info(
+            f"📊 bot={self.bot_id} cycle={self.cycle} symbols={len(self.state.symbols)} "
+            f"positions={len(self.state.positions or [])} balance={balance:.2f} "
+            f"dur={time.perf_counter() - started_at:.3f}s"
+        )
+        
         return self.state
     
+    def release_connection(self):
+        """
+        释放 session 持有的数据库连接
+        
+        保持同一个 Session 对象不变：仓储、绩效服务和图节点持有的都是它的引用，
+        替换成新 session 会让这些引用指向已关闭的旧 session。
+        close() 后下一次查询会从连接池取新连接（pool_pre_ping 保证可用）。
+        共享 session 由调用方管理，这里不处理。
+        """
+        if self._owns_session:
+            self.session.close()
+    
+    @staticmethod
+    def _resolve_quote_currency(total: dict) -> str:
+        """
+        确定账户的报价币种
+        
+        优先选择有余额的 USDC，其次 USDT；都没有余额时默认 USDC
+        """
+        for currency in ('USDC', 'USDT'):
+            if total.get(currency):
+                return currency
+        return 'USDC'
+    
+    def _quote_balance(self, total: dict) -> float:
+        """
+        报价币种余额
+        
+        当前币种余额为 0 时重新确定币种：账户可能在启动后才入金，
+        或者只持有 USDT 而启动时余额为 0（此时默认选中了 USDC）
+        """
+        balance = total.get(self._quote_ccy)
+        if not balance:
+            self._quote_ccy = self._resolve_quote_currency(total)
+            balance = total.get(self._quote_ccy)
+        return balance or 0
+    
     def _write_status_file(self, state: str = "running", last_error: str = None):
         """
         写入状态文件，供 API 读取 bot 运行状态
@@ -250,7 +428,7 @@ class RunOnce:
             # 获取余额
             balance = 0.0
             if self.state.account:
-                balance = self.state.account.total.get('USDC', 0) or self.state.account.total.get('USDT', 0)
+                balance = self._quote_balance(self.state.account.total)
             
             # 获取最后决策摘要
             last_decision = None
@@ -373,23 +551,23 @@ class RunOnce:
         if hasattr(self, 'trader'):
             await self._close_all_positions()
 
-        # 1. 关闭 WebSocket streams
-        if hasattr(self, 'stream_manager'):
-            logger.info("Shutting down WebSocket streams...")
-            await self.stream_manager.shutdown()
+        # 1-2. 关闭 WebSocket streams 和 Exchange 连接（共享的由 ExchangeRegistry 统一关闭）
+        if self.exchange_registry is None:
+            if hasattr(self, 'stream_manager'):
+                logger.info("Shutting down WebSocket streams...")
+                await self.stream_manager.shutdown()
 
-        # 2. 关闭 Exchange 连接
-        if hasattr(self, 'trader'):
-            logger.info("Closing exchange connection...")
-            await self.trader.close()
+            if hasattr(self, 'trader'):
+                logger.info("Closing exchange connection...")
+                await self.trader.close()
 
         # 3. 清理 WorkflowBuilder（关闭 PostgreSQL checkpointer）
         if hasattr(self, 'workflow_builder') and self.workflow_builder:
             logger.info("Cleaning up workflow builder...")
             await self.workflow_builder.cleanup()
 
-        # 4. 关闭数据库 session
-        if hasattr(self, 'session'):
+        # 4. 关闭数据库 session（共享 session 由调用方关闭）
+        if hasattr(self, 'session') and self._owns_session:
             logger.info("Closing database session...")
             self.session.close()
 
@@ -493,18 +671,18 @@ async def main():
         consecutive_failures = 0
         max_consecutive_failures = 5  # 连续失败 5 次后退出
         
+        # 按截止时间调度：周期相位固定，不会因 run() 耗时而漂移
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        
         while True:
             cycle += 1
-            logger.info("\n" + "=" * 60)
-            logger.info(f"🔁 CYCLE #{cycle} - {datetime.now()}")
-            logger.info("=" * 60)
+            logger.debug(f"🔁 CYCLE #{cycle} - {datetime.now()}")
             
-            # 每 50 个周期刷新数据库 Session，避免连接老化
+            # 每 50 个周期释放数据库连接，避免连接老化
             if cycle > 1 and cycle % 50 == 0:
-                logger.info("🔄 Refreshing database session (every 50 cycles)...")
-                run_once.session.close()
-                run_once.session = SessionLocal()
-                run_once.container.session = run_once.session
+                logger.info("🔄 Releasing database connection (every 50 cycles)...")
+                run_once.release_connection()
             
             # 周期级别错误隔离：单个周期失败不会导致程序退出
             run_once.cycle = cycle  # 同步周期数
@@ -528,8 +706,14 @@ async def main():
                 
                 logger.warning(f"⚠️ Skipping this cycle, will retry in {interval}s...")
             
-            logger.info(f"\n⏳ Sleeping {interval}s until next cycle...")
-            await asyncio.sleep(interval)
+            next_tick += interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                logger.warning(f"⚠️ Cycle #{cycle} overran by {-delay:.2f}s, starting next cycle now")
+                next_tick = loop.time()
+            else:
+                logger.debug(f"⏳ Sleeping {delay:.1f}s until next cycle...")
+                await asyncio.sleep(delay)
     
     except KeyboardInterrupt:
         logger.info("\n⚠️  Interrupted by user (Ctrl+C)")
@@ -542,4 +726,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    with asyncio.Runner(loop_factory=new_event_loop) as runner:
+        runner.run(main())
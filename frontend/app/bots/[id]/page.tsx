@@ -1,7 +1,7 @@
 'use client'
 
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import { useMemo } from 'react'
+import { useCallback, useMemo } from 'react'
 import { useParams, useRouter } from 'next/navigation'
 import Link from 'next/link'
 import { 
@@ -45,6 +45,7 @@ import { PnLChart } from '@/components/charts/pnl-chart'
 import { MetricsCard } from '@/components/dashboard/metrics-card'
 import { toast } from '@/components/ui/use-toast'
 import { formatCurrency, formatPercent, formatUptime } from '@/lib/utils'
+import { useWebSocket } from '@/hooks/useWebSocket'
 import * as botsApi from '@/lib/api/bots'
 import * as performanceApi from '@/lib/api/performance'
 import * as tradesApi from '@/lib/api/trades'
@@ -67,11 +68,20 @@ export default function BotDetailPage() {
     queryFn: () => botsApi.getBot(botId),
   })
 
-  // 获取 Bot 状态
+  // 状态变化通过 WebSocket 推送，收到后重新拉取；连接断开时回退为 5 秒轮询
+  const handleStatusChange = useCallback(() => {
+    queryClient.invalidateQueries({ queryKey: ['bot-status', botId] })
+  }, [queryClient, botId])
+  const { isConnected: isStatusPushConnected } = useWebSocket({
+    botId,
+    onStatusChange: handleStatusChange,
+  })
+
+  // 获取 Bot 状态（推送可用时仅低频刷新运行时长）
   const { data: status } = useQuery({
     queryKey: ['bot-status', botId],
     queryFn: () => botsApi.getBotStatus(botId),
-    refetchInterval: 5000,
+    refetchInterval: isStatusPushConnected ? 30000 : 5000,
   })
 
   // 获取持仓
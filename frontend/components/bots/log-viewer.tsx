@@ -1,6 +1,6 @@
 'use client'
 
-import { useQuery } from '@tanstack/react-query'
+import { useEffect, useState } from 'react'
 import { RefreshCw, Download } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import * as botsApi from '@/lib/api/bots'
@@ -10,20 +10,45 @@ interface LogViewerProps {
   lines?: number
 }
 
+type StreamState = 'connecting' | 'live' | 'closed'
+
 /**
  * 日志查看器组件
+ * 通过 SSE 日志流实时追加新行，不再定时重新拉取整段日志
  */
 export function LogViewer({ botId, lines = 100 }: LogViewerProps) {
-  const { data, isLoading, refetch, isFetching } = useQuery({
-    queryKey: ['bot-logs', botId, lines],
-    queryFn: () => botsApi.getBotLogs(botId, lines),
-    refetchInterval: 10000, // 每 10 秒自动刷新
-  })
+  const [logLines, setLogLines] = useState<string[]>([])
+  const [state, setState] = useState<StreamState>('connecting')
+  // 递增以重新连接日志流
+  const [connection, setConnection] = useState(0)
+
+  useEffect(() => {
+    const controller = new AbortController()
+    setLogLines([])
+    setState('connecting')
+
+    botsApi
+      .streamBotLogs(
+        botId,
+        lines,
+        (received) => setLogLines((prev) => [...prev, ...received].slice(-lines)),
+        controller.signal,
+        () => setState('live')
+      )
+      .catch(() => {})
+      .finally(() => {
+        if (!controller.signal.aborted) setState('closed')
+      })
+
+    return () => controller.abort()
+  }, [botId, lines, connection])
+
+  const logs = logLines.length > 0 ? logLines.join('\n') + '\n' : ''
 
   const handleDownload = () => {
-    if (!data?.logs) return
+    if (!logs) return
     
-    const blob = new Blob([data.logs], { type: 'text/plain' })
+    const blob = new Blob([logs], { type: 'text/plain' })
     const url = URL.createObjectURL(blob)
     const a = document.createElement('a')
     a.href = url
@@ -38,22 +63,24 @@ export function LogViewer({ botId, lines = 100 }: LogViewerProps) {
       <div className="flex items-center justify-between">
         <p className="text-sm text-muted-foreground">
           Showing last {lines} lines
+          {state === 'live' && ' · Live'}
+          {state === 'closed' && ' · Disconnected'}
         </p>
         <div className="flex gap-2">
           <Button 
             variant="outline" 
             size="sm"
-            onClick={() => refetch()}
-            disabled={isFetching}
+            onClick={() => setConnection((n) => n + 1)}
+            disabled={state === 'connecting'}
           >
-            <RefreshCw className={`h-4 w-4 mr-1 ${isFetching ? 'animate-spin' : ''}`} />
-            Refresh
+            <RefreshCw className={`h-4 w-4 mr-1 ${state === 'connecting' ? 'animate-spin' : ''}`} />
+            Reconnect
           </Button>
           <Button 
             variant="outline" 
             size="sm"
             onClick={handleDownload}
-            disabled={!data?.logs}
+            disabled={!logs}
           >
             <Download className="h-4 w-4 mr-1" />
             Download
@@ -63,14 +90,14 @@ export function LogViewer({ botId, lines = 100 }: LogViewerProps) {
 
       {/* 日志内容 */}
       <div className="bg-background border rounded-lg p-4 h-[500px] overflow-auto">
-        {isLoading ? (
+        {logs ? (
+          <pre className="text-xs font-mono whitespace-pre-wrap text-muted-foreground">
+            {logs}
+          </pre>
+        ) : state === 'connecting' ? (
           <div className="text-muted-foreground animate-pulse">
             Loading logs...
           </div>
-        ) : data?.logs ? (
-          <pre className="text-xs font-mono whitespace-pre-wrap text-muted-foreground">
-            {data.logs}
-          </pre>
         ) : (
           <div className="text-muted-foreground text-center py-8">
             No logs available
@@ -3,7 +3,7 @@
  * 提供 Bot 管理相关的所有 API 调用
  */
 
-import { get, post, patch, del } from './client'
+import { get, post, patch, del, APIError, API_BASE_URL, DEFAULT_API_KEY } from './client'
 import type {
   BotSummary,
   BotDetail,
@@ -109,6 +109,43 @@ export async function getBotLogs(botId: number, lines?: number): Promise<{
   return get(`/api/v1/bots/${botId}/logs`, { lines })
 }
 
+/**
+ * 订阅 Bot 实时日志流（SSE）
+ * 先收到最近 lines 行，之后只推送新写入的行；signal 中止时结束
+ * EventSource 不能设置 X-API-Key 头，这里用 fetch 读取事件流
+ */
+export async function streamBotLogs(
+  botId: number,
+  lines: number,
+  onLines: (lines: string[]) => void,
+  signal: AbortSignal,
+  onOpen?: () => void
+): Promise<void> {
+  const response = await fetch(
+    `${API_BASE_URL}/api/v1/bots/${botId}/logs/stream?lines=${lines}`,
+    { headers: { 'X-API-Key': DEFAULT_API_KEY }, signal }
+  )
+  if (!response.ok || !response.body) {
+    throw new APIError('Log stream failed', response.status, `HTTP_${response.status}`)
+  }
+  onOpen?.()
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+  let buffer = ''
+  while (true) {
+    const { value, done } = await reader.read()
+    if (done) return
+    buffer += value
+    // 事件以空行分隔，最后一段可能还没收完
+    const events = buffer.split('\n\n')
+    buffer = events.pop() ?? ''
+    const received = events
+      .filter((event) => event.startsWith('data: '))
+      .map((event) => event.slice('data: '.length))
+    if (received.length > 0) onLines(received)
+  }
+}
+
 // =============================================================================
 // AI Debate Types
 // =============================================================================
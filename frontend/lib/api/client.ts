@@ -170,5 +170,5 @@ export async function del<T = void>(path: string): Promise<T> {
   return request<T>(path, { method: 'DELETE' })
 }
 
-export { API_BASE_URL }
+export { API_BASE_URL, DEFAULT_API_KEY }
 
@@ -1,7 +1,7 @@
 """
 Authentication module
 """
-from langtrader_api.auth.api_key import validate_api_key
+from langtrader_api.auth.api_key import validate_api_key, is_valid_api_key
 
-__all__ = ["validate_api_key"]
+__all__ = ["validate_api_key", "is_valid_api_key"]
 
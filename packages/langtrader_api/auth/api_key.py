@@ -5,6 +5,20 @@ Simple header-based authentication for internal/single-user usage
 from fastapi import HTTPException, Header, status
 from langtrader_api.config import settings
 
+# Hoisted once at import: the hot path does one global load + set lookup
+_API_KEYS: frozenset[str] = settings.api_keys_set
+
+
+def is_valid_api_key(api_key: str | None) -> bool:
+    """
+    Check an API key against the configured keys
+    
+    A single frozenset lookup (hash + equality on the matching bucket).
+    """
+    if not isinstance(api_key, str) or not api_key:
+        return False
+    return api_key in _API_KEYS
+
 
 async def validate_api_key(
     x_api_key: str = Header(
@@ -22,7 +36,7 @@ async def validate_api_key(
     Raises:
         HTTPException: If API key is invalid
     """
-    if x_api_key not in settings.API_KEYS:
+    if not is_valid_api_key(x_api_key):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or missing API Key",
@@ -45,7 +59,7 @@ async def validate_api_key_optional(
     if x_api_key is None:
         return None
     
-    if x_api_key not in settings.API_KEYS:
+    if not is_valid_api_key(x_api_key):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API Key",
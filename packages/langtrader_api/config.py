@@ -1,10 +1,13 @@
 """
 Configuration management using Pydantic Settings
 """
-from pydantic_settings import BaseSettings
+import json
+import sys
+
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 from pydantic import field_validator
-from typing import List, Optional
-from functools import lru_cache
+from typing import Annotated, List, Optional
+from functools import cached_property
 
 
 class Settings(BaseSettings):
@@ -19,10 +22,11 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     
     # Security
-    API_KEYS: List[str] = ["dev-key-123"]
+    # NoDecode: 原始字符串交给 parse_comma_separated 处理（支持 JSON 数组和逗号分隔）
+    API_KEYS: Annotated[List[str], NoDecode] = ["dev-key-123"]
     
     # CORS
-    CORS_ORIGINS: List[str] = [
+    CORS_ORIGINS: Annotated[List[str], NoDecode] = [
         "http://localhost:3000",
         "http://localhost:8080",
         "http://127.0.0.1:3000",
@@ -43,22 +47,41 @@ class Settings(BaseSettings):
     @field_validator("API_KEYS", "CORS_ORIGINS", mode="before")
     @classmethod
     def parse_comma_separated(cls, v):
-        """Parse comma-separated string into list"""
-        if isinstance(v, str):
-            return [x.strip() for x in v.split(",") if x.strip()]
-        return v
+        """
+        Parse a JSON array or comma-separated string into list
+        
+        Values are interned so hot-path comparisons (API key checks) can
+        short-circuit on identity.
+        """
+        if not isinstance(v, str):
+            return v
+        v = v.strip()
+        if v.startswith("["):
+            return [sys.intern(x) if isinstance(x, str) else x for x in json.loads(v)]
+        # 常见情况：单个值，无需 split
+        if "," not in v:
+            return [sys.intern(v)] if v else []
+        return [sys.intern(x) for x in map(str.strip, v.split(",")) if x]
+    
+    @cached_property
+    def api_keys_set(self) -> frozenset[str]:
+        """API Keys as a frozenset for O(1) membership checks"""
+        return frozenset(self.API_KEYS)
     
-    model_config = {
-        "env_file": ".env",
-        "case_sensitive": True,
-    }
+    # extra="ignore": .env 与 docker-compose 共用（POSTGRES_* 等），忽略非本类字段
+    # frozen=True: 只在启动时加载一次，api_keys_set 等缓存不会因字段被改写而失效
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        extra="ignore",
+        frozen=True,
+    )
 
 
-@lru_cache()
-def get_settings() -> Settings:
-    """Get cached settings instance"""
-    return Settings()
+settings = Settings()
 
 
-settings = get_settings()
+def get_settings() -> Settings:
+    """Get the module-level settings instance"""
+    return settings
 
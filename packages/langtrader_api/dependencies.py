@@ -2,18 +2,52 @@
 Dependency Injection for FastAPI
 Integrates with langtrader_core services
 """
-from typing import Annotated, Generator
+import asyncio
+import importlib
+import time
+from typing import TYPE_CHECKING, Annotated, Any, Generator
 from fastapi import Depends, HTTPException, Header, status
 from sqlmodel import Session
 
-from langtrader_core.data import SessionLocal, init_db
-from langtrader_core.data.repositories.bot import BotRepository
-from langtrader_core.data.repositories.trade_history import TradeHistoryRepository
-from langtrader_core.data.repositories.workflow import WorkflowRepository
-from langtrader_core.data.repositories.exchange import ExchangeRepository
-from langtrader_core.data.repositories.llm_config import LLMConfigRepository
-from langtrader_core.services.performance import PerformanceService
-from langtrader_api.config import settings
+from langtrader_core.data import SessionLocal, RequestSessionLocal, init_db
+from langtrader_core.data.database import engine
+from langtrader_core.utils import get_logger
+from langtrader_api.auth.api_key import is_valid_api_key
+from langtrader_api.services.backtest_runner import init_backtest_queue, close_backtest_queue
+from langtrader_api.services.backtest_store import backtest_store
+from langtrader_api.services import exchange_client
+from langtrader_api.websocket.status_publisher import status_publisher
+
+if TYPE_CHECKING:
+    from langtrader_core.data.repositories.bot import BotRepository
+    from langtrader_core.data.repositories.trade_history import TradeHistoryRepository
+    from langtrader_core.data.repositories.workflow import WorkflowRepository
+    from langtrader_core.data.repositories.exchange import ExchangeRepository
+    from langtrader_core.data.repositories.llm_config import LLMConfigRepository
+    from langtrader_core.services.performance import PerformanceService
+
+
+# 仓储/服务类按需导入（PEP 562），避免导入本模块时拉起 numpy 等重依赖
+_LAZY_IMPORTS = {
+    "BotRepository": "langtrader_core.data.repositories.bot",
+    "TradeHistoryRepository": "langtrader_core.data.repositories.trade_history",
+    "WorkflowRepository": "langtrader_core.data.repositories.workflow",
+    "ExchangeRepository": "langtrader_core.data.repositories.exchange",
+    "LLMConfigRepository": "langtrader_core.data.repositories.llm_config",
+    "PerformanceService": "langtrader_core.services.performance",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value
+    return value
+
+
+logger = get_logger("api.dependencies")
 
 
 # =============================================================================
@@ -21,12 +55,9 @@ from langtrader_api.config import settings
 # =============================================================================
 
 def get_db() -> Generator[Session, None, None]:
-    """Get database session"""
-    db = SessionLocal()
-    try:
+    """Get request-scoped database session (attributes stay loaded after commit)"""
+    with RequestSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 # =============================================================================
@@ -44,7 +75,7 @@ async def validate_api_key(
         async def protected_route(api_key: APIKey):
             ...
     """
-    if x_api_key not in settings.API_KEYS:
+    if not is_valid_api_key(x_api_key):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API Key",
@@ -57,46 +88,62 @@ async def validate_api_key(
 # Repository Dependencies
 # =============================================================================
 
-def get_bot_repository(
-    db: Annotated[Session, Depends(get_db)]
-) -> BotRepository:
-    """Get BotRepository instance"""
-    return BotRepository(db)
-
-
-def get_trade_history_repository(
-    db: Annotated[Session, Depends(get_db)]
-) -> TradeHistoryRepository:
-    """Get TradeHistoryRepository instance"""
-    return TradeHistoryRepository(db)
-
-
-def get_workflow_repository(
-    db: Annotated[Session, Depends(get_db)]
-) -> WorkflowRepository:
-    """Get WorkflowRepository instance"""
-    return WorkflowRepository(db)
-
-
-def get_exchange_repository(
-    db: Annotated[Session, Depends(get_db)]
-) -> ExchangeRepository:
-    """Get ExchangeRepository instance"""
-    return ExchangeRepository(db)
-
-
-def get_llm_config_repository(
-    db: Annotated[Session, Depends(get_db)]
-) -> LLMConfigRepository:
-    """Get LLMConfigRepository instance"""
-    return LLMConfigRepository(db)
+class Repos:
+    """
+    请求级仓储集合
+    
+    路由只需声明一个 ReposDep；仓储在首次访问时创建并缓存，
+    共享同一个请求 Session。
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self._instances: dict[type, Any] = {}
+    
+    def _get(self, cls: type) -> Any:
+        repo = self._instances.get(cls)
+        if repo is None:
+            repo = self._instances[cls] = cls(self.db)
+        return repo
+    
+    @property
+    def bot(self) -> "BotRepository":
+        from langtrader_core.data.repositories.bot import BotRepository
+        return self._get(BotRepository)
+    
+    @property
+    def trade(self) -> "TradeHistoryRepository":
+        from langtrader_core.data.repositories.trade_history import TradeHistoryRepository
+        return self._get(TradeHistoryRepository)
+    
+    @property
+    def workflow(self) -> "WorkflowRepository":
+        from langtrader_core.data.repositories.workflow import WorkflowRepository
+        return self._get(WorkflowRepository)
+    
+    @property
+    def exchange(self) -> "ExchangeRepository":
+        from langtrader_core.data.repositories.exchange import ExchangeRepository
+        return self._get(ExchangeRepository)
+    
+    @property
+    def llm_config(self) -> "LLMConfigRepository":
+        from langtrader_core.data.repositories.llm_config import LLMConfigRepository
+        return self._get(LLMConfigRepository)
+    
+    @property
+    def perf(self) -> "PerformanceService":
+        from langtrader_core.services.performance import PerformanceService
+        service = self._instances.get(PerformanceService)
+        if service is None:
+            # 与 repos.trade 共用同一个 TradeHistoryRepository
+            service = self._instances[PerformanceService] = PerformanceService(self.db, repo=self.trade)
+        return service
 
 
-def get_performance_service(
-    db: Annotated[Session, Depends(get_db)]
-) -> PerformanceService:
-    """Get PerformanceService instance"""
-    return PerformanceService(db)
+def get_repos(db: Annotated[Session, Depends(get_db)]) -> Repos:
+    """Get request-scoped repository bundle"""
+    return Repos(db)
 
 
 # =============================================================================
@@ -105,41 +152,82 @@ def get_performance_service(
 
 DbSession = Annotated[Session, Depends(get_db)]
 APIKey = Annotated[str, Depends(validate_api_key)]
-BotRepo = Annotated[BotRepository, Depends(get_bot_repository)]
-TradeRepo = Annotated[TradeHistoryRepository, Depends(get_trade_history_repository)]
-WorkflowRepo = Annotated[WorkflowRepository, Depends(get_workflow_repository)]
-ExchangeRepo = Annotated[ExchangeRepository, Depends(get_exchange_repository)]
-LLMConfigRepo = Annotated[LLMConfigRepository, Depends(get_llm_config_repository)]
-PerfService = Annotated[PerformanceService, Depends(get_performance_service)]
+ReposDep = Annotated[Repos, Depends(get_repos)]
 
 
 # =============================================================================
 # Startup/Shutdown Hooks
 # =============================================================================
 
-async def init_services():
-    """Initialize services on application startup"""
+# 后台初始化（插件发现/同步/默认配置）完成后置位
+plugins_ready = asyncio.Event()
+
+
+async def init_services_critical():
+    """Initialize services required before accepting requests"""
+    # 1. 初始化数据库表结构，同时预热连接池（两者互不依赖）
+    t0 = time.perf_counter()
+    _, warmed = await asyncio.gather(asyncio.to_thread(init_db), _warm_db_pool())
+    logger.info(f"✅ Database ready, {warmed} pooled connections warmed ({(time.perf_counter() - t0) * 1000:.0f}ms)")
+    
+    # 回测结果存储：Redis 不可达时回退到进程内存储
+    await backtest_store.connect()
+    
+    # 回测任务队列（未配置 Redis 时为空操作）
+    await init_backtest_queue()
+    
+    # WebSocket bot 状态推送
+    status_publisher.start()
+
+
+async def _warm_db_pool() -> int:
+    """
+    并发建立 pool_size 个连接后全部归还，首批请求无需等待建连
+    
+    连接需同时持有，否则连接池会反复复用同一个连接。
+    """
+    conns = await asyncio.gather(
+        *(asyncio.to_thread(engine.raw_connection) for _ in range(engine.pool.size())),
+        return_exceptions=True,
+    )
+    warmed = 0
+    for conn in conns:
+        if isinstance(conn, BaseException):
+            logger.debug(f"Pool warm-up connection failed: {conn}")
+            continue
+        conn.close()
+        warmed += 1
+    return warmed
+
+
+def init_services_background():
+    """
+    初始化非关键服务（在后台线程运行，不阻塞端口开放）
+    
+    插件发现和插件同步都是幂等的（默认系统配置已由 init_db 写入），
+    需要插件数据的路由通过 wait_plugins_ready() 等待完成。
+    """
     from langtrader_core.plugins.registry import registry
     from langtrader_core.plugins.auto_sync import PluginAutoSync
     from langtrader_core.data.models.workflow import Workflow
     from sqlmodel import select
     from datetime import datetime
     
-    # 1. 初始化数据库表结构
-    init_db()
-    
     # 2. 发现所有插件（注册到内存）
+    t0 = time.perf_counter()
     registry.discover_plugins("langtrader_core.graph.nodes")
-    print(f"✅ Discovered {len(registry._metadata)} plugins")
+    logger.info(f"✅ Discovered {len(registry._metadata)} plugins ({(time.perf_counter() - t0) * 1000:.0f}ms)")
     
     # 3. 确保数据库中有默认 Workflow
     db = SessionLocal()
     try:
-        statement = select(Workflow)
-        existing_workflows = db.exec(statement).all()
+        t0 = time.perf_counter()
+        # 只取最早一条 workflow 的 id，不加载整表
+        workflow_id = db.exec(select(Workflow.id).order_by(Workflow.id).limit(1)).first()
         
-        if not existing_workflows:
+        if workflow_id is None:
             # 创建默认 workflow
+            now = datetime.now()
             default_workflow = Workflow(
                 name="debate_trading",
                 display_name="Multi-Agent Debate Trading",
@@ -147,116 +235,53 @@ async def init_services():
                 description="AI multi-agent debate workflow for trading decisions",
                 category="trading",
                 is_active=True,
-                created_at=datetime.now(),
-                updated_at=datetime.now(),
+                created_at=now,
+                updated_at=now,
             )
             db.add(default_workflow)
-            db.commit()
-            db.refresh(default_workflow)
+            # 只 flush 取得 id，与下面的插件同步一起提交
+            db.flush()
             workflow_id = default_workflow.id
-            print(f"✅ Created default workflow: {default_workflow.name} (id={workflow_id})")
+            logger.info(f"✅ Created default workflow: {default_workflow.name} (id={workflow_id})")
         else:
-            workflow_id = existing_workflows[0].id
-            print(f"ℹ️ Using existing workflow: {existing_workflows[0].name} (id={workflow_id})")
+            logger.info(f"ℹ️ Using existing workflow (id={workflow_id})")
         
         # 4. 同步插件到数据库（创建 workflow_nodes 和 workflow_edges）
         syncer = PluginAutoSync(db)
-        stats = syncer.sync_if_needed(workflow_id)
-        print(f"✅ Plugin sync: {stats['added']} nodes, {stats['edges_created']} edges created")
-        
-        # 5. 初始化默认系统配置
-        _init_default_system_configs(db)
+        stats = syncer.sync_if_needed(workflow_id, autocommit=False)
+        db.commit()
+        logger.info(
+            f"✅ Plugin sync: {stats['added']} nodes, {stats['edges_created']} edges created "
+            f"({(time.perf_counter() - t0) * 1000:.0f}ms)"
+        )
         
     except Exception as e:
-        print(f"❌ Init services failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"❌ Init services failed: {e}", exc_info=True)
     finally:
         db.close()
 
 
-def _init_default_system_configs(db):
-    """
-    初始化默认系统配置
-    使用 upsert 逻辑：不存在则创建，存在则跳过（不覆盖用户修改）
-    """
-    from langtrader_core.data.repositories.system_config import SystemConfigRepository
+def start_background_init() -> asyncio.Task:
+    """在线程池中启动后台初始化，完成（无论成功失败）后置位 plugins_ready"""
+    task = asyncio.create_task(asyncio.to_thread(init_services_background))
     
-    # 默认配置列表（从现有数据库导出）
-    DEFAULT_CONFIGS = [
-        # ============ 缓存配置 ============
-        {"config_key": "cache.ttl.tickers", "config_value": "10", "value_type": "integer", "category": "cache", "description": "行情数据缓存时间(秒)"},
-        {"config_key": "cache.ttl.ohlcv_3m", "config_value": "300", "value_type": "integer", "category": "cache", "description": "3分钟K线缓存时间(秒)"},
-        {"config_key": "cache.ttl.ohlcv_4h", "config_value": "3600", "value_type": "integer", "category": "cache", "description": "4小时K线缓存时间(秒)"},
-        {"config_key": "cache.ttl.ohlcv", "config_value": "600", "value_type": "integer", "category": "cache", "description": "默认K线缓存时间(秒)"},
-        {"config_key": "cache.ttl.orderbook", "config_value": "60", "value_type": "integer", "category": "cache", "description": "订单簿缓存时间(秒)"},
-        {"config_key": "cache.ttl.trades", "config_value": "60", "value_type": "integer", "category": "cache", "description": "成交记录缓存时间(秒)"},
-        {"config_key": "cache.ttl.markets", "config_value": "3600", "value_type": "integer", "category": "cache", "description": "市场信息缓存时间(秒)"},
-        {"config_key": "cache.ttl.open_interests", "config_value": "600", "value_type": "integer", "category": "cache", "description": "持仓量缓存时间(秒)"},
-        {"config_key": "cache.ttl.coin_selection", "config_value": "600", "value_type": "integer", "category": "cache", "description": "选币缓存时间(秒)"},
-        {"config_key": "cache.ttl.backtest_ohlcv", "config_value": "604800", "value_type": "integer", "category": "cache", "description": "回测数据缓存时间(秒)", "is_editable": False},
-        
-        # ============ 交易配置 ============
-        {"config_key": "trading.min_cycle_interval", "config_value": "60", "value_type": "integer", "category": "trading", "description": "最小交易周期(秒)"},
-        {"config_key": "trading.max_concurrent_requests", "config_value": "10", "value_type": "integer", "category": "trading", "description": "API最大并发数"},
-        {"config_key": "trading.default_timeframes", "config_value": '["3m", "4h"]', "value_type": "json", "category": "trading", "description": "默认时间框架"},
-        {"config_key": "trading.default_ohlcv_limit", "config_value": "100", "value_type": "integer", "category": "trading", "description": "默认K线数据量"},
-        
-        # ============ API 限流配置 ============
-        {"config_key": "api.rate_limit.binance", "config_value": "1200", "value_type": "integer", "category": "api", "description": "Binance API限制(/分钟)", "is_editable": False},
-        {"config_key": "api.rate_limit.bybit", "config_value": "120", "value_type": "integer", "category": "api", "description": "Bybit API限制(/分钟)", "is_editable": False},
-        {"config_key": "api.rate_limit.hyperliquid", "config_value": "600", "value_type": "integer", "category": "api", "description": "Hyperliquid API限制(/分钟)", "is_editable": False},
-        {"config_key": "api.default_rate_limit", "config_value": "60", "value_type": "integer", "category": "api", "description": "未知交易所默认限制(/分钟)", "is_editable": False},
-        
-        # ============ 系统配置 ============
-        {"config_key": "system.config_cache_ttl", "config_value": "60", "value_type": "integer", "category": "system", "description": "配置缓存时间(秒)"},
-        {"config_key": "system.enable_hot_reload", "config_value": "true", "value_type": "boolean", "category": "system", "description": "是否启用配置热重载"},
-        
-        # ============ 辩论配置 ============
-        {"config_key": "debate.enabled", "config_value": "true", "value_type": "boolean", "category": "debate", "description": "是否启用辩论机制"},
-        {"config_key": "debate.max_rounds", "config_value": "2", "value_type": "integer", "category": "debate", "description": "最大辩论轮数"},
-        {"config_key": "debate.timeout_per_phase", "config_value": "120", "value_type": "integer", "category": "debate", "description": "每阶段超时（秒）"},
-        {"config_key": "debate.trade_history_limit", "config_value": "10", "value_type": "integer", "category": "debate", "description": "注入的交易历史条数"},
-        
-        # ============ 批量决策配置 ============
-        {"config_key": "batch_decision.max_total_allocation_pct", "config_value": "80.0", "value_type": "float", "category": "batch_decision", "description": "最大总仓位百分比"},
-        {"config_key": "batch_decision.max_single_allocation_pct", "config_value": "40.0", "value_type": "float", "category": "batch_decision", "description": "单币种最大仓位百分比"},
-        {"config_key": "batch_decision.min_cash_reserve_pct", "config_value": "20.0", "value_type": "float", "category": "batch_decision", "description": "最小现金储备百分比"},
-        {"config_key": "batch_decision.timeout_seconds", "config_value": "360", "value_type": "integer", "category": "batch_decision", "description": "LLM 调用超时（秒）"},
-        
-        # ============ 辩论角色配置（4 角色：分析师、多头、空头、风控） ============
-        {"config_key": "debate.roles", "config_value": '''[
-    {"id": "analyst", "name": "市场分析师", "name_en": "Market Analyst", "focus": "技术分析、趋势判断、关键支撑阻力位识别", "style": "客观、数据驱动、全面分析", "priority": 1},
-    {"id": "bull", "name": "多头交易员", "name_en": "Bull Trader", "focus": "寻找做多机会、识别上涨信号、评估做多胜率", "style": "积极、寻找机会、乐观但有依据", "priority": 2},
-    {"id": "bear", "name": "空头交易员", "name_en": "Bear Trader", "focus": "寻找做空机会、识别下跌信号、评估做空胜率", "style": "谨慎、识别风险、寻找下行机会", "priority": 2},
-    {"id": "risk_manager", "name": "风险经理", "name_en": "Risk Manager", "focus": "评估交易风险、验证仓位合理性、确保止损止盈设置正确", "style": "平衡、风险意识、促成合理交易", "priority": 3}
-]''', "value_type": "json", "category": "debate", "description": "辩论角色列表（JSON 数组）"},
-    ]
+    def _on_done(t: asyncio.Task):
+        if not t.cancelled() and t.exception() is not None:
+            logger.error(f"❌ Background init failed: {t.exception()}", exc_info=t.exception())
+        plugins_ready.set()
     
-    repo = SystemConfigRepository(db)
-    created_count = 0
-    
-    for config in DEFAULT_CONFIGS:
-        existing = repo.get_by_key(config["config_key"])
-        if not existing:
-            # 只创建不存在的配置，不覆盖已有配置
-            repo.upsert(
-                config_key=config["config_key"],
-                config_value=config["config_value"],
-                value_type=config.get("value_type", "string"),
-                category=config.get("category"),
-                description=config.get("description"),
-                is_editable=config.get("is_editable", True),
-            )
-            created_count += 1
-    
-    if created_count > 0:
-        print(f"✅ Created {created_count} default system configs")
-    else:
-        print(f"ℹ️ All {len(DEFAULT_CONFIGS)} default system configs already exist")
+    task.add_done_callback(_on_done)
+    return task
+
+
+async def wait_plugins_ready():
+    """等待后台插件发现完成"""
+    await plugins_ready.wait()
 
 
 async def shutdown_services():
     """Cleanup services on application shutdown"""
-    pass
+    await status_publisher.stop()
+    await close_backtest_queue()
+    await exchange_client.close_all()
 
@@ -7,8 +7,10 @@ LangTrader API - FastAPI Application Entry Point
 - 加密存储敏感信息
 - WebSocket 安全认证
 """
+import asyncio
+import orjson
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
@@ -16,12 +18,18 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from langtrader_api.config import settings
-from langtrader_api.dependencies import init_services, shutdown_services
+from langtrader_api.dependencies import (
+    init_services_critical,
+    start_background_init,
+    shutdown_services,
+)
 from langtrader_api.routes.v1 import router as v1_router
 from langtrader_api.websocket.handlers import router as ws_router
 from langtrader_api.middleware.error_handler import setup_exception_handlers
 from langtrader_api.middleware.rate_limiter import limiter, rate_limit_exceeded_handler
 from langtrader_api.services.bot_manager import bot_manager
+from langtrader_api.services.backtest_store import backtest_store
+from langtrader_api.services.backtest_runner import shutdown_backtest_executor
 
 
 # =============================================================================
@@ -79,11 +87,17 @@ tags_metadata = [
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifecycle management"""
-    # Startup
-    await init_services()
+    # Startup: 只等待数据库就绪（含默认配置），插件发现/同步在后台完成
+    await init_services_critical()
+    background_init = start_background_init()
     yield
     # Shutdown
+    if not background_init.done():
+        # 线程中的初始化无法取消，等待其写完数据库再退出
+        await asyncio.wait({background_init})
     await bot_manager.stop_all()
+    shutdown_backtest_executor()
+    await backtest_store.close()
     await shutdown_services()
 
 
@@ -222,12 +236,14 @@ app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 # Middleware
 # =============================================================================
 
+# Starlette 对每个跨域请求执行 origin in allow_origins，传 frozenset 使其为 O(1) 查找；
+# allow_methods 保持元组以固定 Access-Control-Allow-Methods 的顺序，allow_headers 由 Starlette 自行规范化
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=frozenset(settings.CORS_ORIGINS),
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["X-API-Key", "Content-Type", "Authorization"],
+    allow_methods=("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"),
+    allow_headers=("X-API-Key", "Content-Type", "Authorization"),
 )
 
 # Setup exception handlers
@@ -245,17 +261,41 @@ app.include_router(ws_router, prefix="/ws")
 # Root Endpoint
 # =============================================================================
 
+# 根路径响应只依赖启动时的配置，预先序列化一次
+_ROOT_BYTES = orjson.dumps({
+    "name": settings.APP_NAME,
+    "version": "1.0.0",
+    "environment": settings.ENVIRONMENT,
+    "docs": "/api/docs",
+    "health": "/api/v1/health",
+    "rate_limit": f"{settings.RATE_LIMIT_PER_MINUTE}/minute",
+})
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint - returns API information"""
-    return {
-        "name": settings.APP_NAME,
-        "version": "1.0.0",
-        "environment": settings.ENVIRONMENT,
-        "docs": "/api/docs",
-        "health": "/api/v1/health",
-        "rate_limit": f"{settings.RATE_LIMIT_PER_MINUTE}/minute",
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
+
+
+# =============================================================================
+# OpenAPI Schema
+# =============================================================================
+
+# 所有路由注册完成后 schema 不再变化：生成并序列化一次，
+# app.openapi 固定返回该 schema，/api/openapi.json 直接返回预序列化的字节
+_OPENAPI_SCHEMA = app.openapi()
+_OPENAPI_BYTES = orjson.dumps(_OPENAPI_SCHEMA)
+app.openapi = lambda: _OPENAPI_SCHEMA
+
+
+async def openapi_json(request: Request) -> Response:
+    return Response(content=_OPENAPI_BYTES, media_type="application/json")
+
+
+# 替换 FastAPI 默认的 openapi 路由（每次请求都会重新 json.dumps 整个 schema）
+app.router.routes[:] = [r for r in app.router.routes if getattr(r, "path", None) != app.openapi_url]
+app.add_route(app.openapi_url, openapi_json, include_in_schema=False)
 
 
 # =============================================================================
@@ -263,13 +303,22 @@ async def root():
 # =============================================================================
 
 def run_server():
-    """Run the API server (for CLI usage)"""
+    """
+    Run the API server (for CLI usage)
+    
+    uvicorn[standard] 已安装 uvloop 和 httptools，loop/http 默认的 "auto" 会自动选用
+    （Windows 上 uvloop 不可用时回退到 asyncio）。
+    保持单 worker：bot_manager 在进程内管理 Bot 子进程，多 worker 之间无法共享。
+    """
     import uvicorn
     uvicorn.run(
         "langtrader_api.main:app",
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
+        timeout_keep_alive=30,  # 前端轮询复用连接，避免频繁重新握手
+        backlog=4096,
+        limit_concurrency=2048,  # 超出时返回 503，而不是无限堆积请求
     )
 
 
@@ -6,95 +6,73 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
 from datetime import datetime
+import time
 import traceback
+from typing import Any, Tuple
 
 from langtrader_api.config import settings
 
 
-def setup_exception_handlers(app: FastAPI):
-    """Setup global exception handlers for the FastAPI app"""
-    
-    @app.exception_handler(HTTPException)
-    async def http_exception_handler(request: Request, exc: HTTPException):
-        """Handle HTTP exceptions"""
-        return JSONResponse(
-            status_code=exc.status_code,
-            content={
-                "success": False,
-                "error": exc.detail,
-                "code": f"HTTP_{exc.status_code}",
-                "timestamp": datetime.now().isoformat(),
-            },
-            headers=exc.headers,
-        )
-    
-    @app.exception_handler(RequestValidationError)
-    async def validation_exception_handler(request: Request, exc: RequestValidationError):
-        """Handle request validation errors"""
-        errors = []
-        for error in exc.errors():
-            errors.append({
+# 错误响应时间戳按秒缓存：[秒级时间戳, ISO 格式字符串]
+_ts_cache = [0, ""]
+
+
+def iso_now() -> str:
+    """当前时间的 ISO 字符串（精确到秒，同一秒内复用）"""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[1] = datetime.fromtimestamp(now).isoformat()
+        _ts_cache[0] = now
+    return _ts_cache[1]
+
+
+def _classify(exc: Exception) -> Tuple[int, Any, str, Any]:
+    """将异常映射为 (status_code, error, code, detail)，detail 为 None 时不输出"""
+    if isinstance(exc, HTTPException):
+        return exc.status_code, exc.detail, f"HTTP_{exc.status_code}", None
+    if isinstance(exc, RequestValidationError):
+        errors = [
+            {
                 "field": ".".join(str(loc) for loc in error["loc"]),
                 "message": error["msg"],
                 "type": error["type"],
-            })
-        
-        return JSONResponse(
-            status_code=422,
-            content={
-                "success": False,
-                "error": "Validation Error",
-                "detail": errors,
-                "code": "VALIDATION_ERROR",
-                "timestamp": datetime.now().isoformat(),
-            },
-        )
+            }
+            for error in exc.errors()
+        ]
+        return 422, "Validation Error", "VALIDATION_ERROR", errors
+    # pydantic ValidationError 是 ValueError 的子类，需先判断
+    if isinstance(exc, ValidationError):
+        return 422, "Data Validation Error", "PYDANTIC_VALIDATION_ERROR", exc.errors()
+    if isinstance(exc, ValueError):
+        return 400, str(exc), "VALUE_ERROR", None
     
-    @app.exception_handler(ValidationError)
-    async def pydantic_validation_handler(request: Request, exc: ValidationError):
-        """Handle Pydantic validation errors"""
-        return JSONResponse(
-            status_code=422,
-            content={
-                "success": False,
-                "error": "Data Validation Error",
-                "detail": exc.errors(),
-                "code": "PYDANTIC_VALIDATION_ERROR",
-                "timestamp": datetime.now().isoformat(),
-            },
-        )
-    
-    @app.exception_handler(ValueError)
-    async def value_error_handler(request: Request, exc: ValueError):
-        """Handle value errors"""
-        return JSONResponse(
-            status_code=400,
-            content={
-                "success": False,
-                "error": str(exc),
-                "code": "VALUE_ERROR",
-                "timestamp": datetime.now().isoformat(),
-            },
-        )
+    # Log the full traceback
+    if settings.DEBUG:
+        traceback.print_exc()
+    # Return generic error in production
+    detail = str(exc) if settings.DEBUG else "An unexpected error occurred"
+    return 500, "Internal Server Error", "INTERNAL_ERROR", detail
+
+
+async def unified_exception_handler(request: Request, exc: Exception):
+    """统一构建错误响应信封"""
+    status_code, error, code, detail = _classify(exc)
+    content = {"success": False, "error": error}
+    if detail is not None:
+        content["detail"] = detail
+    content["code"] = code
+    content["timestamp"] = iso_now()
     
-    @app.exception_handler(Exception)
-    async def general_exception_handler(request: Request, exc: Exception):
-        """Handle all other exceptions"""
-        # Log the full traceback
-        if settings.DEBUG:
-            traceback.print_exc()
-        
-        # Return generic error in production
-        detail = str(exc) if settings.DEBUG else "An unexpected error occurred"
-        
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "error": "Internal Server Error",
-                "detail": detail,
-                "code": "INTERNAL_ERROR",
-                "timestamp": datetime.now().isoformat(),
-            },
-        )
+    headers = exc.headers if isinstance(exc, HTTPException) else None
+    return JSONResponse(status_code=status_code, content=content, headers=headers)
+
 
+# HTTPException / RequestValidationError 由 ExceptionMiddleware 处理，Exception 由
+# ServerErrorMiddleware 处理，因此仍需按类型分别注册（同一个处理函数）
+_HANDLED_EXCEPTIONS = (HTTPException, RequestValidationError, ValidationError, ValueError, Exception)
+
+
+def setup_exception_handlers(app: FastAPI):
+    """Setup global exception handlers for the FastAPI app"""
+    for exc_class in _HANDLED_EXCEPTIONS:
+        app.add_exception_handler(exc_class, unified_exception_handler)
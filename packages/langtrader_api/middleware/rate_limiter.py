@@ -9,15 +9,16 @@
 - 认证端点：10 请求/分钟（防止暴力破解）
 - 交易操作：30 请求/分钟（防止过度交易）
 """
+import time
+from typing import Callable
+
+import orjson
 from slowapi import Limiter
-from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request, Response
-from fastapi.responses import JSONResponse
-from datetime import datetime
-from typing import Callable
 
 from langtrader_api.config import settings
+from langtrader_api.middleware.error_handler import iso_now
 
 
 def get_api_key_or_ip(request: Request) -> str:
@@ -28,42 +29,71 @@ def get_api_key_or_ip(request: Request) -> str:
     1. 同一 API Key 的请求共享配额
     2. 未认证请求按 IP 限制
     """
-    # 尝试从 header 获取 API Key
-    api_key = request.headers.get("X-API-Key")
-    if api_key:
-        return f"apikey:{api_key}"
+    # 直接遍历 ASGI scope 中的原始 header（名称已小写），不构造 Headers 对象
+    for name, value in request.scope["headers"]:
+        if name == b"x-api-key":
+            if value:
+                return "apikey:" + value.decode("latin-1")
+            break
     
-    # 回退到 IP 地址
-    return f"ip:{get_remote_address(request)}"
+    # 回退到 IP 地址（与 slowapi 的 get_remote_address 一致）
+    client = request.scope.get("client")
+    return "ip:" + (client[0] if client and client[0] else "127.0.0.1")
 
 
 # 创建限流器实例
+# fixed-window 在 Redis 上由 limits 的 INCRBY+EXPIRE Lua 脚本（EVALSHA）原子完成，一次往返
 limiter = Limiter(
     key_func=get_api_key_or_ip,
     default_limits=[f"{settings.RATE_LIMIT_PER_MINUTE}/minute"],
     storage_uri=settings.REDIS_URL if settings.REDIS_URL else None,  # 使用 Redis（如可用）
+    strategy="fixed-window",
+    in_memory_fallback_enabled=True,  # Redis 不可用时退回进程内计数，而不是让请求报错
 )
 
 
+# 429 响应的固定头部值只构造一次
+_LIMIT_HEADER = str(settings.RATE_LIMIT_PER_MINUTE)
+_DEFAULT_RETRY_AFTER = 60
+
+
+def _retry_after(request: Request) -> int:
+    """
+    距当前限流窗口重置的秒数
+    
+    slowapi 在触发限流前把命中的 (limit, key) 记录在 request.state.view_rate_limit，
+    直接查询该窗口的重置时间，无需解析异常文本。
+    """
+    current_limit = getattr(request.state, "view_rate_limit", None)
+    if current_limit is None:
+        return _DEFAULT_RETRY_AFTER
+    try:
+        reset_time, _ = limiter.limiter.get_window_stats(current_limit[0], *current_limit[1])
+    except Exception:
+        return _DEFAULT_RETRY_AFTER
+    return max(1, int(reset_time - time.time()) + 1)
+
+
 def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Response:
     """
     速率限制超出时的响应处理
     """
-    retry_after = exc.detail.split("retry after ")[1] if "retry after" in str(exc.detail) else "60"
+    retry_after = str(_retry_after(request))
     
-    return JSONResponse(
-        status_code=429,
-        content={
+    return Response(
+        content=orjson.dumps({
             "success": False,
             "error": "Rate Limit Exceeded",
             "detail": f"Too many requests. {exc.detail}",
             "code": "RATE_LIMIT_EXCEEDED",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": iso_now(),
             "retry_after": retry_after,
-        },
+        }),
+        status_code=429,
+        media_type="application/json",
         headers={
-            "Retry-After": str(retry_after),
-            "X-RateLimit-Limit": str(settings.RATE_LIMIT_PER_MINUTE),
+            "Retry-After": retry_after,
+            "X-RateLimit-Limit": _LIMIT_HEADER,
         }
     )
 
@@ -3,7 +3,10 @@ Authentication Endpoints
 
 速率限制：10 请求/分钟（防止暴力破解）
 """
-from fastapi import APIRouter, Request
+from datetime import datetime
+
+import orjson
+from fastapi import APIRouter, Request, Response
 
 from langtrader_api.dependencies import APIKey
 from langtrader_api.schemas.base import APIResponse
@@ -12,6 +15,30 @@ from langtrader_api.config import settings
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# 两个端点的 data 都是静态的（依赖解析成功即代表 Key 有效）
+_VALIDATE_DATA = {
+    "valid": True,
+    "message": "API Key is valid"
+}
+_AUTH_INFO_DATA = {
+    "type": "api_key",
+    "permissions": ["read", "write", "execute"],
+    "rate_limit": settings.RATE_LIMIT_PER_MINUTE,
+}
+
+
+def _envelope_response(data: dict) -> Response:
+    """
+    直接用 orjson 输出 APIResponse 信封
+    
+    返回 Response 时 FastAPI 跳过 response_model 的校验和序列化，
+    response_model 仅用于 OpenAPI 文档。
+    """
+    return Response(
+        content=orjson.dumps({"success": True, "data": data, "message": None, "timestamp": datetime.now()}),
+        media_type="application/json",
+    )
+
 
 @router.get("/validate", response_model=APIResponse[dict])
 @limiter.limit("10/minute")
@@ -26,12 +53,7 @@ async def validate_api_key(request: Request, api_key: APIKey):
     Returns:
         Validation result with key status
     """
-    return APIResponse(
-        data={
-            "valid": True,
-            "message": "API Key is valid"
-        }
-    )
+    return _envelope_response(_VALIDATE_DATA)
 
 
 @router.get("/info", response_model=APIResponse[dict])
@@ -44,10 +66,4 @@ async def auth_info(request: Request, api_key: APIKey):
     
     Rate Limit: 10 requests/minute
     """
-    return APIResponse(
-        data={
-            "type": "api_key",
-            "permissions": ["read", "write", "execute"],
-            "rate_limit": settings.RATE_LIMIT_PER_MINUTE,
-        }
-    )
+    return _envelope_response(_AUTH_INFO_DATA)
@@ -4,28 +4,26 @@ Backtest API Routes
 速率限制：5 请求/分钟（回测是资源密集型操作）
 """
 from fastapi import APIRouter, HTTPException, status, BackgroundTasks, Request
-from typing import Dict, Optional
+from typing import Optional
 from datetime import datetime
 from uuid import uuid4
 
-from langtrader_api.dependencies import APIKey, BotRepo, DbSession
+from langtrader_api.dependencies import APIKey, ReposDep, DbSession
 from langtrader_api.schemas.base import APIResponse
 from langtrader_api.schemas.trades import BacktestRequest, BacktestResult
 from langtrader_api.middleware.rate_limiter import limiter
+from langtrader_api.services.backtest_store import backtest_store
+from langtrader_api.services.backtest_runner import enqueue_backtest
 
 router = APIRouter(prefix="/backtests", tags=["Backtests"])
 
-# In-memory storage for backtest results (use Redis in production)
-_backtest_results: Dict[str, BacktestResult] = {}
-
-
 @router.post("", response_model=APIResponse[BacktestResult], status_code=status.HTTP_202_ACCEPTED)
 @limiter.limit("5/minute")
 async def start_backtest(
     request_obj: Request,  # 需要 Request 对象用于速率限制
     request: BacktestRequest,
     api_key: APIKey,
-    bot_repo: BotRepo,
+    repos: ReposDep,
     background_tasks: BackgroundTasks,
 ):
     """
@@ -35,7 +33,7 @@ async def start_backtest(
     Use the returned task_id to poll for status.
     """
     # Verify bot exists
-    bot = bot_repo.get_by_id(request.bot_id)
+    bot = repos.bot.get_by_id(request.bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -60,11 +58,11 @@ async def start_backtest(
         progress=0.0,
         started_at=datetime.now(),
     )
-    _backtest_results[task_id] = result
+    await backtest_store.save(result)
     
-    # Add background task
-    background_tasks.add_task(
-        run_backtest_task,
+    # 投递回测任务（Arq 队列不可用时在后台任务中运行）
+    await enqueue_backtest(
+        background_tasks,
         task_id=task_id,
         bot_id=request.bot_id,
         start_date=request.start_date,
@@ -77,7 +75,7 @@ async def start_backtest(
     return APIResponse(
         data=result,
         message="Backtest started. Poll /backtests/{task_id} for status."
-    )
+    ).to_response(status_code=status.HTTP_202_ACCEPTED)
 
 
 @router.get("/{task_id}", response_model=APIResponse[BacktestResult])
@@ -88,13 +86,14 @@ async def get_backtest_status(
     """
     Get backtest status and results
     """
-    if task_id not in _backtest_results:
+    result = await backtest_store.get(task_id)
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Backtest with task_id {task_id} not found"
         )
     
-    return APIResponse(data=_backtest_results[task_id])
+    return APIResponse(data=result).to_response()
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -105,13 +104,13 @@ async def cancel_backtest(
     """
     Cancel a running backtest (if possible)
     """
-    if task_id not in _backtest_results:
+    result = await backtest_store.get(task_id)
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Backtest with task_id {task_id} not found"
         )
     
-    result = _backtest_results[task_id]
     if result.status == "completed":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -120,6 +119,7 @@ async def cancel_backtest(
     
     result.status = "cancelled"
     result.completed_at = datetime.now()
+    await backtest_store.save(result)
 
 
 @router.get("", response_model=APIResponse[list])
@@ -131,89 +131,7 @@ async def list_backtests(
     """
     List all backtests
     """
-    results = list(_backtest_results.values())
-    
-    if bot_id:
-        results = [r for r in results if r.bot_id == bot_id]
-    if status:
-        results = [r for r in results if r.status == status]
-    
-    # Sort by started_at descending
-    results.sort(key=lambda r: r.started_at, reverse=True)
-    
-    return APIResponse(data=results)
-
-
-# =============================================================================
-# Background Task
-# =============================================================================
-
-async def run_backtest_task(
-    task_id: str,
-    bot_id: int,
-    start_date: datetime,
-    end_date: datetime,
-    initial_balance: float,
-    symbols: Optional[list] = None,
-    max_cycles: Optional[int] = None,
-):
-    """
-    Background task that runs the backtest
-    """
-    import sys
-    from pathlib import Path
-    
-    # Add packages to path
-    project_root = Path(__file__).parent.parent.parent.parent.parent
-    sys.path.insert(0, str(project_root / "packages"))
+    # 存储已按 started_at 倒序返回，按 Bot 过滤时走 bot_id 索引
+    results = await backtest_store.list(bot_id=bot_id, status=status)
     
-    result = _backtest_results[task_id]
-    result.status = "running"
-    
-    try:
-        from langtrader_core.data import SessionLocal
-        from langtrader_core.backtest.engine import BacktestEngine
-        
-        # Create backtest engine
-        engine = BacktestEngine(
-            bot_id=bot_id,
-            start_date=start_date,
-            end_date=end_date,
-            initial_balance=initial_balance,
-            symbols=symbols,
-            max_cycles=max_cycles,
-        )
-        
-        # Initialize with database session
-        session = SessionLocal()
-        try:
-            await engine.initialize(session)
-            
-            # Run backtest
-            report = await engine.run()
-            
-            # Update result
-            result.status = "completed"
-            result.progress = 100.0
-            result.total_return = report.get("total_return", 0)
-            result.return_pct = report.get("return_pct", 0)
-            result.final_balance = report.get("final_balance", initial_balance)
-            result.total_trades = report.get("total_trades", 0)
-            result.win_rate = report.get("win_rate", 0)
-            result.sharpe_ratio = report.get("sharpe_ratio", 0)
-            result.max_drawdown = report.get("max_drawdown", 0)
-            result.profit_factor = report.get("profit_factor", 0)
-            result.completed_at = datetime.now()
-            result.duration_seconds = int(
-                (result.completed_at - result.started_at).total_seconds()
-            )
-            
-        finally:
-            await engine.cleanup()
-            session.close()
-    
-    except Exception as e:
-        result.status = "failed"
-        result.error = str(e)
-        result.completed_at = datetime.now()
-
+    return APIResponse(data=results).to_response()
@@ -2,13 +2,16 @@
 Bot Management API Routes
 """
 from fastapi import APIRouter, HTTPException, status, Query
-from typing import Optional, Dict, Any, List
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from typing import Any, Optional, List, Tuple
+from collections import OrderedDict
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
-import asyncio
+import threading
+import time
 
 from langtrader_api.dependencies import (
-    APIKey, DbSession, BotRepo, ExchangeRepo, WorkflowRepo
+    APIKey, DbSession, ReposDep
 )
 from langtrader_api.schemas.base import APIResponse, PaginatedResponse
 from langtrader_api.schemas.bots import (
@@ -17,93 +20,100 @@ from langtrader_api.schemas.bots import (
     DebateResult
 )
 from langtrader_api.services.bot_manager import bot_manager
+from langtrader_api.services import exchange_client
 from langtrader_core.data.models.bot import Bot
+from sqlalchemy import func
+from sqlalchemy.orm import load_only
 
 router = APIRouter(prefix="/bots", tags=["Bots"])
 
-# 线程池用于执行同步的 ccxt 调用，避免阻塞事件循环
-_ccxt_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ccxt_")
-
-
-def _create_ccxt_instance(ex: Dict[str, Any]):
-    """
-    创建 ccxt 交易所实例（同步方法，在线程池中执行）
-    """
-    import ccxt
-    
-    exchange_class = getattr(ccxt, ex['type'], None)
-    if not exchange_class:
-        raise ValueError(f"Unsupported exchange type: {ex['type']}")
-    
-    config = {
-        'apiKey': ex['apikey'],
-        'secret': ex['secretkey'],
-        'walletAddress': ex['apikey'],  # Hyperliquid 使用 apikey 作为钱包地址
-        'privateKey': ex['secretkey'],   # Hyperliquid 需要
-        'timeout': 15000,  # 15秒超时
-        'enableRateLimit': True,
-    }
-    if ex.get('uid'):
-        config['uid'] = ex['uid']
-    if ex.get('password'):
-        config['password'] = ex['password']
-    if ex.get('testnet'):
-        config['sandbox'] = True
-    
-    return exchange_class(config)
-
-
-def _fetch_positions_sync(ex: Dict[str, Any]) -> List[Dict]:
-    """
-    同步获取持仓（在线程池中执行）
-    
-    返回的持仓数据会包含 markPrice，如果 markPrice 为 0，
-    尝试从 ticker 获取实时价格作为补充。
-    """
-    exchange_instance = _create_ccxt_instance(ex)
-    
-    params = {}
-    if ex['type'] == 'hyperliquid':
-        params['user'] = ex['apikey']
-    
-    positions = exchange_instance.fetch_positions(params=params)
-    
-    # 补充 markPrice：如果某些持仓的 markPrice 为 0，尝试获取 ticker 价格
-    symbols_need_price = []
-    for pos in positions:
-        size = float(pos.get('contracts', 0) or pos.get('contractSize', 0) or 0)
-        mark_price = float(pos.get('markPrice', 0) or 0)
-        if abs(size) > 0 and mark_price <= 0:
-            symbols_need_price.append(pos.get('symbol'))
-    
-    if symbols_need_price:
-        try:
-            # 批量获取 ticker 价格
-            tickers = exchange_instance.fetch_tickers(symbols_need_price)
-            for pos in positions:
-                symbol = pos.get('symbol')
-                if symbol in tickers and float(pos.get('markPrice', 0) or 0) <= 0:
-                    ticker = tickers[symbol]
-                    pos['markPrice'] = float(ticker.get('last') or ticker.get('close') or 0)
-        except Exception:
-            # 获取失败时忽略，使用原始数据
-            pass
-    
-    return positions
-
-
-def _fetch_balance_sync(ex: Dict[str, Any]) -> Dict:
-    """
-    同步获取余额（在线程池中执行）
-    """
-    exchange_instance = _create_ccxt_instance(ex)
-    
-    params = {}
-    if ex['type'] == 'hyperliquid':
-        params['user'] = ex['apikey']
-    
-    return exchange_instance.fetch_balance(params=params)
-
+# 列表接口只需 BotSummary 中的列，外加作为缓存版本号的 updated_at
+_BOT_SUMMARY_COLUMNS = tuple(getattr(Bot, name) for name in BotSummary.model_fields) + (Bot.updated_at,)
+
+# BotSummary 缓存：所有写路径都会刷新 updated_at，以 (id, updated_at) 为键即可自动失效
+_SUMMARY_CACHE_SIZE = 4096
+_summary_cache: "OrderedDict[tuple, BotSummary]" = OrderedDict()
+
+# 读接口在事件循环上、写接口在线程池中访问同一批 OrderedDict（move_to_end / popitem / 遍历），
+# 所有缓存读写都需持有此锁
+_bot_cache_lock = threading.Lock()
+
+
+# 未命中缓存的行一次性交给列表校验器，比逐个 model_validate 少一层 Python 调用
+_SUMMARY_LIST_ADAPTER = TypeAdapter(List[BotSummary])
+
+# 持仓同样先组装成 dict，整批校验
+_POSITION_LIST_ADAPTER = TypeAdapter(List[PositionInfo])
+
+
+def _bot_summaries(bots: List[Bot]) -> List[BotSummary]:
+    """返回每个 Bot 的 BotSummary，同一版本的行只校验一次"""
+    summaries: List[Optional[BotSummary]] = []
+    misses = []
+    with _bot_cache_lock:
+        for bot in bots:
+            key = (bot.id, bot.updated_at)
+            summary = _summary_cache.get(key)
+            if summary is not None:
+                _summary_cache.move_to_end(key)
+            else:
+                misses.append((len(summaries), key, bot))
+            summaries.append(summary)
+    
+    if misses:
+        validated = _SUMMARY_LIST_ADAPTER.validate_python([bot for _, _, bot in misses], from_attributes=True)
+        with _bot_cache_lock:
+            for (index, key, _), summary in zip(misses, validated):
+                summaries[index] = summary
+                _summary_cache[key] = summary
+            while len(_summary_cache) > _SUMMARY_CACHE_SIZE:
+                _summary_cache.popitem(last=False)
+    return summaries
+
+
+# get_bot / list_bots 结果缓存：本进程的写接口写入后立即失效；
+# 余额、last_active_at 等字段由 bot 进程（run_once）直接写库，只能靠 TTL 过期，因此 TTL 取得很短
+_BOT_CACHE_TTL = 5.0
+_BOT_CACHE_SIZE = 1024
+_detail_cache: "OrderedDict[int, Tuple[float, BotDetail]]" = OrderedDict()
+_list_cache: "OrderedDict[tuple, Tuple[float, PaginatedResponse[BotSummary]]]" = OrderedDict()
+# 每次失效加一：读到旧行的并发请求在失效之后不会再把旧结果写回缓存
+_bot_cache_generation = 0
+
+
+def _bot_cache_get(cache: OrderedDict, key) -> Any:
+    with _bot_cache_lock:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return entry[1]
+
+
+def _bot_cache_put(cache: OrderedDict, key, value, generation: int):
+    # 版本号检查与写入在同一把锁内，避免检查之后、写入之前发生失效
+    with _bot_cache_lock:
+        if generation != _bot_cache_generation:
+            return
+        cache[key] = (time.monotonic() + _BOT_CACHE_TTL, value)
+        if len(cache) > _BOT_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+def _invalidate_bot_cache(bot_id: Optional[int] = None):
+    """Bot 写入后调用：丢弃该 bot 的详情和所有列表页"""
+    global _bot_cache_generation
+    with _bot_cache_lock:
+        _bot_cache_generation += 1
+        if bot_id is not None:
+            _detail_cache.pop(bot_id, None)
+            # updated_at 精度不足（同一秒内多次写入）时 BotSummary 缓存键不会变化，这里一并丢弃
+            for key in [k for k in _summary_cache if k[0] == bot_id]:
+                del _summary_cache[key]
+        _list_cache.clear()
 
 # =============================================================================
 # List & Get
@@ -112,7 +122,7 @@ def _fetch_balance_sync(ex: Dict[str, Any]) -> Dict:
 @router.get("", response_model=APIResponse[PaginatedResponse[BotSummary]])
 async def list_bots(
     api_key: APIKey,
-    bot_repo: BotRepo,
+    repos: ReposDep,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     is_active: Optional[bool] = Query(True, description="Filter by active status (default: True)"),
@@ -121,69 +131,81 @@ async def list_bots(
     """
     List all bots with pagination and filters
     """
-    # Get all bots (simple implementation, can be optimized)
-    all_bots = bot_repo.session.query(Bot).all()
+    cache_key = (page, page_size, is_active, trading_mode)
+    generation = _bot_cache_generation
+    cached = _bot_cache_get(_list_cache, cache_key)
+    if cached is not None:
+        return APIResponse(data=cached).to_response()
     
-    # Apply filters
-    filtered = all_bots
+    # 过滤、计数和分页都在 SQL 中完成，只加载当前页的 BotSummary 字段
+    query = repos.bot.session.query(Bot)
     if is_active is not None:
-        filtered = [b for b in filtered if b.is_active == is_active]
+        query = query.filter(Bot.is_active == is_active)
     if trading_mode:
-        filtered = [b for b in filtered if b.trading_mode == trading_mode]
+        query = query.filter(Bot.trading_mode == trading_mode)
     
-    total = len(filtered)
+    total = query.with_entities(func.count(Bot.id)).scalar()
     
-    # Paginate
-    start = (page - 1) * page_size
-    end = start + page_size
-    items = filtered[start:end]
+    items = (
+        query.options(load_only(*_BOT_SUMMARY_COLUMNS))
+        .order_by(Bot.id)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
     
-    return APIResponse(
-        data=PaginatedResponse.create(
-            items=[BotSummary.model_validate(b) for b in items],
-            total=total,
-            page=page,
-            page_size=page_size
-        )
+    data = PaginatedResponse.create(
+        items=_bot_summaries(items),
+        total=total,
+        page=page,
+        page_size=page_size
     )
+    _bot_cache_put(_list_cache, cache_key, data, generation)
+    return APIResponse(data=data).to_response()
 
 
 @router.get("/{bot_id}", response_model=APIResponse[BotDetail])
 async def get_bot(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
+    repos: ReposDep,
 ):
     """
     Get bot details by ID
     """
-    bot = bot_repo.get_by_id(bot_id)
-    if not bot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Bot with id {bot_id} not found"
-        )
-    return APIResponse(data=BotDetail.model_validate(bot))
+    generation = _bot_cache_generation
+    detail = _bot_cache_get(_detail_cache, bot_id)
+    if detail is None:
+        bot = repos.bot.get_by_id(bot_id)
+        if not bot:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Bot with id {bot_id} not found"
+            )
+        detail = BotDetail.model_validate(bot)
+        _bot_cache_put(_detail_cache, bot_id, detail, generation)
+    return APIResponse(data=detail).to_response()
 
 
 # =============================================================================
 # Create & Update
 # =============================================================================
 
+# 写接口只有同步的数据库操作（commit 需等待 PostgreSQL 落盘），
+# 声明为 def 由 FastAPI 放入线程池执行，不阻塞事件循环上的其他请求
+
 @router.post("", response_model=APIResponse[BotDetail], status_code=status.HTTP_201_CREATED)
-async def create_bot(
+def create_bot(
     request: BotCreateRequest,
     api_key: APIKey,
-    bot_repo: BotRepo,
-    exchange_repo: ExchangeRepo,
-    workflow_repo: WorkflowRepo,
+    repos: ReposDep,
     db: DbSession,
 ):
     """
     Create a new bot
     """
     # Check if name already exists
-    existing = bot_repo.get_by_name(request.name)
+    existing = repos.bot.get_by_name(request.name)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -191,7 +213,7 @@ async def create_bot(
         )
     
     # Validate exchange exists
-    exchange = exchange_repo.get_by_id(request.exchange_id)
+    exchange = repos.exchange.get_by_id(request.exchange_id)
     if not exchange:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -199,7 +221,7 @@ async def create_bot(
         )
     
     # Validate workflow exists
-    workflow = workflow_repo.get_workflow(request.workflow_id)
+    workflow = repos.workflow.get_workflow(request.workflow_id)
     if not workflow:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -237,9 +259,11 @@ async def create_bot(
         initial_balance=request.initial_balance,
     )
     
+    # 主键和 updated_at 由 INSERT ... RETURNING 回填（Bot 开启了 eager_defaults）；
+    # 请求级 session 不会在 commit 后过期对象，无需 refresh 再 SELECT 一次
     db.add(bot)
     db.commit()
-    db.refresh(bot)
+    _invalidate_bot_cache()
     
     return APIResponse(
         data=BotDetail.model_validate(bot),
@@ -248,11 +272,11 @@ async def create_bot(
 
 
 @router.patch("/{bot_id}", response_model=APIResponse[BotDetail])
-async def update_bot(
+def update_bot(
     bot_id: int,
     request: BotUpdateRequest,
     api_key: APIKey,
-    bot_repo: BotRepo,
+    repos: ReposDep,
     db: DbSession,
 ):
     """
@@ -260,7 +284,7 @@ async def update_bot(
     
     Only provided fields will be updated.
     """
-    bot = bot_repo.get_by_id(bot_id)
+    bot = repos.bot.get_by_id(bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -279,9 +303,8 @@ async def update_bot(
     for field, value in update_data.items():
         setattr(bot, field, value)
     
-    bot.updated_at = datetime.now()
     db.commit()
-    db.refresh(bot)
+    _invalidate_bot_cache(bot_id)
     
     return APIResponse(
         data=BotDetail.model_validate(bot),
@@ -290,16 +313,16 @@ async def update_bot(
 
 
 @router.delete("/{bot_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_bot(
+def delete_bot(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
+    repos: ReposDep,
     db: DbSession,
 ):
     """
     Delete a bot (soft delete - sets is_active=False)
     """
-    bot = bot_repo.get_by_id(bot_id)
+    bot = repos.bot.get_by_id(bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -314,8 +337,8 @@ async def delete_bot(
         )
     
     bot.is_active = False
-    bot.updated_at = datetime.now()
     db.commit()
+    _invalidate_bot_cache(bot_id)
 
 
 # =============================================================================
@@ -326,25 +349,25 @@ async def delete_bot(
 async def get_bot_status(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
+    repos: ReposDep,
 ):
     """
     Get real-time bot status
     
     从状态文件读取详细运行信息（周期数、余额、持仓等）
     """
-    bot = bot_repo.get_by_id(bot_id)
+    bot = repos.bot.get_by_id(bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Bot with id {bot_id} not found"
         )
     
-    is_running = bot_manager.is_running(bot_id)
-    process_info = bot_manager.get_process_info(bot_id)
-    
-    # 从状态文件读取详细运行信息
-    runtime_status = bot_manager.read_bot_status(bot_id)
+    # 进程信息 + 状态文件一次取回（状态文件未变化时直接使用已解析的缓存）
+    full_status = bot_manager.get_bot_full_status(bot_id)
+    is_running = full_status["is_running"]
+    process_info = full_status["process_info"]
+    runtime_status = full_status["runtime_status"]
     
     status_data = BotStatus(
         bot_id=bot_id,
@@ -370,14 +393,14 @@ async def get_bot_status(
         state="running" if is_running else (runtime_status.get("state", "stopped") if runtime_status and runtime_status.get("state") != "running" else "stopped"),
     )
     
-    return APIResponse(data=status_data)
+    return APIResponse(data=status_data).to_response()
 
 
 @router.post("/{bot_id}/start", response_model=APIResponse[dict])
 async def start_bot(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
+    repos: ReposDep,
     request: BotStartRequest = None,
 ):
     """
@@ -385,7 +408,7 @@ async def start_bot(
     
     This will spawn a new process running the bot.
     """
-    bot = bot_repo.get_by_id(bot_id)
+    bot = repos.bot.get_by_id(bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -404,13 +427,19 @@ async def start_bot(
             detail="Bot is already running"
         )
     
-    # Start the bot
+    # Start the bot（与 stop / restart 共用 per-bot 锁）
     try:
-        bot_manager.start_bot(bot_id)
+        await bot_manager.start_bot_async(bot_id)
         return APIResponse(
             data={"bot_id": bot_id, "action": "started"},
             message=f"Bot '{bot.name}' is starting..."
         )
+    except ValueError:
+        # 等锁期间已被并发的 start / restart 启动
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Bot is already running"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -422,12 +451,12 @@ async def start_bot(
 async def stop_bot(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
+    repos: ReposDep,
 ):
     """
     Stop a running bot
     """
-    bot = bot_repo.get_by_id(bot_id)
+    bot = repos.bot.get_by_id(bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -440,9 +469,9 @@ async def stop_bot(
             detail="Bot is not running"
         )
     
-    # Stop the bot
+    # Stop the bot（等待进程退出在线程中进行）
     try:
-        bot_manager.stop_bot(bot_id)
+        await bot_manager.stop_bot_async(bot_id)
         return APIResponse(
             data={"bot_id": bot_id, "action": "stopped"},
             message=f"Bot '{bot.name}' is stopping..."
@@ -458,24 +487,26 @@ async def stop_bot(
 async def restart_bot(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
+    repos: ReposDep,
 ):
     """
     Restart a bot (stop then start)
     """
-    bot = bot_repo.get_by_id(bot_id)
+    bot = repos.bot.get_by_id(bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Bot with id {bot_id} not found"
         )
     
-    # Stop if running
-    if bot_manager.is_running(bot_id):
-        bot_manager.stop_bot(bot_id)
-    
-    # Start
-    bot_manager.start_bot(bot_id)
+    # Stop if running, then start（旧进程退出后才启动新进程）
+    try:
+        await bot_manager.restart_bot(bot_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to restart bot: {str(e)}"
+        )
     
     return APIResponse(
         data={"bot_id": bot_id, "action": "restarted"},
@@ -491,15 +522,15 @@ async def restart_bot(
 async def get_bot_positions(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
-    db: DbSession,
+    repos: ReposDep,
+    fresh: bool = Query(False, description="Bypass the short-lived cache and query the exchange"),
 ):
     """
     获取 Bot 当前持仓
     
     从交易所实时获取当前持仓信息（异步执行，不阻塞事件循环）
     """
-    bot = bot_repo.get_by_id(bot_id)
+    bot = repos.bot.get_by_id(bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -507,9 +538,7 @@ async def get_bot_positions(
         )
     
     # 获取交易所配置
-    from langtrader_core.data.repositories.exchange import ExchangeRepository
-    exchange_repo = ExchangeRepository(db)
-    ex = exchange_repo.get_by_id(bot.exchange_id)
+    ex = repos.exchange.get_by_id(bot.exchange_id)
     
     if not ex:
         raise HTTPException(
@@ -518,12 +547,10 @@ async def get_bot_positions(
         )
     
     try:
-        # 在线程池中执行同步的 ccxt 调用
-        loop = asyncio.get_running_loop()
-        positions = await loop.run_in_executor(_ccxt_executor, _fetch_positions_sync, ex)
+        positions = await exchange_client.fetch_positions(ex, fresh=fresh)
         
-        # 过滤有效持仓
-        result = []
+        # 过滤有效持仓，最后一次性校验为 PositionInfo 列表
+        rows = []
         for pos in positions:
             size = float(pos.get('contracts', 0) or pos.get('contractSize', 0) or 0)
             if abs(size) > 0:
@@ -535,19 +562,19 @@ async def get_bot_positions(
                     # 如果没有 side 字段，根据 contracts 正负判断
                     side = 'long' if size > 0 else 'short'
                 
-                result.append(PositionInfo(
-                    symbol=pos.get('symbol', 'Unknown'),
-                    side=side,
-                    size=abs(size),
-                    entry_price=float(pos.get('entryPrice', 0) or 0),
-                    mark_price=float(pos.get('markPrice', 0) or 0),
-                    unrealized_pnl=float(pos.get('unrealizedPnl', 0) or 0),
-                    leverage=int(pos.get('leverage', 1) or 1),
-                    margin_used=float(pos.get('initialMargin', 0) or pos.get('margin', 0) or 0),
-                    liquidation_price=float(pos.get('liquidationPrice', 0) or 0) if pos.get('liquidationPrice') else None,
-                ))
+                rows.append({
+                    "symbol": pos.get('symbol', 'Unknown'),
+                    "side": side,
+                    "size": abs(size),
+                    "entry_price": float(pos.get('entryPrice', 0) or 0),
+                    "mark_price": float(pos.get('markPrice', 0) or 0),
+                    "unrealized_pnl": float(pos.get('unrealizedPnl', 0) or 0),
+                    "leverage": int(pos.get('leverage', 1) or 1),
+                    "margin_used": float(pos.get('initialMargin', 0) or pos.get('margin', 0) or 0),
+                    "liquidation_price": float(pos.get('liquidationPrice', 0) or 0) if pos.get('liquidationPrice') else None,
+                })
         
-        return APIResponse(data=result)
+        return APIResponse(data=_POSITION_LIST_ADAPTER.validate_python(rows)).to_response()
         
     except ValueError as e:
         raise HTTPException(
@@ -565,15 +592,15 @@ async def get_bot_positions(
 async def get_bot_balance(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
-    db: DbSession,
+    repos: ReposDep,
+    fresh: bool = Query(False, description="Bypass the short-lived cache and query the exchange"),
 ):
     """
     获取 Bot 关联交易所的账户余额
     
     返回 USDT/USDC 等稳定币余额及总余额（异步执行，不阻塞事件循环）
     """
-    bot = bot_repo.get_by_id(bot_id)
+    bot = repos.bot.get_by_id(bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -581,9 +608,7 @@ async def get_bot_balance(
         )
     
     # 获取交易所配置
-    from langtrader_core.data.repositories.exchange import ExchangeRepository
-    exchange_repo = ExchangeRepository(db)
-    ex = exchange_repo.get_by_id(bot.exchange_id)
+    ex = repos.exchange.get_by_id(bot.exchange_id)
     
     if not ex:
         raise HTTPException(
@@ -592,9 +617,7 @@ async def get_bot_balance(
         )
     
     try:
-        # 在线程池中执行同步的 ccxt 调用
-        loop = asyncio.get_running_loop()
-        balance = await loop.run_in_executor(_ccxt_executor, _fetch_balance_sync, ex)
+        balance = await exchange_client.fetch_balance(ex, fresh=fresh)
         
         # 提取主要币种余额
         total_usd = 0.0
@@ -618,7 +641,7 @@ async def get_bot_balance(
                 "current_balance": float(bot.current_balance) if bot.current_balance else total_usd,
                 "updated_at": datetime.now().isoformat(),
             }
-        )
+        ).to_response()
         
     except ValueError as e:
         raise HTTPException(
@@ -636,7 +659,7 @@ async def get_bot_balance(
 async def get_bot_logs(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
+    repos: ReposDep,
     lines: int = Query(100, ge=10, le=1000, description="Number of log lines to return"),
 ):
     """
@@ -644,7 +667,7 @@ async def get_bot_logs(
     
     返回最近的日志内容
     """
-    bot = bot_repo.get_by_id(bot_id)
+    bot = repos.bot.get_by_id(bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -660,6 +683,52 @@ async def get_bot_logs(
             "lines_requested": lines,
             "logs": logs or "No logs available",
         }
+    ).to_response()
+
+
+# 日志流在没有新行时每隔若干次检查发送一次 SSE 注释，防止代理断开空闲连接
+_LOG_STREAM_KEEPALIVE_POLLS = 15
+
+
+@router.get("/{bot_id}/logs/stream")
+async def stream_bot_logs(
+    bot_id: int,
+    api_key: APIKey,
+    repos: ReposDep,
+    lines: int = Query(100, ge=10, le=1000, description="Number of recent log lines to send first"),
+):
+    """
+    实时日志流（Server-Sent Events）
+    
+    先发送最近 N 行，之后只推送新写入的行，每行一个 `data:` 事件。
+    浏览器的 EventSource 不能设置 X-API-Key，前端用 fetch 读取流。
+    """
+    bot = repos.bot.get_by_id(bot_id)
+    if not bot:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bot with id {bot_id} not found"
+        )
+    # 请求级 session 要等响应结束才关闭；日志流可能持续数小时，提前把连接还给连接池
+    repos.db.close()
+    
+    async def events():
+        idle_polls = 0
+        async for new_lines in bot_manager.follow_logs(bot_id, lines=lines):
+            if new_lines:
+                idle_polls = 0
+                yield "".join(f"data: {line}\n\n" for line in new_lines)
+            else:
+                idle_polls += 1
+                if idle_polls >= _LOG_STREAM_KEEPALIVE_POLLS:
+                    idle_polls = 0
+                    yield ": keepalive\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # 禁止缓存，并让 nginx 之类的反向代理不要缓冲事件
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -671,7 +740,7 @@ async def get_bot_logs(
 async def get_bot_debate(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
+    repos: ReposDep,
 ):
     """
     获取 Bot 最近的 AI 辩论过程和决策结果
@@ -681,7 +750,7 @@ async def get_bot_debate(
     - Phase 2: 多头/空头交易员建议 (bull_suggestions, bear_suggestions)
     - Phase 3: 风控经理最终决策 (final_decision)
     """
-    bot = bot_repo.get_by_id(bot_id)
+    bot = repos.bot.get_by_id(bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -695,14 +764,14 @@ async def get_bot_debate(
         return APIResponse(
             data=None,
             message="No debate data available. Start the bot to see AI decisions."
-        )
+        ).to_response()
     
     debate_data = runtime_status.get('debate_decision')
     if not debate_data:
         return APIResponse(
             data=None,
             message="No debate data available yet. Wait for the next trading cycle."
-        )
+        ).to_response()
     
     # 转换为 DebateResult schema
     try:
@@ -714,7 +783,7 @@ async def get_bot_debate(
             debate_summary=debate_data.get('debate_summary', ''),
             completed_at=debate_data.get('completed_at'),
         )
-        return APIResponse(data=debate_result)
+        return APIResponse(data=debate_result).to_response()
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
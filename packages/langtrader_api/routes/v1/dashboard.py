@@ -7,17 +7,62 @@ Dashboard API Routes
 - 全局统计数据
 """
 from fastapi import APIRouter, HTTPException, status, Query
-from typing import Optional, List
-from datetime import datetime, timedelta
-from collections import defaultdict
+from sqlmodel import Session
+from typing import Any, Callable, Optional, List, Tuple
+from datetime import date, datetime, timedelta
+from collections import OrderedDict
+import asyncio
+import time
 
-from langtrader_api.dependencies import APIKey, BotRepo, TradeRepo, PerfService, DbSession
+from langtrader_api.dependencies import APIKey, ReposDep
 from langtrader_api.schemas.base import APIResponse
 from langtrader_api.services.bot_manager import bot_manager
 from langtrader_core.data.models.bot import Bot
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+# 聚合结果缓存：(路由, 参数..., 当天日期) -> (过期时间, 结果)
+# 仪表盘每个卡片都在轮询，TTL 内的重复请求不再扫描交易表；键里带上日期，跨天自动失效。
+# Bot 运行状态来自本进程的 bot_manager，不进缓存，每次请求实时读取。
+_DASHBOARD_CACHE_TTL = 30.0
+_DASHBOARD_CACHE_SIZE = 1024
+_dashboard_cache: "OrderedDict[tuple, Tuple[float, Any]]" = OrderedDict()
+
+# bots-summary 并发计算各 Bot 绩效的线程数上限，避免占满数据库连接池（默认 pool_size=10）
+_SUMMARY_CONCURRENCY = 8
+
+
+def _cache_get(key: tuple) -> Optional[Any]:
+    """读取未过期的聚合结果，不存在或已过期返回 None"""
+    key = key + (date.today(),)
+    entry = _dashboard_cache.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    _dashboard_cache.move_to_end(key)
+    return entry[1]
+
+
+def _cache_put(key: tuple, value: Any):
+    key = key + (date.today(),)
+    _dashboard_cache[key] = (time.monotonic() + _DASHBOARD_CACHE_TTL, value)
+    _dashboard_cache.move_to_end(key)
+    if len(_dashboard_cache) > _DASHBOARD_CACHE_SIZE:
+        _dashboard_cache.popitem(last=False)
+
+
+def _cached(key: tuple, load: Callable[[], Any]) -> Any:
+    """
+    返回 key 对应的聚合结果，过期或不存在时调用 load 重新计算
+    
+    load 是同步函数，检查和写入之间没有 await，同一事件循环上的并发请求不会重复计算。
+    load 抛出的异常（如 404）不缓存。
+    """
+    value = _cache_get(key)
+    if value is None:
+        value = load()
+        _cache_put(key, value)
+    return value
+
 
 # =============================================================================
 # System Overview
@@ -26,9 +71,7 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 @router.get("/overview", response_model=APIResponse[dict])
 async def get_dashboard_overview(
     api_key: APIKey,
-    bot_repo: BotRepo,
-    trade_repo: TradeRepo,
-    db: DbSession,
+    repos: ReposDep,
 ):
     """
     获取 Dashboard 总览数据
@@ -39,41 +82,56 @@ async def get_dashboard_overview(
     - 今日交易统计
     - 活跃 Bot 列表
     """
-    # 获取所有 Bot
-    all_bots = db.query(Bot).filter(Bot.is_active == True).all()
-    
-    # 统计 Bot 状态
-    total_bots = len(all_bots)
-    running_bots = sum(1 for b in all_bots if bot_manager.is_running(b.id))
-    
-    # 获取今日交易统计
-    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    all_trades = trade_repo.get_trades(limit=10000)
-    today_trades = [t for t in all_trades if t.opened_at >= today_start]
-    
-    # 计算总 PnL
-    closed_trades = [t for t in all_trades if t.status == 'closed' and t.pnl_usd]
-    total_pnl = sum(float(t.pnl_usd or 0) for t in closed_trades)
-    today_closed = [t for t in today_trades if t.status == 'closed' and t.pnl_usd]
-    today_pnl = sum(float(t.pnl_usd or 0) for t in today_closed)
+    def load():
+        # 获取所有 Bot
+        all_bots = repos.db.query(Bot).filter(Bot.is_active == True).all()
+        
+        # 交易数 / 总 PnL / 今日统计在数据库中汇总
+        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        trades = repos.trade.overview_stats(today_start)
+        closed = trades["closed_trades"]
+        
+        # 计算胜率
+        win_rate = trades["winning_trades"] / closed * 100 if closed else 0
+        
+        return {
+            "bots": [
+                {
+                    "id": bot.id,
+                    "name": bot.name,
+                    "display_name": bot.display_name,
+                    "trading_mode": bot.trading_mode,
+                }
+                for bot in all_bots
+            ],
+            "trades": {
+                "total": trades["trades"],
+                "today": trades["today_trades"],
+                "open": trades["open_trades"],
+            },
+            "performance": {
+                "total_pnl_usd": round(trades["total_pnl"], 2),
+                "today_pnl_usd": round(trades["today_pnl"], 2),
+                "win_rate": round(win_rate, 1),
+                "total_trades_closed": closed,
+            },
+        }
     
-    # 计算胜率
-    winning_trades = [t for t in closed_trades if float(t.pnl_usd or 0) > 0]
-    win_rate = len(winning_trades) / len(closed_trades) * 100 if closed_trades else 0
+    stats = _cached(("overview",), load)
     
-    # 活跃 Bot 列表（正在运行的）
+    # 统计 Bot 状态 / 活跃 Bot 列表（正在运行的）
+    total_bots = len(stats["bots"])
+    running = bot_manager.list_running()
     active_bots = []
-    for bot in all_bots:
-        if bot_manager.is_running(bot.id):
-            process_info = bot_manager.get_process_info(bot.id)
+    for bot in stats["bots"]:
+        process_info = running.get(bot["id"])
+        if process_info:
             active_bots.append({
-                "id": bot.id,
-                "name": bot.name,
-                "display_name": bot.display_name,
-                "trading_mode": bot.trading_mode,
-                "cycle": process_info.get("cycle", 0) if process_info else 0,
-                "uptime_seconds": process_info.get("uptime", 0) if process_info else 0,
+                **bot,
+                "cycle": process_info.get("cycle", 0),
+                "uptime_seconds": process_info.get("uptime", 0),
             })
+    running_bots = len(active_bots)
     
     return APIResponse(
         data={
@@ -83,42 +141,23 @@ async def get_dashboard_overview(
                 "running": running_bots,
                 "stopped": total_bots - running_bots,
             },
-            "trades": {
-                "total": len(all_trades),
-                "today": len(today_trades),
-                "open": sum(1 for t in all_trades if t.status == 'open'),
-            },
-            "performance": {
-                "total_pnl_usd": round(total_pnl, 2),
-                "today_pnl_usd": round(today_pnl, 2),
-                "win_rate": round(win_rate, 1),
-                "total_trades_closed": len(closed_trades),
-            },
+            "trades": stats["trades"],
+            "performance": stats["performance"],
             "active_bots": active_bots,
         }
     )
 
 
-@router.get("/bots-summary", response_model=APIResponse[list])
-async def get_all_bots_summary(
-    api_key: APIKey,
-    bot_repo: BotRepo,
-    trade_repo: TradeRepo,
-    perf_service: PerfService,
-    db: DbSession,
-):
+def _summarize_bot(bot: Bot, trades_count: int, bind) -> dict:
     """
-    获取所有 Bot 的摘要信息（用于 Bot 列表页面）
+    计算单个 Bot 的绩效摘要（在线程池中执行）
     
-    每个 Bot 包含：运行状态、绩效摘要、最近交易
+    Session 不是线程安全的，每个线程在请求 Session 的同一引擎上打开自己的 Session。
     """
-    all_bots = db.query(Bot).filter(Bot.is_active == True).all()
+    from langtrader_core.services.performance import PerformanceService
     
-    result = []
-    for bot in all_bots:
-        # 基本信息
-        is_running = bot_manager.is_running(bot.id)
-        process_info = bot_manager.get_process_info(bot.id) if is_running else None
+    with Session(bind) as db:
+        perf_service = PerformanceService(db)
         
         # 获取绩效
         try:
@@ -130,25 +169,68 @@ async def get_all_bots_summary(
             win_rate = 0.0
             total_pnl = 0.0
             sharpe = 0.0
+    
+    return {
+        "id": bot.id,
+        "name": bot.name,
+        "display_name": bot.display_name,
+        "trading_mode": bot.trading_mode,
+        "performance": {
+            "win_rate": round(win_rate, 1),
+            "total_pnl_usd": round(total_pnl, 2),
+            "sharpe_ratio": round(sharpe, 2),
+        },
+        # 最近交易数量（最多 10 笔）
+        "recent_trades_count": min(trades_count, 10),
+        "last_active_at": bot.last_active_at.isoformat() if bot.last_active_at else None,
+    }
+
+
+@router.get("/bots-summary", response_model=APIResponse[list])
+async def get_all_bots_summary(
+    api_key: APIKey,
+    repos: ReposDep,
+):
+    """
+    获取所有 Bot 的摘要信息（用于 Bot 列表页面）
+    
+    每个 Bot 包含：运行状态、绩效摘要、最近交易
+    """
+    summaries = _cache_get(("bots-summary",))
+    if summaries is None:
+        # 活跃 Bot 和各自的交易数一次查询取回
+        all_bots = repos.bot.get_active_bots_with_trade_counts()
         
-        # 获取最近交易数量
-        recent_trades = trade_repo.get_trades(bot_id=bot.id, limit=10)
+        # 各 Bot 的绩效查询互不依赖，放到线程池并发执行：耗时取决于最慢的 Bot 而不是总和
+        bind = repos.db.get_bind()
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(_SUMMARY_CONCURRENCY)
+        
+        async def summarize(bot: Bot, trades_count: int) -> dict:
+            async with semaphore:
+                return await loop.run_in_executor(None, _summarize_bot, bot, trades_count, bind)
+        
+        # 并发的首次请求可能各自计算一次，结果相同，后写入的覆盖先写入的
+        summaries = await asyncio.gather(*(summarize(bot, count) for bot, count in all_bots))
+        _cache_put(("bots-summary",), summaries)
+    
+    # 运行状态实时读取（一次取全部运行中的 bot）
+    running = bot_manager.list_running()
+    result = []
+    for summary in summaries:
+        process_info = running.get(summary["id"])
         
         result.append({
-            "id": bot.id,
-            "name": bot.name,
-            "display_name": bot.display_name,
-            "trading_mode": bot.trading_mode,
-            "is_running": is_running,
+            "id": summary["id"],
+            "name": summary["name"],
+            "display_name": summary["display_name"],
+            "trading_mode": summary["trading_mode"],
+            "is_running": process_info is not None,
             "cycle": process_info.get("cycle", 0) if process_info else 0,
             "uptime_seconds": process_info.get("uptime") if process_info else None,
-            "performance": {
-                "win_rate": round(win_rate, 1),
-                "total_pnl_usd": round(total_pnl, 2),
-                "sharpe_ratio": round(sharpe, 2),
-            },
-            "recent_trades_count": len(recent_trades),
-            "last_active_at": bot.last_active_at.isoformat() if bot.last_active_at else None,
+            "performance": summary["performance"],
+            "recent_trades_count": summary["recent_trades_count"],
+            "last_active_at": summary["last_active_at"],
         })
     
     return APIResponse(data=result)
@@ -162,8 +244,7 @@ async def get_all_bots_summary(
 async def get_bot_equity_chart(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
-    trade_repo: TradeRepo,
+    repos: ReposDep,
     days: int = Query(30, ge=1, le=365, description="Number of days"),
 ):
     """
@@ -171,55 +252,49 @@ async def get_bot_equity_chart(
     
     返回每日的累计 PnL 数据点
     """
-    bot = bot_repo.get_by_id(bot_id)
-    if not bot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Bot with id {bot_id} not found"
-        )
-    
-    # 获取交易历史
-    start_date = datetime.now() - timedelta(days=days)
-    trades = trade_repo.get_trades(bot_id=bot_id, limit=10000)
-    trades = [t for t in trades if t.opened_at >= start_date and t.status == 'closed']
-    
-    # 按日期汇总
-    daily_pnl = defaultdict(float)
-    for trade in trades:
-        if trade.pnl_usd:
-            date_key = trade.opened_at.date().isoformat()
-            daily_pnl[date_key] += float(trade.pnl_usd)
-    
-    # 生成累计曲线
-    result = []
-    cumulative = float(bot.initial_balance or 10000)
-    
-    # 填充日期范围
-    current_date = start_date.date()
-    end_date = datetime.now().date()
-    
-    while current_date <= end_date:
-        date_str = current_date.isoformat()
-        daily_change = daily_pnl.get(date_str, 0)
-        cumulative += daily_change
+    def load():
+        bot = repos.bot.get_by_id(bot_id)
+        if not bot:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Bot with id {bot_id} not found"
+            )
         
-        result.append({
-            "date": date_str,
-            "equity": round(cumulative, 2),
-            "daily_pnl": round(daily_change, 2),
-        })
+        # 按日期汇总已平仓 PnL
+        start_date = datetime.now() - timedelta(days=days)
+        daily_stats = repos.trade.daily_stats(bot_id, start_date)
+        
+        # 生成累计曲线
+        result = []
+        cumulative = float(bot.initial_balance or 10000)
+        
+        # 填充日期范围
+        current_date = start_date.date()
+        end_date = datetime.now().date()
         
-        current_date += timedelta(days=1)
+        while current_date <= end_date:
+            date_str = current_date.isoformat()
+            daily_change = daily_stats[date_str]["pnl"] if date_str in daily_stats else 0
+            cumulative += daily_change
+            
+            result.append({
+                "date": date_str,
+                "equity": round(cumulative, 2),
+                "daily_pnl": round(daily_change, 2),
+            })
+            
+            current_date += timedelta(days=1)
+        
+        return result
     
-    return APIResponse(data=result)
+    return APIResponse(data=_cached(("equity", bot_id, days), load))
 
 
 @router.get("/charts/{bot_id}/trades", response_model=APIResponse[list])
 async def get_bot_trades_chart(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
-    trade_repo: TradeRepo,
+    repos: ReposDep,
     days: int = Query(30, ge=1, le=365, description="Number of days"),
 ):
     """
@@ -227,61 +302,47 @@ async def get_bot_trades_chart(
     
     返回每日交易数量和胜负统计
     """
-    bot = bot_repo.get_by_id(bot_id)
-    if not bot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Bot with id {bot_id} not found"
-        )
-    
-    # 获取交易历史
-    start_date = datetime.now() - timedelta(days=days)
-    trades = trade_repo.get_trades(bot_id=bot_id, limit=10000)
-    trades = [t for t in trades if t.opened_at >= start_date]
-    
-    # 按日期汇总
-    daily_stats = defaultdict(lambda: {"total": 0, "wins": 0, "losses": 0, "pnl": 0})
-    
-    for trade in trades:
-        date_key = trade.opened_at.date().isoformat()
-        daily_stats[date_key]["total"] += 1
+    def load():
+        bot = repos.bot.get_by_id(bot_id)
+        if not bot:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Bot with id {bot_id} not found"
+            )
         
-        if trade.status == 'closed' and trade.pnl_usd:
-            pnl = float(trade.pnl_usd)
-            daily_stats[date_key]["pnl"] += pnl
-            if pnl > 0:
-                daily_stats[date_key]["wins"] += 1
-            else:
-                daily_stats[date_key]["losses"] += 1
-    
-    # 生成结果
-    result = []
-    current_date = start_date.date()
-    end_date = datetime.now().date()
-    
-    while current_date <= end_date:
-        date_str = current_date.isoformat()
-        stats = daily_stats.get(date_str, {"total": 0, "wins": 0, "losses": 0, "pnl": 0})
+        # 按日期汇总
+        start_date = datetime.now() - timedelta(days=days)
+        daily_stats = repos.trade.daily_stats(bot_id, start_date)
         
-        result.append({
-            "date": date_str,
-            "trades": stats["total"],
-            "wins": stats["wins"],
-            "losses": stats["losses"],
-            "pnl": round(stats["pnl"], 2),
-        })
+        # 生成结果
+        result = []
+        current_date = start_date.date()
+        end_date = datetime.now().date()
+        
+        while current_date <= end_date:
+            date_str = current_date.isoformat()
+            stats = daily_stats.get(date_str, {"trades": 0, "wins": 0, "losses": 0, "pnl": 0})
+            
+            result.append({
+                "date": date_str,
+                "trades": stats["trades"],
+                "wins": stats["wins"],
+                "losses": stats["losses"],
+                "pnl": round(stats["pnl"], 2),
+            })
+            
+            current_date += timedelta(days=1)
         
-        current_date += timedelta(days=1)
+        return result
     
-    return APIResponse(data=result)
+    return APIResponse(data=_cached(("trades", bot_id, days), load))
 
 
 @router.get("/charts/{bot_id}/symbols", response_model=APIResponse[list])
 async def get_bot_symbols_distribution(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
-    trade_repo: TradeRepo,
+    repos: ReposDep,
     days: int = Query(30, ge=1, le=365, description="Number of days"),
 ):
     """
@@ -289,48 +350,34 @@ async def get_bot_symbols_distribution(
     
     返回每个币种的交易次数和 PnL
     """
-    bot = bot_repo.get_by_id(bot_id)
-    if not bot:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Bot with id {bot_id} not found"
-        )
-    
-    # 获取交易历史
-    start_date = datetime.now() - timedelta(days=days)
-    trades = trade_repo.get_trades(bot_id=bot_id, limit=10000)
-    trades = [t for t in trades if t.opened_at >= start_date]
-    
-    # 按币种汇总
-    symbol_stats = defaultdict(lambda: {"trades": 0, "pnl": 0, "wins": 0, "losses": 0})
-    
-    for trade in trades:
-        symbol_stats[trade.symbol]["trades"] += 1
+    def load():
+        bot = repos.bot.get_by_id(bot_id)
+        if not bot:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Bot with id {bot_id} not found"
+            )
         
-        if trade.status == 'closed' and trade.pnl_usd:
-            pnl = float(trade.pnl_usd)
-            symbol_stats[trade.symbol]["pnl"] += pnl
-            if pnl > 0:
-                symbol_stats[trade.symbol]["wins"] += 1
-            else:
-                symbol_stats[trade.symbol]["losses"] += 1
-    
-    # 排序并返回
-    result = []
-    for symbol, stats in sorted(symbol_stats.items(), key=lambda x: x[1]["trades"], reverse=True):
-        total = stats["wins"] + stats["losses"]
-        win_rate = stats["wins"] / total * 100 if total > 0 else 0
+        # 按币种汇总（数据库中已按交易数排序）
+        start_date = datetime.now() - timedelta(days=days)
         
-        result.append({
-            "symbol": symbol,
-            "trades": stats["trades"],
-            "pnl": round(stats["pnl"], 2),
-            "wins": stats["wins"],
-            "losses": stats["losses"],
-            "win_rate": round(win_rate, 1),
-        })
+        result = []
+        for symbol, stats in repos.trade.symbol_stats(bot_id, start_date):
+            total = stats["wins"] + stats["losses"]
+            win_rate = stats["wins"] / total * 100 if total > 0 else 0
+            
+            result.append({
+                "symbol": symbol,
+                "trades": stats["trades"],
+                "pnl": round(stats["pnl"], 2),
+                "wins": stats["wins"],
+                "losses": stats["losses"],
+                "win_rate": round(win_rate, 1),
+            })
+        
+        return result
     
-    return APIResponse(data=result)
+    return APIResponse(data=_cached(("symbols", bot_id, days), load))
 
 
 # =============================================================================
@@ -340,62 +387,50 @@ async def get_bot_symbols_distribution(
 @router.get("/stats/global", response_model=APIResponse[dict])
 async def get_global_stats(
     api_key: APIKey,
-    trade_repo: TradeRepo,
-    db: DbSession,
+    repos: ReposDep,
 ):
     """
     获取全局统计数据
     
     用于系统级别的统计展示
     """
-    # 获取所有交易
-    all_trades = trade_repo.get_trades(limit=100000)
-    closed_trades = [t for t in all_trades if t.status == 'closed']
-    
-    # 时间范围统计
-    now = datetime.now()
-    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
-    
-    today_trades = [t for t in closed_trades if t.opened_at >= today]
-    week_trades = [t for t in closed_trades if t.opened_at >= week_ago]
-    month_trades = [t for t in closed_trades if t.opened_at >= month_ago]
-    
-    def calc_stats(trades):
-        if not trades:
-            return {"trades": 0, "pnl": 0, "win_rate": 0}
+    def load():
+        # 时间范围统计（已平仓交易，一次查询汇总全部窗口）
+        now = datetime.now()
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        week_ago = now - timedelta(days=7)
+        month_ago = now - timedelta(days=30)
+        
+        all_time, today_stats, week_stats, month_stats = repos.trade.closed_window_stats(
+            [None, today, week_ago, month_ago]
+        )
         
-        total = len(trades)
-        pnl = sum(float(t.pnl_usd or 0) for t in trades)
-        wins = sum(1 for t in trades if float(t.pnl_usd or 0) > 0)
-        win_rate = wins / total * 100 if total > 0 else 0
+        def calc_stats(stats):
+            if not stats["trades"]:
+                return {"trades": 0, "pnl": 0, "win_rate": 0}
+            
+            total = stats["trades"]
+            win_rate = stats["wins"] / total * 100 if total > 0 else 0
+            
+            return {
+                "trades": total,
+                "pnl": round(stats["pnl"], 2),
+                "win_rate": round(win_rate, 1),
+            }
+        
+        # 按 Bot 统计（已按 PnL 降序），找出表现最好和最差的 Bot
+        sorted_bots = repos.trade.closed_pnl_by_bot()
         
         return {
-            "trades": total,
-            "pnl": round(pnl, 2),
-            "win_rate": round(win_rate, 1),
-        }
-    
-    # 按 Bot 统计
-    bot_stats = defaultdict(lambda: {"trades": 0, "pnl": 0})
-    for trade in closed_trades:
-        bot_stats[trade.bot_id]["trades"] += 1
-        bot_stats[trade.bot_id]["pnl"] += float(trade.pnl_usd or 0)
-    
-    # 找出表现最好和最差的 Bot
-    sorted_bots = sorted(bot_stats.items(), key=lambda x: x[1]["pnl"], reverse=True)
-    
-    return APIResponse(
-        data={
-            "all_time": calc_stats(closed_trades),
-            "today": calc_stats(today_trades),
-            "week": calc_stats(week_trades),
-            "month": calc_stats(month_trades),
-            "total_open_positions": sum(1 for t in all_trades if t.status == 'open'),
-            "bots_count": len(bot_stats),
+            "all_time": calc_stats(all_time),
+            "today": calc_stats(today_stats),
+            "week": calc_stats(week_stats),
+            "month": calc_stats(month_stats),
+            "total_open_positions": repos.trade.count_by_status("open"),
+            "bots_count": len(sorted_bots),
             "best_bot_id": sorted_bots[0][0] if sorted_bots else None,
             "worst_bot_id": sorted_bots[-1][0] if sorted_bots else None,
         }
-    )
+    
+    return APIResponse(data=_cached(("global",), load))
 
@@ -8,16 +8,17 @@ Exchange 管理 API Routes
 - 连接测试
 - 余额查询
 """
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, status, Query
 from typing import Optional
 from datetime import datetime
 
-from langtrader_api.dependencies import APIKey, ExchangeRepo, DbSession
+from langtrader_api.dependencies import APIKey, ReposDep, DbSession
 from langtrader_api.schemas.base import APIResponse, PaginatedResponse
 from langtrader_api.schemas.exchanges import (
     ExchangeSummary, ExchangeDetail, ExchangeCreateRequest, 
     ExchangeUpdateRequest, ExchangeBalance, ExchangeTestResult
 )
+from langtrader_api.services import exchange_client
 from langtrader_core.data.models.exchange import exchange as Exchange
 
 router = APIRouter(prefix="/exchanges", tags=["Exchanges"])
@@ -37,14 +38,14 @@ def mask_key(key: str) -> str:
 @router.get("", response_model=APIResponse[list])
 async def list_exchanges(
     api_key: APIKey,
-    exchange_repo: ExchangeRepo,
+    repos: ReposDep,
 ):
     """
     获取所有交易所配置列表
     
     注意：API Key 和 Secret Key 会被脱敏显示
     """
-    exchanges = exchange_repo.get_all()
+    exchanges = repos.exchange.get_all()
     
     result = []
     for ex in exchanges:
@@ -64,14 +65,14 @@ async def list_exchanges(
 async def get_exchange(
     exchange_id: int,
     api_key: APIKey,
-    exchange_repo: ExchangeRepo,
+    repos: ReposDep,
 ):
     """
     获取交易所详情
     
     API Key 会部分脱敏显示（显示前4位和后4位）
     """
-    ex = exchange_repo.get_by_id(exchange_id)
+    ex = repos.exchange.get_by_id(exchange_id)
     if not ex:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -98,7 +99,7 @@ async def get_exchange(
 async def create_exchange(
     request: ExchangeCreateRequest,
     api_key: APIKey,
-    exchange_repo: ExchangeRepo,
+    repos: ReposDep,
     db: DbSession,
 ):
     """
@@ -141,7 +142,7 @@ async def update_exchange(
     exchange_id: int,
     request: ExchangeUpdateRequest,
     api_key: APIKey,
-    exchange_repo: ExchangeRepo,
+    repos: ReposDep,
     db: DbSession,
 ):
     """
@@ -149,7 +150,7 @@ async def update_exchange(
     
     只更新提供的字段，未提供的字段保持不变
     """
-    ex = exchange_repo.get_by_id_model(exchange_id)
+    ex = repos.exchange.get_by_id_model(exchange_id)
     if not ex:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -164,6 +165,7 @@ async def update_exchange(
     db.add(ex)
     db.commit()
     db.refresh(ex)
+    await exchange_client.invalidate(exchange_id)
     
     return APIResponse(
         data=ExchangeDetail(
@@ -184,21 +186,22 @@ async def update_exchange(
 async def delete_exchange(
     exchange_id: int,
     api_key: APIKey,
-    exchange_repo: ExchangeRepo,
+    repos: ReposDep,
 ):
     """
     删除交易所配置
     
     警告：删除后无法恢复，关联的 Bot 将无法正常运行
     """
-    ex = exchange_repo.get_by_id_model(exchange_id)
+    ex = repos.exchange.get_by_id_model(exchange_id)
     if not ex:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Exchange with id {exchange_id} not found"
         )
     
-    exchange_repo.delete(exchange_id)
+    repos.exchange.delete(exchange_id)
+    await exchange_client.invalidate(exchange_id)
 
 
 # =============================================================================
@@ -209,14 +212,14 @@ async def delete_exchange(
 async def test_exchange_connection(
     exchange_id: int,
     api_key: APIKey,
-    exchange_repo: ExchangeRepo,
+    repos: ReposDep,
 ):
     """
     测试交易所连接
     
     验证 API Key 是否有效，返回连接状态
     """
-    ex = exchange_repo.get_by_id(exchange_id)
+    ex = repos.exchange.get_by_id(exchange_id)
     if not ex:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -224,38 +227,8 @@ async def test_exchange_connection(
         )
     
     try:
-        import ccxt
-        
-        # 创建 ccxt 交易所实例
-        exchange_class = getattr(ccxt, ex['type'], None)
-        if not exchange_class:
-            return APIResponse(
-                data=ExchangeTestResult(
-                    success=False,
-                    message=f"Unsupported exchange type: {ex['type']}",
-                    latency_ms=None,
-                )
-            )
-        
-        config = {
-            'apiKey': ex['apikey'],
-            'secret': ex['secretkey'],
-        }
-        
-        if ex.get('uid'):
-            config['uid'] = ex['uid']
-        if ex.get('password'):
-            config['password'] = ex['password']
-        if ex.get('testnet'):
-            config['sandbox'] = True
-        
-        exchange_instance = exchange_class(config)
-        
         # 测试连接
-        import time
-        start = time.time()
-        exchange_instance.fetch_time()
-        latency = int((time.time() - start) * 1000)
+        latency = await exchange_client.measure_latency(ex)
         
         return APIResponse(
             data=ExchangeTestResult(
@@ -279,14 +252,15 @@ async def test_exchange_connection(
 async def get_exchange_balance(
     exchange_id: int,
     api_key: APIKey,
-    exchange_repo: ExchangeRepo,
+    repos: ReposDep,
+    fresh: bool = Query(False, description="Bypass the short-lived cache and query the exchange"),
 ):
     """
     获取交易所账户余额
     
     返回 USDT/USDC 等稳定币余额
     """
-    ex = exchange_repo.get_by_id(exchange_id)
+    ex = repos.exchange.get_by_id(exchange_id)
     if not ex:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -294,32 +268,8 @@ async def get_exchange_balance(
         )
     
     try:
-        import ccxt
-        
-        # 创建 ccxt 交易所实例
-        exchange_class = getattr(ccxt, ex['type'], None)
-        if not exchange_class:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported exchange type: {ex['type']}"
-            )
-        
-        config = {
-            'apiKey': ex['apikey'],
-            'secret': ex['secretkey'],
-        }
-        
-        if ex.get('uid'):
-            config['uid'] = ex['uid']
-        if ex.get('password'):
-            config['password'] = ex['password']
-        if ex.get('testnet'):
-            config['sandbox'] = True
-        
-        exchange_instance = exchange_class(config)
-        
         # 获取余额
-        balance = exchange_instance.fetch_balance()
+        balance = await exchange_client.fetch_balance(ex, fresh=fresh)
         
         # 提取主要币种余额
         total_usd = 0.0
@@ -342,6 +292,11 @@ async def get_exchange_balance(
             )
         )
         
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -12,7 +12,7 @@ from fastapi import APIRouter, HTTPException, status
 from typing import Optional
 from datetime import datetime
 
-from langtrader_api.dependencies import APIKey, LLMConfigRepo, DbSession
+from langtrader_api.dependencies import APIKey, ReposDep, DbSession
 from langtrader_api.schemas.base import APIResponse
 from langtrader_api.schemas.llm_configs import (
     LLMConfigSummary, LLMConfigDetail, LLMConfigCreateRequest,
@@ -30,7 +30,7 @@ router = APIRouter(prefix="/llm-configs", tags=["LLM Configs"])
 @router.get("", response_model=APIResponse[list])
 async def list_llm_configs(
     api_key: APIKey,
-    llm_repo: LLMConfigRepo,
+    repos: ReposDep,
     enabled_only: bool = False,
 ):
     """
@@ -40,9 +40,9 @@ async def list_llm_configs(
         enabled_only: 是否只返回启用的配置
     """
     if enabled_only:
-        configs = llm_repo.get_enabled()
+        configs = repos.llm_config.get_enabled()
     else:
-        configs = llm_repo.get_all()
+        configs = repos.llm_config.get_all()
     
     result = []
     for cfg in configs:
@@ -62,12 +62,12 @@ async def list_llm_configs(
 @router.get("/default", response_model=APIResponse[LLMConfigDetail])
 async def get_default_llm_config(
     api_key: APIKey,
-    llm_repo: LLMConfigRepo,
+    repos: ReposDep,
 ):
     """
     获取默认 LLM 配置
     """
-    cfg = llm_repo.get_default()
+    cfg = repos.llm_config.get_default()
     if not cfg:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -81,14 +81,14 @@ async def get_default_llm_config(
 async def get_llm_config(
     config_id: int,
     api_key: APIKey,
-    llm_repo: LLMConfigRepo,
+    repos: ReposDep,
 ):
     """
     获取 LLM 配置详情
     
     API Key 会被脱敏显示
     """
-    cfg = llm_repo.get_by_id(config_id)
+    cfg = repos.llm_config.get_by_id(config_id)
     if not cfg:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -106,7 +106,7 @@ async def get_llm_config(
 async def create_llm_config(
     request: LLMConfigCreateRequest,
     api_key: APIKey,
-    llm_repo: LLMConfigRepo,
+    repos: ReposDep,
     db: DbSession,
 ):
     """
@@ -115,7 +115,7 @@ async def create_llm_config(
     支持的 provider：openai, anthropic, azure, ollama, custom
     """
     # 检查名称是否重复
-    existing = llm_repo.get_by_name(request.name)
+    existing = repos.llm_config.get_by_name(request.name)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -152,7 +152,7 @@ async def update_llm_config(
     config_id: int,
     request: LLMConfigUpdateRequest,
     api_key: APIKey,
-    llm_repo: LLMConfigRepo,
+    repos: ReposDep,
     db: DbSession,
 ):
     """
@@ -160,7 +160,7 @@ async def update_llm_config(
     
     只更新提供的字段，未提供的字段保持不变
     """
-    cfg = llm_repo.get_by_id(config_id)
+    cfg = repos.llm_config.get_by_id(config_id)
     if not cfg:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -187,14 +187,14 @@ async def update_llm_config(
 async def delete_llm_config(
     config_id: int,
     api_key: APIKey,
-    llm_repo: LLMConfigRepo,
+    repos: ReposDep,
 ):
     """
     删除 LLM 配置
     
     警告：删除后无法恢复，关联的 Bot 将无法使用该 LLM
     """
-    cfg = llm_repo.get_by_id(config_id)
+    cfg = repos.llm_config.get_by_id(config_id)
     if not cfg:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -207,7 +207,7 @@ async def delete_llm_config(
             detail="Cannot delete the default LLM config"
         )
     
-    llm_repo.delete(config_id)
+    repos.llm_config.delete(config_id)
 
 
 # =============================================================================
@@ -218,14 +218,14 @@ async def delete_llm_config(
 async def set_default_llm_config(
     config_id: int,
     api_key: APIKey,
-    llm_repo: LLMConfigRepo,
+    repos: ReposDep,
 ):
     """
     设置为默认 LLM 配置
     
     会将其他配置的 is_default 设为 False
     """
-    cfg = llm_repo.get_by_id(config_id)
+    cfg = repos.llm_config.get_by_id(config_id)
     if not cfg:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -238,7 +238,7 @@ async def set_default_llm_config(
             detail="Cannot set a disabled config as default"
         )
     
-    llm_repo.set_as_default(config_id)
+    repos.llm_config.set_as_default(config_id)
     
     return APIResponse(
         data={"config_id": config_id, "is_default": True},
@@ -250,14 +250,14 @@ async def set_default_llm_config(
 async def test_llm_config(
     config_id: int,
     api_key: APIKey,
-    llm_repo: LLMConfigRepo,
+    repos: ReposDep,
 ):
     """
     测试 LLM 配置连接
     
     发送一个简单的测试请求验证配置是否有效
     """
-    cfg = llm_repo.get_by_id(config_id)
+    cfg = repos.llm_config.get_by_id(config_id)
     if not cfg:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
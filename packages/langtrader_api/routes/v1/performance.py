@@ -4,7 +4,7 @@ Performance Metrics API Routes
 from fastapi import APIRouter, HTTPException, status, Query
 from typing import Optional
 
-from langtrader_api.dependencies import APIKey, BotRepo, PerfService
+from langtrader_api.dependencies import APIKey, ReposDep
 from langtrader_api.schemas.base import APIResponse, PerformanceMetrics
 
 router = APIRouter(prefix="/performance", tags=["Performance"])
@@ -14,8 +14,7 @@ router = APIRouter(prefix="/performance", tags=["Performance"])
 async def get_bot_performance(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
-    perf_service: PerfService,
+    repos: ReposDep,
     window: int = Query(50, ge=1, le=500, description="Number of trades to analyze"),
 ):
     """
@@ -29,7 +28,7 @@ async def get_bot_performance(
     - Average returns
     """
     # Verify bot exists
-    bot = bot_repo.get_by_id(bot_id)
+    bot = repos.bot.get_by_id(bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -38,7 +37,7 @@ async def get_bot_performance(
     
     # Calculate metrics
     try:
-        metrics = perf_service.calculate_metrics(bot_id, window=window)
+        metrics = repos.perf.calculate_metrics(bot_id, window=window)
         
         return APIResponse(
             data=PerformanceMetrics(
@@ -66,15 +65,14 @@ async def get_bot_performance(
 async def get_recent_trades_summary(
     bot_id: int,
     api_key: APIKey,
-    bot_repo: BotRepo,
-    perf_service: PerfService,
+    repos: ReposDep,
     limit: int = Query(10, ge=1, le=50, description="Number of recent trades"),
 ):
     """
     Get summary of recent trades (for dashboard display)
     """
     # Verify bot exists
-    bot = bot_repo.get_by_id(bot_id)
+    bot = repos.bot.get_by_id(bot_id)
     if not bot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -82,7 +80,7 @@ async def get_recent_trades_summary(
         )
     
     try:
-        summary_text = perf_service.get_recent_trades_summary(bot_id, limit=limit)
+        summary_text = repos.perf.get_recent_trades_summary(bot_id, limit=limit)
         
         return APIResponse(
             data={
@@ -101,8 +99,7 @@ async def get_recent_trades_summary(
 @router.get("/compare", response_model=APIResponse[dict])
 async def compare_bots_performance(
     api_key: APIKey,
-    bot_repo: BotRepo,
-    perf_service: PerfService,
+    repos: ReposDep,
     bot_ids: str = Query(..., description="Comma-separated bot IDs"),
     window: int = Query(50, ge=1, le=500),
 ):
@@ -119,13 +116,13 @@ async def compare_bots_performance(
     
     results = {}
     for bot_id in ids:
-        bot = bot_repo.get_by_id(bot_id)
+        bot = repos.bot.get_by_id(bot_id)
         if not bot:
             results[bot_id] = {"error": "Bot not found"}
             continue
         
         try:
-            metrics = perf_service.calculate_metrics(bot_id, window=window)
+            metrics = repos.perf.calculate_metrics(bot_id, window=window)
             results[bot_id] = {
                 "name": bot.name,
                 "win_rate": metrics.win_rate,
@@ -5,7 +5,7 @@ from fastapi import APIRouter, HTTPException, status, Query
 from typing import Optional, List
 from datetime import datetime, timedelta
 
-from langtrader_api.dependencies import APIKey, TradeRepo
+from langtrader_api.dependencies import APIKey, ReposDep
 from langtrader_api.schemas.base import APIResponse, PaginatedResponse
 from langtrader_api.schemas.trades import TradeRecord, TradeSummary, DailyPerformance
 
@@ -15,7 +15,7 @@ router = APIRouter(prefix="/trades", tags=["Trades"])
 @router.get("", response_model=APIResponse[PaginatedResponse[TradeRecord]])
 async def list_trades(
     api_key: APIKey,
-    trade_repo: TradeRepo,
+    repos: ReposDep,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     bot_id: Optional[int] = Query(None, description="Filter by bot ID"),
@@ -30,10 +30,10 @@ async def list_trades(
     """
     # Get trades using repository
     if bot_id:
-        trades = trade_repo.get_by_bot(bot_id=bot_id, limit=page_size * 10)
+        trades = repos.trade.get_by_bot(bot_id=bot_id, limit=page_size * 10)
     else:
         # 获取所有 bot 的交易历史
-        trades = trade_repo.get_all(limit=page_size * 10)
+        trades = repos.trade.get_all(limit=page_size * 10)
     
     # Apply additional filters
     filtered = trades
@@ -62,13 +62,13 @@ async def list_trades(
             page=page,
             page_size=page_size
         )
-    )
+    ).to_response()
 
 
 @router.get("/summary", response_model=APIResponse[TradeSummary])
 async def get_trade_summary(
     api_key: APIKey,
-    trade_repo: TradeRepo,
+    repos: ReposDep,
     bot_id: int = Query(..., description="Bot ID"),
     period: str = Query("all", description="Period: day, week, month, all"),
 ):
@@ -87,7 +87,7 @@ async def get_trade_summary(
         start_date = None
     
     # Get trades
-    trades = trade_repo.get_by_bot(bot_id=bot_id, limit=1000)
+    trades = repos.trade.get_by_bot(bot_id=bot_id, limit=1000)
     
     # Filter by date
     if start_date:
@@ -128,7 +128,7 @@ async def get_trade_summary(
 @router.get("/daily", response_model=APIResponse[List[DailyPerformance]])
 async def get_daily_performance(
     api_key: APIKey,
-    trade_repo: TradeRepo,
+    repos: ReposDep,
     bot_id: int = Query(..., description="Bot ID"),
     days: int = Query(30, ge=1, le=365, description="Number of days"),
 ):
@@ -139,7 +139,7 @@ async def get_daily_performance(
     
     # Get trades for the period
     start_date = datetime.now() - timedelta(days=days)
-    trades = trade_repo.get_by_bot(bot_id=bot_id, limit=10000)
+    trades = repos.trade.get_by_bot(bot_id=bot_id, limit=10000)
     trades = [t for t in trades if t.opened_at >= start_date]
     
     # Group by date
@@ -188,12 +188,12 @@ async def get_daily_performance(
 async def get_trade(
     trade_id: int,
     api_key: APIKey,
-    trade_repo: TradeRepo,
+    repos: ReposDep,
 ):
     """
     Get trade details by ID
     """
-    trade = trade_repo.get_by_id(trade_id)
+    trade = repos.trade.get_by_id(trade_id)
     if not trade:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
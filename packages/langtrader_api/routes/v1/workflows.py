@@ -5,7 +5,7 @@ from fastapi import APIRouter, HTTPException, status
 from typing import List, Optional
 from pydantic import BaseModel
 
-from langtrader_api.dependencies import APIKey, WorkflowRepo, DbSession
+from langtrader_api.dependencies import APIKey, ReposDep, DbSession, wait_plugins_ready
 from langtrader_api.schemas.base import APIResponse
 
 router = APIRouter(prefix="/workflows", tags=["Workflows"])
@@ -43,16 +43,18 @@ class WorkflowCreateRequest(BaseModel):
 @router.get("", response_model=APIResponse[list])
 async def list_workflows(
     api_key: APIKey,
-    workflow_repo: WorkflowRepo,
+    repos: ReposDep,
 ):
     """
     List all available workflows
     """
     from sqlmodel import select
+    from sqlalchemy.orm import selectinload
     from langtrader_core.data.models.workflow import Workflow
     
-    statement = select(Workflow)
-    workflows = workflow_repo.session.exec(statement).all()
+    # 预加载 nodes / edges：每个关系一条查询，而不是每个 workflow 各触发两次懒加载
+    statement = select(Workflow).options(selectinload(Workflow.nodes), selectinload(Workflow.edges))
+    workflows = repos.workflow.session.exec(statement).all()
     
     result = []
     for w in workflows:
@@ -81,7 +83,8 @@ async def list_available_plugins(
     """
     from langtrader_core.plugins.registry import registry
     
-    # Discover plugins if not already done
+    # 等待启动时的后台插件发现完成；未完成发现时兜底
+    await wait_plugins_ready()
     registry.discover_plugins("langtrader_core.graph.nodes")
     
     plugins = registry.list_plugins()
@@ -108,12 +111,12 @@ async def list_available_plugins(
 async def get_workflow(
     workflow_id: int,
     api_key: APIKey,
-    workflow_repo: WorkflowRepo,
+    repos: ReposDep,
 ):
     """
     Get workflow details including nodes and edges
     """
-    workflow = workflow_repo.get_workflow(workflow_id)
+    workflow = repos.workflow.get_workflow(workflow_id)
     if not workflow:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -137,6 +140,7 @@ async def get_workflow(
     
     # Get plugin metadata for enriching node info
     from langtrader_core.plugins.registry import registry
+    await wait_plugins_ready()
     registry.discover_plugins("langtrader_core.graph.nodes")
     plugin_metadata_map = {m.name: m for m in registry.list_plugins()}
     
@@ -145,7 +149,7 @@ async def get_workflow(
         for node in sorted(workflow.nodes, key=lambda n: n.execution_order):
             plugin_meta = plugin_metadata_map.get(node.plugin_name)
             # 获取节点配置
-            config = workflow_repo.get_node_config_dict(node.id)
+            config = repos.workflow.node_config_dict(node)
             result["nodes"].append({
                 "id": node.id,
                 "name": node.name,
@@ -177,12 +181,12 @@ async def get_workflow(
 async def get_workflow_nodes(
     workflow_id: int,
     api_key: APIKey,
-    workflow_repo: WorkflowRepo,
+    repos: ReposDep,
 ):
     """
     Get all nodes for a workflow with their configurations
     """
-    workflow = workflow_repo.get_workflow(workflow_id)
+    workflow = repos.workflow.get_workflow(workflow_id)
     if not workflow:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -193,7 +197,7 @@ async def get_workflow_nodes(
     if workflow.nodes:
         for node in sorted(workflow.nodes, key=lambda n: n.execution_order):
             # Get node config
-            config = workflow_repo.get_node_config_dict(node.id)
+            config = repos.workflow.node_config_dict(node)
             
             nodes.append({
                 "id": node.id,
@@ -214,7 +218,7 @@ async def update_workflow(
     workflow_id: int,
     request: WorkflowUpdateRequest,
     api_key: APIKey,
-    workflow_repo: WorkflowRepo,
+    repos: ReposDep,
     db: DbSession,
 ):
     """
@@ -226,7 +230,7 @@ async def update_workflow(
     from langtrader_core.data.models.workflow import WorkflowNode, WorkflowEdge
     from datetime import datetime
     
-    workflow = workflow_repo.get_workflow(workflow_id)
+    workflow = repos.workflow.get_workflow(workflow_id)
     if not workflow:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -235,7 +239,7 @@ async def update_workflow(
     
     try:
         # 1. 清空现有节点和边
-        workflow_repo.clear_nodes_and_edges(workflow_id)
+        repos.workflow.clear_nodes_and_edges(workflow_id)
         
         # 2. 创建新节点并保存配置
         for node_data in request.nodes:
@@ -255,7 +259,7 @@ async def update_workflow(
             # 保存节点配置（如果提供）
             if node_data.config:
                 for key, value in node_data.config.items():
-                    workflow_repo.set_node_config(new_node.id, key, value)
+                    repos.workflow.set_node_config(new_node.id, key, value)
         
         # 3. 创建新边
         for edge_data in request.edges:
@@ -343,13 +347,13 @@ async def create_workflow(
 async def delete_workflow(
     workflow_id: int,
     api_key: APIKey,
-    workflow_repo: WorkflowRepo,
+    repos: ReposDep,
     db: DbSession,
 ):
     """
     Delete a workflow and all its nodes/edges
     """
-    workflow = workflow_repo.get_workflow(workflow_id)
+    workflow = repos.workflow.get_workflow(workflow_id)
     if not workflow:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -358,7 +362,7 @@ async def delete_workflow(
     
     try:
         # 清空节点和边
-        workflow_repo.clear_nodes_and_edges(workflow_id)
+        repos.workflow.clear_nodes_and_edges(workflow_id)
         
         # 删除工作流
         db.delete(workflow)
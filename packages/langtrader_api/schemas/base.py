@@ -4,6 +4,7 @@ Base API Response Models
 from pydantic import BaseModel, Field
 from typing import Generic, TypeVar, List, Optional, Any
 from datetime import datetime
+from starlette.responses import Response
 
 T = TypeVar("T")
 
@@ -25,6 +26,19 @@ class APIResponse(BaseModel, Generic[T]):
     message: Optional[str] = None
     timestamp: datetime = Field(default_factory=datetime.now)
 
+    def to_response(self, status_code: int = 200) -> Response:
+        """
+        直接序列化为 JSON 响应
+
+        data 已是校验过的模型实例，返回 Response 可让 FastAPI 跳过
+        response_model 的再次校验和序列化（response_model 仅用于文档）。
+        """
+        return Response(
+            content=self.model_dump_json(),
+            status_code=status_code,
+            media_type="application/json",
+        )
+
 
 class PaginatedResponse(BaseModel, Generic[T]):
     """
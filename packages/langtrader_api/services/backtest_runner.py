@@ -0,0 +1,146 @@
+"""
+Backtest Runner
+回测任务执行与调度
+
+- 回测在 spawn 进程池中运行，CPU 密集的指标计算不阻塞事件循环
+- 配置 REDIS_URL 且安装 arq 时，回测作为 Arq 任务入队，由独立的 worker 进程执行：
+  API 重启不会丢失任务，且可横向扩展到多台机器
+    arq langtrader_api.workers.WorkerSettings
+- 否则回退为 API 进程内的后台任务
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+from fastapi import BackgroundTasks
+
+from langtrader_api.config import settings
+from langtrader_api.services.backtest_store import backtest_store
+from langtrader_core.utils import get_logger
+
+logger = get_logger("api.backtest_runner")
+
+# 回测进程数（同时运行的回测数上限）
+BACKTEST_WORKERS = min(4, os.cpu_count() or 1)
+
+# 回测进程池：spawn 启动，子进程不继承父进程的数据库连接和事件循环
+_backtest_executor = ProcessPoolExecutor(
+    max_workers=BACKTEST_WORKERS,
+    mp_context=multiprocessing.get_context("spawn"),
+)
+
+# Arq 连接池，init_backtest_queue() 成功后才可用
+_arq_pool = None
+
+
+def shutdown_backtest_executor():
+    """关闭回测进程池：取消排队的任务并终止仍在运行的回测进程"""
+    terminate_workers = getattr(_backtest_executor, "terminate_workers", None)
+    if terminate_workers:  # Python 3.14+
+        terminate_workers()
+        return
+    processes = list((_backtest_executor._processes or {}).values())
+    _backtest_executor.shutdown(wait=False, cancel_futures=True)
+    # 空闲进程收到退出信号后很快结束，仍在运行回测的进程直接终止
+    for process in processes:
+        process.join(timeout=1)
+        if process.is_alive():
+            process.terminate()
+
+
+async def init_backtest_queue():
+    """连接 Arq 任务队列；未配置 Redis 或缺少 arq 时使用进程内后台任务"""
+    global _arq_pool
+    if not settings.REDIS_URL:
+        return
+    try:
+        from arq import create_pool
+        from arq.connections import RedisSettings
+    except ImportError:
+        logger.warning("⚠️ REDIS_URL is set but the arq package is not installed, backtests run in-process")
+        return
+    try:
+        _arq_pool = await create_pool(RedisSettings.from_dsn(settings.REDIS_URL))
+        logger.info("✅ Backtest queue connected (arq)")
+    except Exception as e:
+        logger.warning(f"⚠️ Backtest queue unavailable, backtests run in-process: {e}")
+
+
+async def close_backtest_queue():
+    global _arq_pool
+    if _arq_pool is not None:
+        await _arq_pool.aclose()
+        _arq_pool = None
+
+
+async def enqueue_backtest(background_tasks: BackgroundTasks, task_id: str, **params):
+    """
+    提交回测任务
+
+    优先投递到 Arq 队列（以 task_id 作为 job id 去重），
+    队列不可用或投递失败时在当前进程的后台任务中运行。
+    """
+    if _arq_pool is not None:
+        try:
+            await _arq_pool.enqueue_job("run_backtest_job", task_id=task_id, _job_id=task_id, **params)
+            return
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to enqueue backtest {task_id}, running in-process: {e}")
+    background_tasks.add_task(run_backtest_task, task_id=task_id, **params)
+
+
+async def run_backtest_task(
+    task_id: str,
+    bot_id: int,
+    start_date: datetime,
+    end_date: datetime,
+    initial_balance: float,
+    symbols: Optional[list] = None,
+    max_cycles: Optional[int] = None,
+):
+    """
+    Run the backtest and record its status in the backtest store
+    """
+    result = await backtest_store.get(task_id)
+    if result is None:
+        return
+    result.status = "running"
+    await backtest_store.save(result)
+
+    try:
+        # 回测引擎依赖 pandas/langgraph/插件注册表，首次回测时才导入，不拖慢 API 启动
+        from langtrader_core.backtest.engine import run_backtest_sync
+
+        # 在独立进程中运行回测，CPU 密集的指标计算不阻塞 API 事件循环
+        loop = asyncio.get_running_loop()
+        report = await loop.run_in_executor(
+            _backtest_executor,
+            run_backtest_sync,
+            bot_id, start_date, end_date, initial_balance, symbols, max_cycles,
+        )
+
+        # Update result
+        result.status = "completed"
+        result.progress = 100.0
+        result.total_return = report.get("total_return", 0)
+        result.return_pct = report.get("return_pct", 0)
+        result.final_balance = report.get("final_balance", initial_balance)
+        result.total_trades = report.get("total_trades", 0)
+        result.win_rate = report.get("win_rate", 0)
+        result.sharpe_ratio = report.get("sharpe_ratio", 0)
+        result.max_drawdown = report.get("max_drawdown", 0)
+        result.profit_factor = report.get("profit_factor", 0)
+        result.completed_at = datetime.now()
+        result.duration_seconds = int(
+            (result.completed_at - result.started_at).total_seconds()
+        )
+
+    except Exception as e:
+        result.status = "failed"
+        result.error = str(e)
+        result.completed_at = datetime.now()
+
+    await backtest_store.save(result)
@@ -0,0 +1,176 @@
+"""
+Backtest Result Store
+回测任务状态存储
+
+- 配置 REDIS_URL 时使用 Redis：多个 worker 共享结果，条目按 TTL 自动过期；
+  启动时 Redis 连接失败则回退到进程内存储
+- 否则使用进程内存储：按 started_at 顺序保存，超出 TTL 或容量上限时淘汰最旧条目
+"""
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from langtrader_api.config import settings
+from langtrader_api.schemas.trades import BacktestResult
+from langtrader_core.utils import get_logger
+
+logger = get_logger("api.backtest_store")
+
+# 回测结果保留 7 天
+BACKTEST_TTL_SECONDS = 7 * 24 * 3600
+# 进程内存储最多保留的任务数
+MAX_MEMORY_RESULTS = 500
+
+
+class BacktestStore:
+    """
+    进程内回测结果存储
+
+    任务按创建顺序（即 started_at 顺序）插入，列表查询直接倒序遍历，无需排序。
+    另按 bot_id 维护同样有序的任务索引，按 Bot 过滤时只遍历该 Bot 的任务。
+    """
+
+    def __init__(self, ttl_seconds: int = BACKTEST_TTL_SECONDS, max_results: int = MAX_MEMORY_RESULTS):
+        self._ttl = ttl_seconds
+        self._max = max_results
+        self._results: "OrderedDict[str, BacktestResult]" = OrderedDict()
+        self._by_bot: Dict[int, "OrderedDict[str, None]"] = {}
+
+    def _evict(self):
+        """淘汰过期和超出容量的最旧条目"""
+        cutoff = datetime.fromtimestamp(time.time() - self._ttl)
+        while self._results:
+            task_id, oldest = next(iter(self._results.items()))
+            if len(self._results) <= self._max and oldest.started_at >= cutoff:
+                break
+            del self._results[task_id]
+            bot_tasks = self._by_bot[oldest.bot_id]
+            del bot_tasks[task_id]
+            if not bot_tasks:
+                del self._by_bot[oldest.bot_id]
+
+    async def save(self, result: BacktestResult):
+        """保存（新建或更新）回测结果"""
+        self._results[result.task_id] = result
+        self._by_bot.setdefault(result.bot_id, OrderedDict())[result.task_id] = None
+        self._evict()
+
+    async def get(self, task_id: str) -> Optional[BacktestResult]:
+        return self._results.get(task_id)
+
+    async def list(self, bot_id: Optional[int] = None, status: Optional[str] = None) -> List[BacktestResult]:
+        """按 started_at 倒序返回结果，可按 Bot 和状态过滤"""
+        self._evict()
+        if bot_id:
+            results = [self._results[t] for t in reversed(self._by_bot.get(bot_id, ()))]
+        else:
+            results = list(reversed(self._results.values()))
+        if status:
+            results = [r for r in results if r.status == status]
+        return results
+
+    async def connect(self):
+        """启动时调用；进程内存储无需连接"""
+
+    async def close(self):
+        pass
+
+
+class RedisBacktestStore(BacktestStore):
+    """
+    Redis 回测结果存储
+
+    - backtests:{task_id}: 结果 JSON，带 TTL
+    - backtests:index: 以 started_at 为 score 的有序集合，用于倒序列表查询
+    - backtests:bot:{bot_id}: 单个 Bot 的同结构索引，按 Bot 过滤时只取该 Bot 的任务
+    """
+
+    KEY_PREFIX = "backtests:"
+    INDEX_KEY = "backtests:index"
+    BOT_INDEX_PREFIX = "backtests:bot:"
+
+    def __init__(self, client, ttl_seconds: int = BACKTEST_TTL_SECONDS):
+        self._client = client
+        self._ttl = ttl_seconds
+
+    async def connect(self):
+        """
+        探测 Redis 连接（from_url 为惰性连接，首次命令才会失败）
+
+        连接失败时本实例回退为进程内存储：各模块持有的是同一个 backtest_store 对象，无法在启动后替换。
+        """
+        try:
+            await self._client.ping()
+        except Exception as e:
+            logger.warning(f"⚠️ Redis unavailable, using in-memory backtest store: {e}")
+            client, self._client = self._client, None
+            super().__init__(self._ttl)
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+    async def save(self, result: BacktestResult):
+        if self._client is None:
+            return await super().save(result)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.set(f"{self.KEY_PREFIX}{result.task_id}", result.model_dump_json(), ex=self._ttl)
+            bot_index = f"{self.BOT_INDEX_PREFIX}{result.bot_id}"
+            score = result.started_at.timestamp()
+            cutoff = time.time() - self._ttl
+            pipe.zadd(self.INDEX_KEY, {result.task_id: score})
+            pipe.zadd(bot_index, {result.task_id: score})
+            # 索引中超出 TTL 的任务对应的结果已过期，顺带清理
+            pipe.zremrangebyscore(self.INDEX_KEY, "-inf", cutoff)
+            pipe.zremrangebyscore(bot_index, "-inf", cutoff)
+            pipe.expire(bot_index, self._ttl)
+            await pipe.execute()
+
+    async def get(self, task_id: str) -> Optional[BacktestResult]:
+        if self._client is None:
+            return await super().get(task_id)
+        raw = await self._client.get(f"{self.KEY_PREFIX}{task_id}")
+        return BacktestResult.model_validate_json(raw) if raw else None
+
+    async def list(self, bot_id: Optional[int] = None, status: Optional[str] = None) -> List[BacktestResult]:
+        if self._client is None:
+            return await super().list(bot_id, status)
+        index = f"{self.BOT_INDEX_PREFIX}{bot_id}" if bot_id else self.INDEX_KEY
+        task_ids = await self._client.zrevrange(index, 0, -1)
+        if not task_ids:
+            return []
+
+        # 一次 MGET 取回全部结果
+        raws = await self._client.mget([f"{self.KEY_PREFIX}{self._decode(t)}" for t in task_ids])
+        results = [BacktestResult.model_validate_json(raw) for raw in raws if raw]
+        if status:
+            results = [r for r in results if r.status == status]
+        return results
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+
+    @staticmethod
+    def _decode(value) -> str:
+        return value.decode() if isinstance(value, bytes) else value
+
+
+def create_backtest_store() -> BacktestStore:
+    """
+    根据 REDIS_URL 选择存储后端；未安装 redis 包时使用进程内存储
+
+    Redis 服务不可达的回退在启动时由 connect() 完成。
+    """
+    if settings.REDIS_URL:
+        try:
+            import redis.asyncio as aioredis
+            return RedisBacktestStore(aioredis.from_url(settings.REDIS_URL))
+        except ImportError:
+            logger.warning("⚠️ REDIS_URL is set but the redis package is not installed, using in-memory backtest store")
+    return BacktestStore()
+
+
+# Global singleton instance
+backtest_store = create_backtest_store()
@@ -10,15 +10,64 @@ import subprocess
 import asyncio
 import signal
 import os
-import json
-from typing import Dict, Optional, Any
+import re
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
 from pathlib import Path
 
+import orjson
+
 from langtrader_api.config import settings
 
 
+# 从文件末尾读取日志时，按每行约 200 字节估算首次读取量
+_TAIL_LINE_BYTES = 200
+
+# 日志流检查文件变化的间隔（秒）
+LOG_FOLLOW_INTERVAL = 1.0
+
+# 通用换行符：\r\n、\r、\n（与文本模式 readlines 一致）
+_LINE_BREAK = re.compile(rb'\r\n|\r|\n')
+
+
+def _tail_start(f, lines: int, size: int) -> int:
+    """
+    返回最后 N 行在文件中的起始偏移
+
+    从文件末尾按块向前读取，块内换行数不足时读取量翻倍，
+    I/O 与 N 成正比而不是与文件大小成正比。
+    """
+    chunk = lines * _TAIL_LINE_BYTES
+    while True:
+        start = max(0, size - chunk)
+        f.seek(start)
+        data = f.read(size - start)
+        # 每个换行之后是一行的开头；文件末尾的换行后面没有新行
+        starts = [start + m.end() for m in _LINE_BREAK.finditer(data)]
+        starts = [offset for offset in starts if offset < size]
+        if start == 0:
+            starts.insert(0, 0)
+        if len(starts) >= lines:
+            return starts[-lines]
+        if start == 0:
+            return 0
+        chunk *= 2
+
+
+def _decode_lines(data: bytes) -> str:
+    return data.replace(b'\r\n', b'\n').replace(b'\r', b'\n').decode('utf-8', errors='replace')
+
+
+def _tail_lines(path: Path, lines: int) -> str:
+    """读取文本文件的最后 N 行"""
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(_tail_start(f, lines, size))
+        return _decode_lines(f.read())
+
+
 @dataclass
 class ProcessInfo:
     """Information about a running bot process"""
@@ -47,6 +96,10 @@ class BotManager:
         # .parent (3) = .../packages/
         # .parent (4) = .../  (项目根目录)
         self._project_root = Path(__file__).parent.parent.parent.parent
+        # 状态文件解析缓存：bot_id -> (mtime_ns, size, 状态字典)，文件未变化时不重复读取和解析
+        self._status_cache: Dict[int, Tuple[int, int, Dict[str, Any]]] = {}
+        # 同一 bot 的异步停止/重启串行执行
+        self._control_locks: Dict[int, asyncio.Lock] = {}
     
     def start_bot(self, bot_id: int, dry_run: bool = False) -> bool:
         """
@@ -80,6 +133,10 @@ class BotManager:
         # For now, we'll set it as environment variable
         env = os.environ.copy()
         env["BOT_ID"] = str(bot_id)
+        # DB_POOL_SIZE / DB_MAX_OVERFLOW 是 API 进程自身的连接池配置（docker-compose 中为 20 + 40），
+        # bot 进程不继承，使用代码默认的 10 + 20，避免连接数随 bot 数量成倍增长
+        env.pop("DB_POOL_SIZE", None)
+        env.pop("DB_MAX_OVERFLOW", None)
         
         if dry_run:
             env["DRY_RUN"] = "1"
@@ -124,16 +181,17 @@ class BotManager:
         Returns:
             True if stopped successfully
         """
-        if bot_id not in self._processes:
+        # stop_bot 在线程中执行，事件循环上的 is_running 可能同时清理同一条记录，
+        # 这里只用 get/pop 访问 _processes
+        info = self._processes.get(bot_id)
+        if info is None:
             return False
-        
-        info = self._processes[bot_id]
         process = info.process
         
         if process.poll() is not None:
             # Process already finished, close log handle and cleanup
             self._close_log_handle(info)
-            del self._processes[bot_id]
+            self._processes.pop(bot_id, None)
             return True
         
         try:
@@ -161,13 +219,46 @@ class BotManager:
             from langtrader_core.services.status_file import mark_bot_stopped
             mark_bot_stopped(bot_id)
             
-            del self._processes[bot_id]
+            self._processes.pop(bot_id, None)
             return True
             
         except Exception as e:
-            self._processes[bot_id].error = str(e)
+            info.error = str(e)
             return False
     
+    async def start_bot_async(self, bot_id: int, dry_run: bool = False) -> bool:
+        """
+        持有与 stop_bot_async / restart_bot 相同的 per-bot 锁执行 start_bot
+        
+        restart_bot 在线程中等待旧进程退出时，/start 请求会等它完成，
+        而不是抢先启动进程导致 restart 自己的 start_bot 报 "already running"。
+        """
+        async with self._control_locks.setdefault(bot_id, asyncio.Lock()):
+            return self.start_bot(bot_id, dry_run=dry_run)
+    
+    async def stop_bot_async(self, bot_id: int, force: bool = False) -> bool:
+        """
+        在线程中执行 stop_bot，供异步路由调用
+        
+        stop_bot 会同步等待进程退出（SIGTERM 后最长 10 秒，超时再 SIGKILL），
+        放到线程里等待，不阻塞事件循环上的其他请求。
+        """
+        async with self._control_locks.setdefault(bot_id, asyncio.Lock()):
+            return await asyncio.to_thread(self.stop_bot, bot_id, force)
+    
+    async def restart_bot(self, bot_id: int, dry_run: bool = False) -> bool:
+        """
+        停止（如在运行）后重新启动 bot
+        
+        旧进程确认退出后才启动新进程；停止失败时不启动，避免两个进程同时运行。
+        """
+        async with self._control_locks.setdefault(bot_id, asyncio.Lock()):
+            if self.is_running(bot_id) and not await asyncio.to_thread(self.stop_bot, bot_id):
+                info = self._processes.get(bot_id)
+                error = info.error if info else None
+                raise RuntimeError(f"Failed to stop bot {bot_id}: {error}")
+            return self.start_bot(bot_id, dry_run=dry_run)
+    
     def _close_log_handle(self, info: ProcessInfo):
         """
         关闭进程的日志文件句柄
@@ -192,27 +283,25 @@ class BotManager:
     
     def is_running(self, bot_id: int) -> bool:
         """Check if a bot is currently running"""
-        if bot_id not in self._processes:
+        info = self._processes.get(bot_id)
+        if info is None:
             return False
-        
-        info = self._processes[bot_id]
         process = info.process
         
         # Check if process is still alive
         if process.poll() is not None:
             # Process has finished, close log handle and cleanup
             self._close_log_handle(info)
-            del self._processes[bot_id]
+            self._processes.pop(bot_id, None)
             return False
         
         return True
     
     def get_process_info(self, bot_id: int) -> Optional[Dict[str, Any]]:
         """Get information about a running bot"""
-        if bot_id not in self._processes:
+        info = self._processes.get(bot_id)
+        if info is None:
             return None
-        
-        info = self._processes[bot_id]
         process = info.process
         
         # Calculate uptime
@@ -233,25 +322,17 @@ class BotManager:
         }
     
     def list_running(self) -> Dict[int, Dict[str, Any]]:
-        """List all running bots"""
-        result = {}
-        
-        # Clean up finished processes
-        finished = []
-        for bot_id in self._processes:
-            if not self.is_running(bot_id):
-                finished.append(bot_id)
-        
-        for bot_id in finished:
-            if bot_id in self._processes:
-                del self._processes[bot_id]
-        
-        # Get info for running bots
-        for bot_id in self._processes:
-            info = self.get_process_info(bot_id)
-            if info:
-                result[bot_id] = info
+        """
+        List all running bots
         
+        一次遍历得到所有运行中 bot 的进程信息（已退出的进程顺带清理），
+        需要多个 bot 状态的接口调用一次即可，不必逐个 is_running / get_process_info。
+        """
+        result = {}
+        # is_running 会删除已退出的进程，遍历副本
+        for bot_id in list(self._processes):
+            if self.is_running(bot_id):
+                result[bot_id] = self.get_process_info(bot_id)
         return result
     
     def get_logs(self, bot_id: int, lines: int = 100) -> Optional[str]:
@@ -266,9 +347,7 @@ class BotManager:
         
         if bot_log_file.exists():
             try:
-                with open(bot_log_file, 'r', encoding='utf-8') as f:
-                    all_lines = f.readlines()
-                    return "".join(all_lines[-lines:])
+                return _tail_lines(bot_log_file, lines)
             except Exception:
                 pass
         
@@ -279,17 +358,64 @@ class BotManager:
             return None
         
         try:
+            # 需要过滤整个文件，逐行读取只保留最后 N 行，不把整个文件载入内存
+            last_lines = deque(maxlen=lines)
+            bot_lines = deque(maxlen=lines)
             with open(global_log_file, 'r', encoding='utf-8') as f:
-                all_lines = f.readlines()
-                # Filter lines for this bot (if logged with bot_id)
-                bot_lines = [l for l in all_lines if f"bot_{bot_id}" in l.lower() or f"bot_id={bot_id}" in l]
-                if not bot_lines:
-                    # Return last N lines if no bot-specific logs
-                    return "".join(all_lines[-lines:])
-                return "".join(bot_lines[-lines:])
+                for l in f:
+                    last_lines.append(l)
+                    # Filter lines for this bot (if logged with bot_id)
+                    if f"bot_{bot_id}" in l.lower() or f"bot_id={bot_id}" in l:
+                        bot_lines.append(l)
+            if not bot_lines:
+                # Return last N lines if no bot-specific logs
+                return "".join(last_lines)
+            return "".join(bot_lines)
         except Exception:
             return None
     
+    async def follow_logs(self, bot_id: int, lines: int = 100) -> AsyncIterator[List[str]]:
+        """
+        持续产出 bot 专属日志文件的新行（SSE 日志流使用）
+        
+        第一次产出最后 N 行，之后每 LOG_FOLLOW_INTERVAL 秒 stat 一次，
+        文件变长时只读取新增的字节；未写完的行留到下次。
+        文件变短（被截断或轮转）时从头读取，文件不存在时等待创建。
+        本轮没有新行时产出空列表，调用方可据此发送心跳。
+        """
+        path = self._project_root / "logs" / f"bot_{bot_id}.log"
+        position: Optional[int] = None
+        pending = b""
+        
+        while True:
+            new_lines: List[str] = []
+            try:
+                size = path.stat().st_size
+            except OSError:
+                size = None
+            
+            if size is not None:
+                with open(path, 'rb') as f:
+                    if position is None:
+                        position = _tail_start(f, lines, size)
+                    elif size < position:
+                        position, pending = 0, b""
+                    if size > position:
+                        f.seek(position)
+                        data = pending + f.read(size - position)
+                        position = size
+                        # 末尾的 \r 可能是 \r\n 的前半部分，和未换行的内容一起留到下次
+                        ends = [m.end() for m in _LINE_BREAK.finditer(data) if m.end() < len(data) or data[-1:] == b'\n']
+                        cut = ends[-1] if ends else 0
+                        data, pending = data[:cut], data[cut:]
+                        new_lines = _decode_lines(data).split('\n')[:-1]
+            elif position is None:
+                # 文件还未创建（bot 尚未启动过），创建后从头读取
+                position = 0
+            
+            yield new_lines
+            await asyncio.sleep(LOG_FOLLOW_INTERVAL)
+    
     def _get_status_file_path(self, bot_id: int) -> Path:
         """获取 bot 状态文件路径"""
         return self._project_root / "status" / f"bot_{bot_id}.json"
@@ -308,14 +434,24 @@ class BotManager:
         """
         status_file = self._get_status_file_path(bot_id)
         
-        if not status_file.exists():
+        # 一次 stat 同时判断文件是否存在以及是否变化
+        try:
+            st = status_file.stat()
+        except OSError:
+            self._status_cache.pop(bot_id, None)
             return None
         
+        cached = self._status_cache.get(bot_id)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        
         try:
-            with open(status_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            status = orjson.loads(status_file.read_bytes())
         except Exception:
+            # 文件正在被 bot 进程改写时可能读到不完整的 JSON，不缓存
             return None
+        self._status_cache[bot_id] = (st.st_mtime_ns, st.st_size, status)
+        return status
     
     def get_bot_full_status(self, bot_id: int) -> Dict[str, Any]:
         """
@@ -327,17 +463,17 @@ class BotManager:
         Returns:
             完整状态字典
         """
+        is_running = self.is_running(bot_id)
         result = {
             "bot_id": bot_id,
-            "is_running": self.is_running(bot_id),
+            "is_running": is_running,
             "process_info": None,
             "runtime_status": None,
         }
         
-        # 进程信息
-        process_info = self.get_process_info(bot_id)
-        if process_info:
-            result["process_info"] = process_info
+        # 进程信息（is_running 为 False 时进程记录已被清理）
+        if is_running:
+            result["process_info"] = self.get_process_info(bot_id)
         
         # 运行时状态（从状态文件读取）
         status = self.read_bot_status(bot_id)
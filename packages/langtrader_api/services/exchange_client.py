@@ -0,0 +1,279 @@
+"""
+Exchange Client
+API 进程内的交易所实时查询（持仓、余额、连通性）
+
+使用 ccxt.async_support：网络调用直接在事件循环上并发执行，不占用线程。
+客户端按交易所配置缓存复用：市场信息只加载一次，aiohttp 连接保持复用。
+同一交易所配置的并发持仓/余额查询合并为一次上游调用（single-flight），
+结果短时缓存，仪表盘轮询大多直接命中内存。
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+from langtrader_core.utils import get_logger
+
+logger = get_logger("api.exchange_client")
+
+# 客户端缓存：键为创建客户端用到的全部配置字段，配置变更后自然生成新客户端
+_CLIENT_KEY_FIELDS = ('id', 'type', 'apikey', 'secretkey', 'uid', 'password', 'testnet')
+_CLIENT_CACHE_SIZE = 64
+_clients: "OrderedDict[Tuple, Any]" = OrderedDict()
+
+# 正在被调用的客户端：id(client) -> 使用中的调用数
+# 被淘汰/失效的客户端如果还在使用，先放进 _retired，最后一个调用结束后再关闭
+_client_users: Dict[int, int] = {}
+_retired: Dict[int, Any] = {}
+
+# 正在进行的查询：(查询类型, *客户端键) -> Task，所有并发请求共享同一结果
+_inflight: Dict[Tuple, "asyncio.Task"] = {}
+
+# 持仓/余额结果缓存：(查询类型, *客户端键) -> (过期时间, 结果)
+_RESULT_TTL = 3.0
+_RESULT_CACHE_SIZE = 512
+_results: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+
+# 补充 markPrice 用的 ticker 缓存：(交易所类型, testnet, 排序后的交易对) -> (过期时间, tickers)
+# 行情是公共数据，同一交易所的不同账户共享
+_TICKER_TTL = 5.0
+_TICKER_CACHE_SIZE = 256
+_tickers: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+
+
+def create_ccxt_instance(ex: Dict[str, Any]):
+    """
+    创建 ccxt 异步交易所实例
+    """
+    import ccxt.async_support as ccxt
+
+    exchange_class = getattr(ccxt, ex['type'], None)
+    if not exchange_class:
+        raise ValueError(f"Unsupported exchange type: {ex['type']}")
+
+    config = {
+        'apiKey': ex['apikey'],
+        'secret': ex['secretkey'],
+        'walletAddress': ex['apikey'],  # Hyperliquid 使用 apikey 作为钱包地址
+        'privateKey': ex['secretkey'],   # Hyperliquid 需要
+        'timeout': 15000,  # 15秒超时
+        'enableRateLimit': True,
+    }
+    if ex.get('uid'):
+        config['uid'] = ex['uid']
+    if ex.get('password'):
+        config['password'] = ex['password']
+    if ex.get('testnet'):
+        config['sandbox'] = True
+
+    return exchange_class(config)
+
+
+async def _close_client(client):
+    try:
+        await client.close()
+    except Exception as e:
+        logger.debug(f"Failed to close ccxt client: {e}")
+
+
+def _client_key(ex: Dict[str, Any]) -> Tuple:
+    return tuple(ex.get(field) for field in _CLIENT_KEY_FIELDS)
+
+
+async def _retire_client(client):
+    """客户端移出缓存后关闭；仍有调用在使用时推迟到最后一个调用结束"""
+    if id(client) in _client_users:
+        _retired[id(client)] = client
+    else:
+        await _close_client(client)
+
+
+async def _get_client(ex: Dict[str, Any]):
+    """取出（或创建）该交易所配置的缓存客户端（调用交易所请使用 _use_client）"""
+    key = _client_key(ex)
+    client = _clients.get(key)
+    if client is not None:
+        _clients.move_to_end(key)
+        return client
+
+    client = create_ccxt_instance(ex)
+    _clients[key] = client
+    if len(_clients) > _CLIENT_CACHE_SIZE:
+        _, evicted = _clients.popitem(last=False)
+        await _retire_client(evicted)
+    return client
+
+
+@asynccontextmanager
+async def _use_client(ex: Dict[str, Any]) -> AsyncIterator[Any]:
+    """在调用期间持有客户端，期间被淘汰或失效也不会被关闭"""
+    client = await _get_client(ex)
+    key = id(client)
+    _client_users[key] = _client_users.get(key, 0) + 1
+    try:
+        yield client
+    finally:
+        _client_users[key] -= 1
+        if not _client_users[key]:
+            del _client_users[key]
+            retired = _retired.pop(key, None)
+            if retired is not None:
+                await _close_client(retired)
+
+
+async def invalidate(exchange_id: int):
+    """
+    丢弃并关闭该交易所的缓存客户端（配置更新或删除后调用）
+    
+    进行中的查询不再被新请求复用（旧查询完成后也不写入结果缓存），
+    仍在使用的客户端等查询结束后再关闭。
+    """
+    for key in [k for k in _results if k[1] == exchange_id]:
+        del _results[key]
+    for key in [k for k in _inflight if k[1] == exchange_id]:
+        del _inflight[key]
+    for key in [k for k in _clients if k[0] == exchange_id]:
+        await _retire_client(_clients.pop(key))
+
+
+async def close_all():
+    """关闭所有缓存的客户端（应用关闭时调用）"""
+    while _clients:
+        _, client = _clients.popitem()
+        await _close_client(client)
+    while _retired:
+        _, client = _retired.popitem()
+        await _close_client(client)
+
+
+async def _single_flight(key: Tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    合并相同 key 的并发调用：只有第一个调用者真正访问交易所，其余等待同一个 Task
+
+    shield 保证某个请求断开（被取消）时不会取消其他请求共享的查询。
+    调用方拿到的是同一个对象，只读使用。
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight[key] = task
+
+        def _done(t: "asyncio.Task"):
+            if _inflight.get(key) is t:
+                del _inflight[key]
+            # 所有等待者都已取消时，避免 "exception was never retrieved" 警告
+            if not t.cancelled():
+                t.exception()
+
+        task.add_done_callback(_done)
+    return await asyncio.shield(task)
+
+
+def _ttl_get(cache: "OrderedDict[Tuple, Tuple[float, Any]]", key: Tuple) -> Any:
+    """读取 TTL 缓存，未命中或已过期返回 None"""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        del cache[key]
+        return None
+    return entry[1]
+
+
+def _ttl_put(cache: "OrderedDict[Tuple, Tuple[float, Any]]", key: Tuple, value: Any, ttl: float, maxsize: int):
+    cache[key] = (time.monotonic() + ttl, value)
+    cache.move_to_end(key)
+    if len(cache) > maxsize:
+        cache.popitem(last=False)
+
+
+async def _cached(key: Tuple, fetch: Callable[[], Awaitable[Any]], fresh: bool) -> Any:
+    """先查结果缓存（TTL 内直接返回），未命中时经 single-flight 查询并写入缓存"""
+    if not fresh:
+        value = _ttl_get(_results, key)
+        if value is not None:
+            return value
+
+    async def fetch_and_store():
+        value = await fetch()
+        # 查询期间 invalidate 过（不再是该 key 的当前查询）时不写入缓存
+        if _inflight.get(key) is asyncio.current_task():
+            _ttl_put(_results, key, value, _RESULT_TTL, _RESULT_CACHE_SIZE)
+        return value
+
+    return await _single_flight(key, fetch_and_store)
+
+
+def _account_params(ex: Dict[str, Any]) -> Dict[str, Any]:
+    """查询账户数据的额外参数（Hyperliquid 需要指定钱包地址）"""
+    return {'user': ex['apikey']} if ex['type'] == 'hyperliquid' else {}
+
+
+async def fetch_positions(ex: Dict[str, Any], fresh: bool = False) -> List[Dict]:
+    """
+    获取持仓
+
+    返回的持仓数据会包含 markPrice，如果 markPrice 为 0，
+    尝试从 ticker 获取实时价格作为补充。
+    fresh=True 时跳过结果缓存和 ticker 缓存，直接查询交易所。
+    """
+    return await _cached(('positions',) + _client_key(ex), lambda: _fetch_positions(ex, fresh), fresh)
+
+
+async def _fetch_tickers(exchange_instance, ex: Dict[str, Any], symbols: List[str], fresh: bool) -> Dict:
+    """批量获取 ticker，结果短时缓存"""
+    key = (ex['type'], bool(ex.get('testnet')), tuple(sorted(symbols)))
+    if not fresh:
+        tickers = _ttl_get(_tickers, key)
+        if tickers is not None:
+            return tickers
+    tickers = await exchange_instance.fetch_tickers(symbols)
+    _ttl_put(_tickers, key, tickers, _TICKER_TTL, _TICKER_CACHE_SIZE)
+    return tickers
+
+
+async def _fetch_positions(ex: Dict[str, Any], fresh: bool = False) -> List[Dict]:
+    async with _use_client(ex) as exchange_instance:
+        positions = await exchange_instance.fetch_positions(params=_account_params(ex))
+
+        # 补充 markPrice：如果某些持仓的 markPrice 为 0，尝试获取 ticker 价格
+        symbols_need_price = []
+        for pos in positions:
+            size = float(pos.get('contracts', 0) or pos.get('contractSize', 0) or 0)
+            mark_price = float(pos.get('markPrice', 0) or 0)
+            if abs(size) > 0 and mark_price <= 0:
+                symbols_need_price.append(pos.get('symbol'))
+
+        if symbols_need_price:
+            try:
+                # 批量获取 ticker 价格
+                tickers = await _fetch_tickers(exchange_instance, ex, symbols_need_price, fresh)
+                for pos in positions:
+                    symbol = pos.get('symbol')
+                    if symbol in tickers and float(pos.get('markPrice', 0) or 0) <= 0:
+                        ticker = tickers[symbol]
+                        pos['markPrice'] = float(ticker.get('last') or ticker.get('close') or 0)
+            except Exception:
+                # 获取失败时忽略，使用原始数据
+                pass
+
+        return positions
+
+
+async def fetch_balance(ex: Dict[str, Any], fresh: bool = False) -> Dict:
+    """获取余额（fresh=True 时跳过结果缓存）"""
+    return await _cached(('balance',) + _client_key(ex), lambda: _fetch_balance(ex), fresh)
+
+
+async def _fetch_balance(ex: Dict[str, Any]) -> Dict:
+    async with _use_client(ex) as exchange_instance:
+        return await exchange_instance.fetch_balance(params=_account_params(ex))
+
+
+async def measure_latency(ex: Dict[str, Any]) -> int:
+    """测试交易所连接，返回 fetch_time 往返耗时（毫秒）"""
+    async with _use_client(ex) as exchange_instance:
+        start = time.time()
+        await exchange_instance.fetch_time()
+        return int((time.time() - start) * 1000)
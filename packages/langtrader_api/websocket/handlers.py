@@ -12,8 +12,9 @@ from uuid import uuid4
 from typing import Optional
 
 from langtrader_api.websocket.manager import ws_manager
+from langtrader_api.websocket.status_publisher import bot_status_message
 from langtrader_api.schemas.websocket import WSMessage, WSEventType, WSCommand
-from langtrader_api.config import settings
+from langtrader_api.auth.api_key import is_valid_api_key
 
 router = APIRouter()
 
@@ -47,7 +48,7 @@ async def authenticate_websocket(websocket: WebSocket, connection_id: str) -> bo
             ))
             return False
         
-        if not api_key or api_key not in settings.API_KEYS:
+        if not is_valid_api_key(api_key):
             await ws_manager.send_personal(connection_id, WSMessage(
                 event=WSEventType.ERROR,
                 data={"message": "Invalid API Key"}
@@ -116,7 +117,7 @@ async def trading_websocket(
     await ws_manager.connect(websocket, connection_id, api_key="pending")
     
     # 兼容旧版：如果 URL 中有 token，直接验证（但记录警告）
-    if token and token in settings.API_KEYS:
+    if token and is_valid_api_key(token):
         # 旧版兼容模式 - 发送弃用警告
         await ws_manager.send_personal(connection_id, WSMessage(
             event=WSEventType.CONNECTED,
@@ -158,6 +159,9 @@ async def trading_websocket(
         }
     ))
     
+    # 立即发送当前状态，之后只在状态变化时推送（见 status_publisher）
+    await ws_manager.send_personal(connection_id, bot_status_message(bot_id))
+    
     try:
         while True:
             # Receive commands from client
@@ -232,7 +236,7 @@ async def system_websocket(
     await ws_manager.connect(websocket, connection_id, api_key="pending")
     
     # 兼容旧版
-    if token and token in settings.API_KEYS:
+    if token and is_valid_api_key(token):
         await ws_manager.send_personal(connection_id, WSMessage(
             event=WSEventType.CONNECTED,
             data={
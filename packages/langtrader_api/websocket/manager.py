@@ -149,6 +149,15 @@ class WSManager:
         """Get number of subscribers for a channel"""
         return len(self._channels.get(channel, set()))
     
+    def get_subscribed_bot_ids(self, topic: str) -> Set[int]:
+        """Get ids of bots whose bot:{bot_id}:{topic} channel has subscribers"""
+        bot_ids = set()
+        for channel, subs in self._channels.items():
+            parts = channel.split(":")
+            if subs and len(parts) == 3 and parts[0] == "bot" and parts[2] == topic and parts[1].isdigit():
+                bot_ids.add(int(parts[1]))
+        return bot_ids
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get WebSocket statistics"""
         return {
@@ -168,12 +177,25 @@ ws_manager = WSManager()
 # Helper functions for broadcasting from other parts of the application
 # =============================================================================
 
+def bot_status_event(status_data: dict) -> WSEventType:
+    """Event type for a bot status payload (accepts is_running or WSBotUpdate.status)"""
+    if "is_running" in status_data:
+        running = status_data["is_running"]
+    else:
+        running = status_data.get("status") == "running"
+    if running:
+        return WSEventType.BOT_STARTED
+    if status_data.get("status") == "error":
+        return WSEventType.BOT_ERROR
+    return WSEventType.BOT_STOPPED
+
+
 async def broadcast_bot_status(bot_id: int, status_data: dict):
     """Broadcast bot status update"""
     await ws_manager.broadcast_channel(
         f"bot:{bot_id}:status",
         WSMessage(
-            event=WSEventType.BOT_STARTED if status_data.get("is_running") else WSEventType.BOT_STOPPED,
+            event=bot_status_event(status_data),
             data=status_data
         )
     )
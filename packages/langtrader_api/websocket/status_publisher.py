@@ -0,0 +1,105 @@
+"""
+Bot Status Publisher
+把 bot 状态变化推送到 WebSocket 的 bot:{bot_id}:status 频道
+
+后台任务每秒检查一次有订阅者的 bot：状态文件未变化时只需一次 stat
+（BotManager 缓存了解析结果），状态与上次推送相同则不发送。
+前端连接 /ws/trading/{bot_id} 后即可收到状态变化，不必轮询 GET /bots/{id}/status。
+"""
+import asyncio
+from typing import Dict, Optional
+
+from langtrader_api.schemas.websocket import WSBotUpdate, WSMessage
+from langtrader_api.services.bot_manager import bot_manager
+from langtrader_api.websocket.manager import ws_manager, bot_status_event
+from langtrader_core.utils import get_logger
+
+logger = get_logger("api.ws_status")
+
+# 状态检查间隔（秒）
+STATUS_POLL_INTERVAL = 1.0
+
+
+def build_bot_update(bot_id: int) -> dict:
+    """由进程信息和状态文件生成 WSBotUpdate 载荷"""
+    full_status = bot_manager.get_bot_full_status(bot_id)
+    runtime_status = full_status["runtime_status"] or {}
+    process_info = full_status["process_info"] or {}
+
+    if full_status["is_running"]:
+        state = "running"
+    elif runtime_status.get("state") == "error":
+        state = "error"
+    else:
+        state = "stopped"
+
+    return WSBotUpdate(
+        bot_id=bot_id,
+        status=state,
+        cycle=runtime_status.get("cycle", 0),
+        balance=runtime_status.get("balance"),
+        open_positions=runtime_status.get("positions_count", 0),
+        symbols=runtime_status.get("symbols", []),
+        message=runtime_status.get("last_error") or process_info.get("error"),
+    ).model_dump()
+
+
+def bot_status_message(bot_id: int, update: Optional[dict] = None) -> WSMessage:
+    """当前状态的 WebSocket 消息（新订阅者连接时立即发送一次）"""
+    update = update if update is not None else build_bot_update(bot_id)
+    return WSMessage(
+        event=bot_status_event(update),
+        channel=f"bot:{bot_id}:status",
+        data=update,
+    )
+
+
+class StatusPublisher:
+    """检测 bot 状态变化并广播到对应的 status 频道"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        # 每个 bot 最近一次推送的载荷
+        self._last: Dict[int, dict] = {}
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._last.clear()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.publish_changes()
+            except Exception as e:
+                logger.warning(f"⚠️ Bot status publish failed: {e}")
+            await asyncio.sleep(STATUS_POLL_INTERVAL)
+
+    async def publish_changes(self):
+        """推送有订阅者且状态发生变化的 bot"""
+        bot_ids = ws_manager.get_subscribed_bot_ids("status")
+
+        # 没有订阅者的 bot 不再跟踪
+        for bot_id in self._last.keys() - bot_ids:
+            del self._last[bot_id]
+
+        for bot_id in bot_ids:
+            update = build_bot_update(bot_id)
+            if self._last.get(bot_id) == update:
+                continue
+            self._last[bot_id] = update
+            await ws_manager.broadcast_channel(f"bot:{bot_id}:status", bot_status_message(bot_id, update))
+
+
+# Global instance
+status_publisher = StatusPublisher()
@@ -0,0 +1,39 @@
+"""
+Arq Worker - 独立执行回测任务
+
+启动（需配置 REDIS_URL 并安装 arq）：
+    arq langtrader_api.workers.WorkerSettings
+
+任务状态写入 Redis 回测存储，API 进程通过 /backtests/{task_id} 读取。
+"""
+from arq.connections import RedisSettings
+
+from langtrader_api.config import settings
+from langtrader_api.services.backtest_runner import (
+    BACKTEST_WORKERS,
+    run_backtest_task,
+    shutdown_backtest_executor,
+)
+from langtrader_api.services.backtest_store import backtest_store
+
+# 单个回测任务的最长运行时间（秒）
+BACKTEST_JOB_TIMEOUT = 6 * 3600
+
+
+async def run_backtest_job(ctx, task_id: str, **params):
+    """Arq 任务入口：执行回测并更新存储中的状态"""
+    await run_backtest_task(task_id=task_id, **params)
+
+
+async def shutdown(ctx):
+    shutdown_backtest_executor()
+    await backtest_store.close()
+
+
+class WorkerSettings:
+    functions = [run_backtest_job]
+    redis_settings = RedisSettings.from_dsn(settings.REDIS_URL) if settings.REDIS_URL else RedisSettings()
+    # 并发任务数与回测进程池大小一致
+    max_jobs = BACKTEST_WORKERS
+    job_timeout = BACKTEST_JOB_TIMEOUT
+    on_shutdown = shutdown
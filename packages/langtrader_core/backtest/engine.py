@@ -2,6 +2,7 @@
 """
 回测引擎 - 在历史数据上重放工作流
 """
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, List
 from sqlmodel import Session
@@ -309,3 +310,46 @@ class BacktestEngine:
         
         logger.info("✅ Cleanup completed")
 
+
+def run_backtest_sync(
+    bot_id: int,
+    start_date: datetime,
+    end_date: datetime,
+    initial_balance: float,
+    symbols: Optional[List[str]] = None,
+    max_cycles: Optional[int] = None,
+) -> dict:
+    """
+    同步运行完整回测并返回报告
+
+    供进程池调用：在当前进程中新建事件循环和数据库 session，
+    参数和返回值都是可 pickle 的基础类型。
+    """
+    return asyncio.run(_run_backtest(bot_id, start_date, end_date, initial_balance, symbols, max_cycles))
+
+
+async def _run_backtest(
+    bot_id: int,
+    start_date: datetime,
+    end_date: datetime,
+    initial_balance: float,
+    symbols: Optional[List[str]],
+    max_cycles: Optional[int],
+) -> dict:
+    from langtrader_core.data import SessionLocal
+
+    engine = BacktestEngine(
+        bot_id=bot_id,
+        start_date=start_date,
+        end_date=end_date,
+        initial_balance=initial_balance,
+        symbols=symbols,
+        max_cycles=max_cycles,
+    )
+    session = SessionLocal()
+    try:
+        await engine.initialize(session)
+        return await engine.run()
+    finally:
+        await engine.cleanup()
+        session.close()
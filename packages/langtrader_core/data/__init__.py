@@ -1,4 +1,4 @@
 # packages/langtrader_core/data/__init__.py
-from .database import SessionLocal, init_db
+from .database import SessionLocal, RequestSessionLocal, init_db
 
-__all__ = ["SessionLocal", "init_db"]
\ No newline at end of file
+__all__ = ["SessionLocal", "RequestSessionLocal", "init_db"]
\ No newline at end of file
@@ -8,25 +8,79 @@ import os
 
 from sqlmodel import create_engine, SQLModel, Session
 from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
 from typing import Generator
 from dotenv import load_dotenv
 load_dotenv()
 from langgraph.checkpoint.postgres import PostgresSaver
+from langtrader_core.data.default_configs import DEFAULT_SYSTEM_CONFIGS
 
 # 使用同步驱动
 database_url = os.getenv("DATABASE_URL")
 
-# 配置连接池参数
+# 配置连接池参数（API 与每个 bot 进程各有一个连接池，总数需低于 PostgreSQL max_connections）
 engine = create_engine(
     database_url,
     echo=False,
-    pool_size=10,          # 连接池大小
-    max_overflow=20,       # 超出 pool_size 后可创建的最大连接数
+    pool_size=int(os.getenv("DB_POOL_SIZE", "10")),        # 连接池大小
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),  # 超出 pool_size 后可创建的最大连接数
+    pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),  # 连接池耗尽时等待空闲连接的秒数
     pool_pre_ping=True,    # 连接健康检查，防止使用已断开的连接
     pool_recycle=3600,     # 连接回收时间（秒），防止长连接问题
 )
 
 
+# Schema 版本：修改模型、_migrate_schema 或 checkpointer 相关 DDL 后递增
+# v2: bots.updated_at 默认值、bots 列表索引、trade_history 统计索引
+SCHEMA_VERSION = 2
+
+
+def _get_schema_version():
+    """
+    读取数据库中记录的 schema 版本
+    
+    Returns:
+        版本号；schema_meta 表不存在或读取失败时返回 None
+    """
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT version FROM schema_meta WHERE id = 1")).scalar()
+    except Exception:
+        # 老数据库 / 新数据库没有 schema_meta 表
+        return None
+
+
+def _mark_schema_version():
+    """
+    DDL 全部完成后记录当前 schema 版本
+    
+    只有 checkpointer 表也已就绪时才写入，否则下次启动仍走完整初始化。
+    """
+    try:
+        with engine.connect() as conn:
+            checkpoints_exists = conn.execute(text(
+                "SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = 'checkpoints')"
+            )).scalar()
+            if not checkpoints_exists:
+                return
+            
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS schema_meta (
+                    id INTEGER PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    updated_at TIMESTAMP DEFAULT NOW()
+                )
+            """))
+            conn.execute(text("""
+                INSERT INTO schema_meta (id, version) VALUES (1, :version)
+                ON CONFLICT (id) DO UPDATE SET version = EXCLUDED.version, updated_at = NOW()
+            """), {"version": SCHEMA_VERSION})
+            conn.commit()
+            print(f"✅ Database schema marked as v{SCHEMA_VERSION}")
+    except Exception as e:
+        print(f"⚠️ Failed to record schema version: {e}")
+
+
 def _init_system_configs():
     """
     初始化 system_configs 表和默认配置
@@ -51,48 +105,6 @@ def _init_system_configs():
     CREATE INDEX IF NOT EXISTS idx_system_configs_key ON system_configs(config_key);
     """
     
-    # 默认配置列表：(config_key, config_value, value_type, category, description, is_editable)
-    default_configs = [
-        # ========== 缓存配置 ==========
-        ('cache.ttl.tickers', '10', 'integer', 'cache', '行情数据缓存时间(秒)', True),
-        ('cache.ttl.ohlcv_3m', '300', 'integer', 'cache', '3分钟K线缓存时间(秒)', True),
-        ('cache.ttl.ohlcv_4h', '3600', 'integer', 'cache', '4小时K线缓存时间(秒)', True),
-        ('cache.ttl.ohlcv', '600', 'integer', 'cache', '默认K线缓存时间(秒)', True),
-        ('cache.ttl.orderbook', '60', 'integer', 'cache', '订单簿缓存时间(秒)', True),
-        ('cache.ttl.trades', '60', 'integer', 'cache', '成交记录缓存时间(秒)', True),
-        ('cache.ttl.markets', '3600', 'integer', 'cache', '市场信息缓存时间(秒)', True),
-        ('cache.ttl.open_interests', '600', 'integer', 'cache', '持仓量缓存时间(秒)', True),
-        ('cache.ttl.coin_selection', '600', 'integer', 'cache', '选币缓存时间(秒)', True),
-        ('cache.ttl.backtest_ohlcv', '604800', 'integer', 'cache', '回测数据缓存时间(秒)', False),
-        
-        # ========== 交易配置 ==========
-        ('trading.min_cycle_interval', '60', 'integer', 'trading', '最小交易周期(秒)', True),
-        ('trading.max_concurrent_requests', '10', 'integer', 'trading', 'API最大并发数', True),
-        ('trading.default_timeframes', '["3m", "4h"]', 'json', 'trading', '默认时间框架', True),
-        ('trading.default_ohlcv_limit', '100', 'integer', 'trading', '默认K线数据量', True),
-        
-        # ========== API 限制配置 ==========
-        ('api.rate_limit.binance', '1200', 'integer', 'api', 'Binance API限制(/分钟)', False),
-        ('api.rate_limit.bybit', '120', 'integer', 'api', 'Bybit API限制(/分钟)', False),
-        ('api.rate_limit.hyperliquid', '600', 'integer', 'api', 'Hyperliquid API限制(/分钟)', False),
-        ('api.default_rate_limit', '60', 'integer', 'api', '未知交易所默认限制(/分钟)', False),
-        
-        # ========== 系统配置 ==========
-        ('system.config_cache_ttl', '60', 'integer', 'system', '配置缓存时间(秒)', True),
-        ('system.enable_hot_reload', 'true', 'boolean', 'system', '是否启用配置热重载', True),
-        
-        # ========== 辩论配置 ==========
-        ('debate.enabled', 'true', 'boolean', 'debate', '是否启用辩论模式', True),
-        ('debate.rounds', '3', 'integer', 'debate', '辩论回合数', True),
-        ('debate.timeout_per_phase', '120', 'integer', 'debate', '每阶段超时(秒)', True),
-        
-        # ========== 市场状态识别配置 ==========
-        ('market_regime.adx_trending_threshold', '25', 'integer', 'market_regime', 'ADX 趋势阈值，超过此值视为趋势市', True),
-        ('market_regime.bb_width_ranging_threshold', '0.03', 'float', 'market_regime', 'BB 宽度震荡阈值（小数），低于此值视为窄幅震荡', True),
-        ('market_regime.bb_width_volatile_threshold', '0.08', 'float', 'market_regime', 'BB 宽度高波动阈值（小数），超过此值视为高波动', True),
-        ('market_regime.continue_if_has_positions', 'true', 'boolean', 'market_regime', '有持仓时是否继续进入决策以管理持仓', True),
-        ('market_regime.primary_timeframe', '4h', 'string', 'market_regime', '市场状态判断主要参考的时间框架', True),
-    ]
     
     with engine.connect() as conn:
         try:
@@ -106,17 +118,20 @@ def _init_system_configs():
             VALUES (:key, :value, :type, :category, :description, :editable)
             ON CONFLICT (config_key) DO NOTHING
             """
-            for config in default_configs:
-                conn.execute(text(insert_sql), {
-                    'key': config[0],
-                    'value': config[1],
-                    'type': config[2],
-                    'category': config[3],
-                    'description': config[4],
-                    'editable': config[5],
-                })
+            # executemany：一次往返写入全部默认值
+            conn.execute(text(insert_sql), [
+                {
+                    'key': key,
+                    'value': value,
+                    'type': value_type,
+                    'category': category,
+                    'description': description,
+                    'editable': editable,
+                }
+                for key, value, value_type, category, description, editable in DEFAULT_SYSTEM_CONFIGS
+            ])
             conn.commit()
-            print(f"✅ System configs initialized ({len(default_configs)} configs)")
+            print(f"✅ System configs initialized ({len(DEFAULT_SYSTEM_CONFIGS)} configs)")
         except Exception as e:
             print(f"⚠️ System configs initialization warning: {e}")
 
@@ -148,10 +163,16 @@ def _migrate_schema():
         "ALTER TABLE bots ALTER COLUMN llm_id DROP NOT NULL",
         # 设置合理的默认值（如果没有的话）
         "ALTER TABLE bots ALTER COLUMN prompt SET DEFAULT 'default.txt'",
+        # INSERT 不再写 updated_at，由数据库默认值生成（create_all 建的老表没有这个默认值）
+        "ALTER TABLE bots ALTER COLUMN updated_at SET DEFAULT now()",
         
         # ========== bots 表：添加新字段 ==========
         "ALTER TABLE bots ADD COLUMN IF NOT EXISTS max_leverage INTEGER DEFAULT 3",
         "ALTER TABLE bots ADD COLUMN IF NOT EXISTS max_concurrent_symbols INTEGER DEFAULT 5",
+        
+        # ========== 索引（与 scripts/migrations/013、014 一致） ==========
+        "CREATE INDEX IF NOT EXISTS ix_bots_is_active_trading_mode_id ON bots (is_active, trading_mode, id)",
+        "CREATE INDEX IF NOT EXISTS ix_trade_history_bot_id_opened_at ON trade_history (bot_id, opened_at)",
     ]
     
     with engine.connect() as conn:
@@ -178,6 +199,7 @@ def init_db():
     初始化数据库表结构
     
     流程：
+    0. 读取 schema_meta 中的版本号，与 SCHEMA_VERSION 一致时只执行第 3 步
     1. 创建所有表（新表会完整创建，已存在的表不变）
     2. 运行迁移脚本（为已存在的表添加缺失的列）
     3. 初始化 system_configs 表和默认配置
@@ -185,28 +207,22 @@ def init_db():
     
     注意：多个 bot 可以并发调用此函数，使用 PostgreSQL advisory lock 避免 DDL 操作的并发冲突。
     """
-    # 🚀 快速路径：如果核心表已存在，跳过 DDL 操作（但仍初始化配置）
-    # 这避免了多进程同时调用时的锁竞争
-    try:
-        with engine.connect() as conn:
-            result = conn.execute(text(
-                "SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = 'bots')"
-            ))
-            bots_exists = result.scalar()
-            
-            result = conn.execute(text(
-                "SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = 'checkpoints')"
-            ))
-            checkpoints_exists = result.scalar()
-            
-            if bots_exists and checkpoints_exists:
-                print(f"✅ Database already initialized, skipping DDL operations")
-                # 仍然初始化 system_configs（使用 ON CONFLICT DO NOTHING 确保幂等性）
-                _init_system_configs()
-                return
-    except Exception as e:
-        print(f"⚠️ Quick check failed, proceeding with full init: {e}")
+    # 🚀 快速路径：schema 版本与代码一致时跳过所有 DDL（但仍初始化配置）
+    # 只需一次查询；版本落后（老数据库）时会完整执行迁移
+    current_version = _get_schema_version()
+    if current_version == SCHEMA_VERSION:
+        print(f"✅ Database schema v{SCHEMA_VERSION} up to date, skipping DDL operations")
+        # 仍然初始化 system_configs（使用 ON CONFLICT DO NOTHING 确保幂等性）
+        _init_system_configs()
+        return
     
+    print(f"🔧 Database schema version {current_version} != {SCHEMA_VERSION}, running full init")
+    _init_schema()
+    _mark_schema_version()
+
+
+def _init_schema():
+    """执行完整的建表、迁移和 checkpointer 初始化（均为幂等操作）"""
     # 1. 创建表结构
     SQLModel.metadata.create_all(engine)
     
@@ -293,7 +309,10 @@ def get_session() -> Generator[Session, None, None]:
         yield session
 
 
-def SessionLocal() -> Session:
-    """创建新的数据库 session"""
-    return Session(engine)
+# session 工厂：配置只构建一次，每次调用返回一个从连接池取连接的新 Session
+SessionLocal = sessionmaker(bind=engine, class_=Session)
+
+# API 请求级 session：生命周期只有一个请求，commit 后无需让对象过期，
+# 避免序列化响应时对每个已提交对象重新 SELECT
+RequestSessionLocal = sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
 
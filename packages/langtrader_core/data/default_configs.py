@@ -0,0 +1,68 @@
+# packages/langtrader_core/data/default_configs.py
+"""
+system_configs 默认配置（唯一定义处）
+
+init_db() 启动时以 ON CONFLICT DO NOTHING 写入，不覆盖用户修改。
+"""
+import orjson
+
+# 辩论角色默认值：源码中保持可读格式，入库前压缩为紧凑 JSON
+_DEBATE_ROLES_RAW = '''[
+    {"id": "analyst", "name": "市场分析师", "name_en": "Market Analyst", "focus": "技术分析、趋势判断、关键支撑阻力位识别", "style": "客观、数据驱动、全面分析", "priority": 1},
+    {"id": "bull", "name": "多头交易员", "name_en": "Bull Trader", "focus": "寻找做多机会、识别上涨信号、评估做多胜率", "style": "积极、寻找机会、乐观但有依据", "priority": 2},
+    {"id": "bear", "name": "空头交易员", "name_en": "Bear Trader", "focus": "寻找做空机会、识别下跌信号、评估做空胜率", "style": "谨慎、识别风险、寻找下行机会", "priority": 2},
+    {"id": "risk_manager", "name": "风险经理", "name_en": "Risk Manager", "focus": "评估交易风险、验证仓位合理性、确保止损止盈设置正确", "style": "平衡、风险意识、促成合理交易", "priority": 3}
+]'''
+DEBATE_ROLES_JSON = orjson.dumps(orjson.loads(_DEBATE_ROLES_RAW)).decode()
+
+# 默认配置列表：(config_key, config_value, value_type, category, description, is_editable)
+DEFAULT_SYSTEM_CONFIGS: tuple[tuple, ...] = (
+    # ========== 缓存配置 ==========
+    ('cache.ttl.tickers', '10', 'integer', 'cache', '行情数据缓存时间(秒)', True),
+    ('cache.ttl.ohlcv_3m', '300', 'integer', 'cache', '3分钟K线缓存时间(秒)', True),
+    ('cache.ttl.ohlcv_4h', '3600', 'integer', 'cache', '4小时K线缓存时间(秒)', True),
+    ('cache.ttl.ohlcv', '600', 'integer', 'cache', '默认K线缓存时间(秒)', True),
+    ('cache.ttl.orderbook', '60', 'integer', 'cache', '订单簿缓存时间(秒)', True),
+    ('cache.ttl.trades', '60', 'integer', 'cache', '成交记录缓存时间(秒)', True),
+    ('cache.ttl.markets', '3600', 'integer', 'cache', '市场信息缓存时间(秒)', True),
+    ('cache.ttl.open_interests', '600', 'integer', 'cache', '持仓量缓存时间(秒)', True),
+    ('cache.ttl.coin_selection', '600', 'integer', 'cache', '选币缓存时间(秒)', True),
+    ('cache.ttl.backtest_ohlcv', '604800', 'integer', 'cache', '回测数据缓存时间(秒)', False),
+
+    # ========== 交易配置 ==========
+    ('trading.min_cycle_interval', '60', 'integer', 'trading', '最小交易周期(秒)', True),
+    ('trading.max_concurrent_requests', '10', 'integer', 'trading', 'API最大并发数', True),
+    ('trading.default_timeframes', '["3m", "4h"]', 'json', 'trading', '默认时间框架', True),
+    ('trading.default_ohlcv_limit', '100', 'integer', 'trading', '默认K线数据量', True),
+
+    # ========== API 限制配置 ==========
+    ('api.rate_limit.binance', '1200', 'integer', 'api', 'Binance API限制(/分钟)', False),
+    ('api.rate_limit.bybit', '120', 'integer', 'api', 'Bybit API限制(/分钟)', False),
+    ('api.rate_limit.hyperliquid', '600', 'integer', 'api', 'Hyperliquid API限制(/分钟)', False),
+    ('api.default_rate_limit', '60', 'integer', 'api', '未知交易所默认限制(/分钟)', False),
+
+    # ========== 系统配置 ==========
+    ('system.config_cache_ttl', '60', 'integer', 'system', '配置缓存时间(秒)', True),
+    ('system.enable_hot_reload', 'true', 'boolean', 'system', '是否启用配置热重载', True),
+
+    # ========== 辩论配置 ==========
+    ('debate.enabled', 'true', 'boolean', 'debate', '是否启用辩论机制', True),
+    ('debate.max_rounds', '2', 'integer', 'debate', '最大辩论轮数', True),
+    ('debate.timeout_per_phase', '120', 'integer', 'debate', '每阶段超时(秒)', True),
+    ('debate.trade_history_limit', '10', 'integer', 'debate', '注入的交易历史条数', True),
+    # 辩论角色（4 角色：分析师、多头、空头、风控）
+    ('debate.roles', DEBATE_ROLES_JSON, 'json', 'debate', '辩论角色列表（JSON 数组）', True),
+
+    # ========== 批量决策配置 ==========
+    ('batch_decision.max_total_allocation_pct', '80.0', 'float', 'batch_decision', '最大总仓位百分比', True),
+    ('batch_decision.max_single_allocation_pct', '40.0', 'float', 'batch_decision', '单币种最大仓位百分比', True),
+    ('batch_decision.min_cash_reserve_pct', '20.0', 'float', 'batch_decision', '最小现金储备百分比', True),
+    ('batch_decision.timeout_seconds', '360', 'integer', 'batch_decision', 'LLM 调用超时（秒）', True),
+
+    # ========== 市场状态识别配置 ==========
+    ('market_regime.adx_trending_threshold', '25', 'integer', 'market_regime', 'ADX 趋势阈值，超过此值视为趋势市', True),
+    ('market_regime.bb_width_ranging_threshold', '0.03', 'float', 'market_regime', 'BB 宽度震荡阈值（小数），低于此值视为窄幅震荡', True),
+    ('market_regime.bb_width_volatile_threshold', '0.08', 'float', 'market_regime', 'BB 宽度高波动阈值（小数），超过此值视为高波动', True),
+    ('market_regime.continue_if_has_positions', 'true', 'boolean', 'market_regime', '有持仓时是否继续进入决策以管理持仓', True),
+    ('market_regime.primary_timeframe', '4h', 'string', 'market_regime', '市场状态判断主要参考的时间框架', True),
+)
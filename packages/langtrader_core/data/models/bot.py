@@ -1,6 +1,6 @@
 # packages/langtrader_core/data/models/bot.py
 from sqlmodel import SQLModel, Field, Relationship, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index, func
 from typing import Optional, Dict, Any
 from datetime import datetime
 from decimal import Decimal
@@ -11,6 +11,12 @@ class Bot(SQLModel, table=True):
     Bot 是核心配置单元，包含交易所、策略、运行参数等所有配置
     """
     __tablename__ = "bots"
+    __table_args__ = (
+        # Bot 列表接口按 is_active / trading_mode 过滤并按 id 分页（迁移 013）
+        Index("ix_bots_is_active_trading_mode_id", "is_active", "trading_mode", "id"),
+    )
+    # 服务端生成的列（updated_at）随 INSERT/UPDATE 的 RETURNING 取回，写入后无需再 SELECT
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Optional[int] = Field(default=None, primary_key=True)
     prompt: str = Field(default=None)
@@ -125,7 +131,11 @@ class Bot(SQLModel, table=True):
     
     # 时间戳
     created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    # 由数据库时钟生成：插入用列默认值 now()，每次 ORM 更新自动 SET updated_at = now()
+    updated_at: datetime = Field(
+        default=None,
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()},
+    )
     last_active_at: Optional[datetime] = None
     
     # 创建者
@@ -3,6 +3,7 @@
 交易历史记录模型
 """
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 from typing import Optional
 from datetime import datetime
 from decimal import Decimal
@@ -14,6 +15,10 @@ class TradeHistory(SQLModel, table=True):
     记录每笔交易的开平仓信息和盈亏
     """
     __tablename__ = "trade_history"
+    __table_args__ = (
+        # Dashboard 图表按 bot_id + 开仓时间范围聚合（迁移 014）
+        Index("ix_trade_history_bot_id_opened_at", "bot_id", "opened_at"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     bot_id: int = Field(foreign_key="bots.id", index=True)
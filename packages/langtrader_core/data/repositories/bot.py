@@ -1,10 +1,11 @@
 # packages/langtrader_core/data/repositories/bot.py
 from sqlmodel import select, Session
+from sqlalchemy import func
 from langtrader_core.data.models.bot import Bot
-from typing import List, Optional
+from langtrader_core.data.models.trade_history import TradeHistory
+from typing import List, Optional, Tuple
 from langtrader_core.utils import get_logger
 logger = get_logger("bot_repository")
-from datetime import datetime
 
 class BotRepository:
     """Bot 仓储"""
@@ -22,9 +23,8 @@ class BotRepository:
         return bot
     
     def get_by_id(self, bot_id: int) -> Optional[Bot]:
-        """通过ID获取机器人"""
-        statement = select(Bot).where(Bot.id == bot_id)
-        bot = self.session.exec(statement).first()
+        """通过ID获取机器人（主键查询，已在 session 中的对象直接从 identity map 返回）"""
+        bot = self.session.get(Bot, bot_id)
         if bot:
             logger.info(f"✅ Got bot: {bot.name}")
         return bot
@@ -45,6 +45,24 @@ class BotRepository:
             logger.info(f"✅ Got active bots: {len(bots)}")
         return bots
     
+    def get_active_bots_with_trade_counts(self) -> List[Tuple[Bot, int]]:
+        """
+        获取所有活跃的机器人及其交易数（含未平仓）
+        
+        LEFT JOIN trade_history + GROUP BY 一次查询完成，没有交易的机器人计数为 0
+        """
+        statement = (
+            select(Bot, func.count(TradeHistory.id))
+            .outerjoin(TradeHistory, TradeHistory.bot_id == Bot.id)
+            .where(Bot.is_active == True)
+            .group_by(Bot.id)
+            .order_by(Bot.id)
+        )
+        rows = [(bot, count) for bot, count in self.session.exec(statement).all()]
+        if rows:
+            logger.info(f"✅ Got active bots with trade counts: {len(rows)}")
+        return rows
+    
     def get_bots_by_exchange(self, exchange_id: int) -> List[Bot]:
         """获取指定交易所的所有机器人"""
         statement = select(Bot).where(Bot.exchange_id == exchange_id)
@@ -55,7 +73,6 @@ class BotRepository:
     
     def update(self, bot: Bot) -> Bot:
         """更新机器人"""
-        bot.updated_at = datetime.now()
         self.session.add(bot)
         self.session.commit()
         self.session.refresh(bot)
@@ -67,7 +84,6 @@ class BotRepository:
         bot = self.get_by_id(bot_id)
         if bot:
             bot.is_active = False
-            bot.updated_at = datetime.now()
             self.session.commit()
             logger.info(f"✅ Deactivated bot: {bot.name}")
         else:
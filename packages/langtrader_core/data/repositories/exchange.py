@@ -23,8 +23,7 @@ class ExchangeRepository:
     
     def get_by_id(self, exchange_id: int) -> Optional[Dict[str, Any]]:
         """获取交易所配置"""
-        statement = select(exchange).where(exchange.id == exchange_id)
-        result = self.session.exec(statement).first()
+        result = self.session.get(exchange, exchange_id)
         if result:
             return {
                 "id": result.id,
@@ -42,8 +41,7 @@ class ExchangeRepository:
     
     def get_by_id_model(self, exchange_id: int) -> Optional[exchange]:
         """获取交易所模型对象（用于更新操作）"""
-        statement = select(exchange).where(exchange.id == exchange_id)
-        return self.session.exec(statement).first()
+        return self.session.get(exchange, exchange_id)
     
     def get_all(self) -> List[Dict[str, Any]]:
         """获取所有交易所配置"""
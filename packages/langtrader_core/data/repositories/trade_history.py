@@ -3,8 +3,9 @@
 交易历史仓储
 """
 from sqlmodel import select, Session
+from sqlalchemy import case, func
 from langtrader_core.data.models.trade_history import TradeHistory
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 from decimal import Decimal
 from langtrader_core.utils import get_logger
@@ -242,4 +243,134 @@ class TradeHistoryRepository:
         statement = statement.order_by(TradeHistory.opened_at.desc()).limit(limit)
         
         return list(self.session.exec(statement).all())
-
+    
+    # =========================================================================
+    # 聚合统计（Dashboard）：在数据库中 GROUP BY 汇总，只返回汇总后的行
+    # =========================================================================
+    
+    @staticmethod
+    def _count_if(condition):
+        return func.sum(case((condition, 1), else_=0))
+    
+    @classmethod
+    def _outcome_columns(cls):
+        """每组的交易数、已平仓盈利/亏损笔数和已平仓 PnL 合计"""
+        closed = TradeHistory.status == "closed"
+        return (
+            func.count(TradeHistory.id),
+            cls._count_if(closed & (TradeHistory.pnl_usd > 0)),
+            cls._count_if(closed & (TradeHistory.pnl_usd < 0)),
+            func.sum(case((closed, TradeHistory.pnl_usd), else_=0)),
+        )
+    
+    @staticmethod
+    def _outcome_row(trades, wins, losses, pnl) -> Dict[str, Any]:
+        return {"trades": trades, "wins": int(wins or 0), "losses": int(losses or 0), "pnl": float(pnl or 0)}
+    
+    def daily_stats(self, bot_id: int, since: datetime) -> Dict[str, Dict[str, Any]]:
+        """
+        按开仓日期汇总机器人的交易
+        
+        Returns:
+            {"YYYY-MM-DD": {"trades", "wins", "losses", "pnl"}}，
+            trades 含未平仓交易，其余只统计已平仓交易
+        """
+        day = func.date(TradeHistory.opened_at)
+        statement = (
+            select(day, *self._outcome_columns())
+            .where(TradeHistory.bot_id == bot_id, TradeHistory.opened_at >= since)
+            .group_by(day)
+        )
+        return {str(row[0]): self._outcome_row(*row[1:]) for row in self.session.exec(statement).all()}
+    
+    def symbol_stats(self, bot_id: int, since: datetime) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        按币种汇总机器人的交易（字段同 daily_stats）
+        
+        Returns:
+            按交易数降序排列；交易数相同时最近交易过的币种在前
+        """
+        statement = (
+            select(TradeHistory.symbol, *self._outcome_columns())
+            .where(TradeHistory.bot_id == bot_id, TradeHistory.opened_at >= since)
+            .group_by(TradeHistory.symbol)
+            .order_by(func.count(TradeHistory.id).desc(), func.max(TradeHistory.opened_at).desc())
+        )
+        return [(row[0], self._outcome_row(*row[1:])) for row in self.session.exec(statement).all()]
+    
+    def overview_stats(self, today_start: datetime) -> Dict[str, Any]:
+        """
+        所有 bot 的交易总览（一次查询）
+        
+        已平仓统计只包含 PnL 非空且非零的交易。
+        """
+        pnl = TradeHistory.pnl_usd
+        today = TradeHistory.opened_at >= today_start
+        settled = (TradeHistory.status == "closed") & pnl.isnot(None) & (pnl != 0)
+        row = self.session.exec(select(
+            func.count(TradeHistory.id),
+            self._count_if(today),
+            self._count_if(TradeHistory.status == "open"),
+            self._count_if(settled),
+            self._count_if(settled & (pnl > 0)),
+            func.sum(case((settled, pnl), else_=0)),
+            func.sum(case((settled & today, pnl), else_=0)),
+        )).one()
+        return {
+            "trades": row[0],
+            "today_trades": int(row[1] or 0),
+            "open_trades": int(row[2] or 0),
+            "closed_trades": int(row[3] or 0),
+            "winning_trades": int(row[4] or 0),
+            "total_pnl": float(row[5] or 0),
+            "today_pnl": float(row[6] or 0),
+        }
+    
+    def closed_window_stats(self, starts: List[Optional[datetime]]) -> List[Dict[str, Any]]:
+        """
+        所有 bot 已平仓交易在多个时间窗口内的汇总（一次查询）
+        
+        Args:
+            starts: 每个窗口的最早开仓时间，None 表示不限
+        
+        Returns:
+            与 starts 一一对应的 {"trades", "pnl", "wins"}
+        """
+        pnl = func.coalesce(TradeHistory.pnl_usd, 0)
+        columns = []
+        for start in starts:
+            if start is None:
+                columns += [func.count(TradeHistory.id), func.sum(pnl), self._count_if(pnl > 0)]
+            else:
+                in_window = TradeHistory.opened_at >= start
+                columns += [
+                    self._count_if(in_window),
+                    func.sum(case((in_window, pnl), else_=0)),
+                    self._count_if(in_window & (pnl > 0)),
+                ]
+        row = self.session.exec(select(*columns).where(TradeHistory.status == "closed")).one()
+        return [
+            {"trades": int(row[i] or 0), "pnl": float(row[i + 1] or 0), "wins": int(row[i + 2] or 0)}
+            for i in range(0, len(columns), 3)
+        ]
+    
+    def closed_pnl_by_bot(self) -> List[Tuple[int, int, float]]:
+        """
+        每个 bot 已平仓交易的笔数和 PnL 合计
+        
+        Returns:
+            [(bot_id, trades, pnl)]，按 PnL 降序；PnL 相同时最近交易过的 bot 在前
+        """
+        pnl = func.sum(func.coalesce(TradeHistory.pnl_usd, 0))
+        statement = (
+            select(TradeHistory.bot_id, func.count(TradeHistory.id), pnl)
+            .where(TradeHistory.status == "closed")
+            .group_by(TradeHistory.bot_id)
+            .order_by(pnl.desc(), func.max(TradeHistory.opened_at).desc())
+        )
+        return [(bot_id, trades, float(total or 0)) for bot_id, trades, total in self.session.exec(statement).all()]
+    
+    def count_by_status(self, status: str) -> int:
+        """所有 bot 指定状态的交易数"""
+        statement = select(func.count(TradeHistory.id)).where(TradeHistory.status == status)
+        return self.session.exec(statement).one()
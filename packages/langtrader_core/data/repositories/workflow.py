@@ -1,5 +1,6 @@
 # packages/langtrader_core/data/repositories/workflow.py
 from sqlmodel import select, Session
+from sqlalchemy.orm import selectinload
 from langtrader_core.data.models.workflow import (
     Workflow, WorkflowNode, NodeConfig, WorkflowEdge
 )
@@ -35,22 +36,18 @@ class WorkflowRepository:
     
     def get_workflow(self, workflow_id: int) -> Optional[Workflow]:
         """获取 workflow（包含所有节点和配置）"""
+        # selectinload 一次性预加载 nodes / node.configs / edges（共 4 条查询，与节点数无关）
+        # populate_existing 保证已在 session 中的对象也用数据库最新值刷新
         statement = (
             select(Workflow)
             .where(Workflow.id == workflow_id)
+            .options(
+                selectinload(Workflow.nodes).selectinload(WorkflowNode.configs),
+                selectinload(Workflow.edges),
+            )
+            .execution_options(populate_existing=True)
         )
-        workflow = self.session.exec(statement).first()
-        
-        if workflow:
-            # 预加载关系
-            self.session.refresh(workflow)
-            for node in workflow.nodes:
-                self.session.refresh(node)
-                # 预加载配置
-                for config in node.configs:
-                    pass
-        
-        return workflow
+        return self.session.exec(statement).first()
     
     def get_active_workflow_by_bot(self, bot_id: int) -> Optional[Workflow]:
         """获取 bot 的活跃 workflow"""
@@ -68,9 +65,14 @@ class WorkflowRepository:
         name: str,
         plugin_name: str,
         config: Dict[str, Any] = None,
+        commit: bool = True,
         **kwargs
     ) -> WorkflowNode:
-        """添加节点"""
+        """
+        添加节点
+        
+        commit=False 时只 flush（获取 node.id），由调用方统一提交
+        """
         node = WorkflowNode(
             workflow_id=workflow_id,
             name=name,
@@ -78,13 +80,16 @@ class WorkflowRepository:
             **kwargs
         )
         self.session.add(node)
-        self.session.commit()
-        self.session.refresh(node)
+        if commit:
+            self.session.commit()
+            self.session.refresh(node)
+        else:
+            self.session.flush()
         
         # 添加配置
         if config:
             for key, value in config.items():
-                self.set_node_config(node.id, key, value)
+                self.set_node_config(node.id, key, value, commit=commit)
         
         logger.info(f"✅ Added node: {name} to workflow {workflow_id}")
         return node
@@ -94,7 +99,8 @@ class WorkflowRepository:
         node_id: int,
         key: str,
         value: Any,
-        description: str = None
+        description: str = None,
+        commit: bool = True
     ):
         """设置节点配置"""
         # 查找是否已存在
@@ -119,9 +125,18 @@ class WorkflowRepository:
             config.set_value(value)
             self.session.add(config)
         
-        self.session.commit()
+        if commit:
+            self.session.commit()
         logger.debug(f"✅ Set config: {key} = {value} for node {node_id}")
     
+    @staticmethod
+    def node_config_dict(node: WorkflowNode) -> Dict[str, Any]:
+        """从已加载的 node.configs 构建配置字典（get_workflow 已预加载，无需再查询）"""
+        return {
+            config.config_key: config.get_value()
+            for config in node.configs
+        }
+    
     def get_node_config_dict(self, node_id: int) -> Dict[str, Any]:
         """获取节点的完整配置字典"""
         statement = (
@@ -140,7 +155,8 @@ class WorkflowRepository:
         workflow_id: int,
         from_node: str,
         to_node: str,
-        condition: str = None
+        condition: str = None,
+        commit: bool = True
     ):
         """添加边"""
         edge = WorkflowEdge(
@@ -150,11 +166,12 @@ class WorkflowRepository:
             condition=condition
         )
         self.session.add(edge)
-        self.session.commit()
+        if commit:
+            self.session.commit()
         
         logger.debug(f"✅ Added edge: {from_node} -> {to_node}")
     
-    def clear_nodes_and_edges(self, workflow_id: int) -> tuple:
+    def clear_nodes_and_edges(self, workflow_id: int, commit: bool = True) -> tuple:
         """
         清空 workflow 的所有节点和边
         
@@ -165,6 +182,7 @@ class WorkflowRepository:
         
         Args:
             workflow_id: Workflow ID
+            commit: False 时只 flush，由调用方统一提交
             
         Returns:
             tuple: (deleted_nodes_count, deleted_edges_count)
@@ -196,7 +214,10 @@ class WorkflowRepository:
             deleted_nodes += 1
         
         # 提交事务
-        self.session.commit()
+        if commit:
+            self.session.commit()
+        else:
+            self.session.flush()
         
         logger.info(f"🧹 Cleared workflow {workflow_id}: {deleted_nodes} nodes, {deleted_edges} edges")
         return (deleted_nodes, deleted_edges)
@@ -223,7 +244,7 @@ class WorkflowRepository:
                     "name": node.name,
                     "plugin": node.plugin_name,
                     "enabled": node.enabled,
-                    "config": self.get_node_config_dict(node.id)
+                    "config": self.node_config_dict(node)
                 }
                 for node in sorted(workflow.nodes, key=lambda n: n.execution_order)
             ],
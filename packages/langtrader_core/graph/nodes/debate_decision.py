@@ -17,7 +17,7 @@
 
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from langchain_core.messages import SystemMessage, HumanMessage, BaseMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableParallel, RunnableLambda
@@ -255,6 +255,24 @@ DEFAULT_DEBATE_PROMPTS = {
 }
 
 
+# -------------------------
+# 辩论角色配置（system_configs 中 debate.roles 的结构）
+# -------------------------
+
+class DebateRole(BaseModel):
+    """辩论角色配置"""
+    id: str
+    name: str
+    name_en: str = ""
+    focus: str = ""
+    style: str = ""
+    priority: int = 0
+
+
+# 进程级复用的解码器：JSON 字符串直接解析为 DebateRole 列表，无需中间 dict
+_DEBATE_ROLES_ADAPTER = TypeAdapter(List[DebateRole])
+
+
 class DebateDecisionNode(NodePlugin):
     """
     多空辩论决策节点
@@ -408,9 +426,9 @@ class DebateDecisionNode(NodePlugin):
         
         logger.info(f"✅ DebateDecisionNode initialized with risk_limits from bot")
         logger.info(f"   max_total={self.node_config['max_total_allocation_pct']}%, max_single={self.node_config['max_single_allocation_pct']}%")
-        logger.info(f"   辩论角色: {[r['id'] for r in self.debate_roles]}")
+        logger.info(f"   辩论角色: {[r.id for r in self.debate_roles]}")
     
-    def _load_debate_roles(self, db_config: Dict) -> List[Dict]:
+    def _load_debate_roles(self, db_config: Dict) -> List[DebateRole]:
         """
         从 system_configs 加载辩论角色配置
         
@@ -420,27 +438,25 @@ class DebateDecisionNode(NodePlugin):
         Returns:
             角色配置列表，每个元素包含 id, name, name_en, focus, style, priority
         """
-        import json
-        
         # 默认角色配置
         default_roles = [
-            {"id": "analyst", "name": "市场分析师", "name_en": "Market Analyst", "priority": 1},
-            {"id": "bull", "name": "多头交易员", "name_en": "Bull Trader", "priority": 2},
-            {"id": "bear", "name": "空头交易员", "name_en": "Bear Trader", "priority": 2},
-            {"id": "risk_manager", "name": "风险经理", "name_en": "Risk Manager", "priority": 3},
+            DebateRole(id="analyst", name="市场分析师", name_en="Market Analyst", priority=1),
+            DebateRole(id="bull", name="多头交易员", name_en="Bull Trader", priority=2),
+            DebateRole(id="bear", name="空头交易员", name_en="Bear Trader", priority=2),
+            DebateRole(id="risk_manager", name="风险经理", name_en="Risk Manager", priority=3),
         ]
         
-        # 尝试从配置加载
+        # 尝试从配置加载（SystemConfig 已按 json 类型解析时为 list，否则为原始字符串）
         roles_config = db_config.get('debate.roles')
         if roles_config:
             try:
-                if isinstance(roles_config, str):
-                    roles = json.loads(roles_config)
+                if isinstance(roles_config, (str, bytes)):
+                    roles = _DEBATE_ROLES_ADAPTER.validate_json(roles_config)
                 else:
-                    roles = roles_config
+                    roles = _DEBATE_ROLES_ADAPTER.validate_python(roles_config)
                 logger.debug(f"📋 从配置加载 {len(roles)} 个辩论角色")
                 return roles
-            except (json.JSONDecodeError, TypeError) as e:
+            except ValidationError as e:
                 logger.warning(f"⚠️ 解析 debate.roles 配置失败: {e}，使用默认角色")
         
         return default_roles
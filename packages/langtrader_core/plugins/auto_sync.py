@@ -12,6 +12,7 @@
 """
 import threading
 import uuid
+from contextlib import nullcontext
 from typing import Dict, Any
 from sqlmodel import Session
 from langtrader_core.plugins.registry import registry
@@ -38,6 +39,7 @@ class PluginAutoSync:
         self.session = session
         self.workflow_repo = WorkflowRepository(session)
         self.lock_owner = f"bot_{uuid.uuid4().hex[:8]}"
+        self._commit = True
     
     @classmethod
     def _get_lock(cls, workflow_id: int) -> threading.Lock:
@@ -59,7 +61,7 @@ class PluginAutoSync:
         
         return cls._local_locks[workflow_id]
     
-    def sync_if_needed(self, workflow_id: int) -> Dict[str, int]:
+    def sync_if_needed(self, workflow_id: int, autocommit: bool = True) -> Dict[str, int]:
         """
         全量重建同步插件到数据库（线程安全）
         
@@ -70,6 +72,7 @@ class PluginAutoSync:
         
         Args:
             workflow_id: 目标 workflow ID
+            autocommit: False 时所有写入只 flush，由调用方一次性提交
             
         Returns:
             统计信息 {"cleared_nodes": 0, "cleared_edges": 0, "added": 0, "failed": 0, "edges_created": 0}
@@ -79,6 +82,7 @@ class PluginAutoSync:
         
         with lock:
             logger.debug(f"🔒 Acquired sync lock for workflow {workflow_id}")
+            self._commit = autocommit
             
             stats = {
                 "cleared_nodes": 0, 
@@ -103,7 +107,7 @@ class PluginAutoSync:
                 
                 # 🧹 阶段1：清空所有节点和边（仅首次同步时执行）
                 logger.info(f"🧹 Phase 1: Initializing empty workflow {workflow_id}...")
-                cleared_nodes, cleared_edges = self.workflow_repo.clear_nodes_and_edges(workflow_id)
+                cleared_nodes, cleared_edges = self.workflow_repo.clear_nodes_and_edges(workflow_id, commit=self._commit)
                 stats["cleared_nodes"] = cleared_nodes
                 stats["cleared_edges"] = cleared_edges
                 logger.info(f"   Cleared {cleared_nodes} nodes, {cleared_edges} edges")
@@ -173,6 +177,16 @@ class PluginAutoSync:
             logger.debug(f"🔓 Released sync lock for workflow {workflow_id}")
             return stats
     
+    def _write(self):
+        """
+        单个节点/边的写入范围
+        
+        autocommit=False 时每次写入放进 SAVEPOINT（退出时 flush）：失败只回滚这一项，
+        外层事务（包括调用方刚创建的 workflow）仍能提交。
+        否则一次 flush 失败会让整个 session 进入待回滚状态，之后的写入全部失败。
+        """
+        return nullcontext() if self._commit else self.session.begin_nested()
+    
     def _create_node_only(self, workflow_id: int, metadata: NodeMetadata):
         """只创建节点，不创建边"""
         workflow = self.workflow_repo.get_workflow(workflow_id)
@@ -185,14 +199,16 @@ class PluginAutoSync:
             execution_order = max_order + 1
         
         # 创建节点
-        node = self.workflow_repo.add_node(
-            workflow_id=workflow_id,
-            name=metadata.name,
-            plugin_name=metadata.name,
-            enabled=True,
-            execution_order=execution_order,
-            config=metadata.default_config
-        )
+        with self._write():
+            node = self.workflow_repo.add_node(
+                workflow_id=workflow_id,
+                name=metadata.name,
+                plugin_name=metadata.name,
+                enabled=True,
+                execution_order=execution_order,
+                config=metadata.default_config,
+                commit=self._commit
+            )
         
         logger.debug(f"   Created node: {node.name} (order={execution_order})")
     
@@ -208,12 +224,14 @@ class PluginAutoSync:
         # 为每个条件路由创建边
         for condition_value, target_node in metadata.conditional_routes.items():
             try:
-                self.workflow_repo.add_edge(
-                    workflow_id=workflow_id,
-                    from_node=node_name,
-                    to_node=target_node,
-                    condition=condition_value
-                )
+                with self._write():
+                    self.workflow_repo.add_edge(
+                        workflow_id=workflow_id,
+                        from_node=node_name,
+                        to_node=target_node,
+                        condition=condition_value,
+                        commit=self._commit
+                    )
                 logger.info(f"   ✅ Conditional edge: {node_name} -[{condition_value}]-> {target_node}")
                 count += 1
             except Exception as e:
@@ -243,7 +261,8 @@ class PluginAutoSync:
         
         # START -> first_node
         try:
-            self.workflow_repo.add_edge(workflow_id, 'START', sorted_nodes[0].name)
+            with self._write():
+                self.workflow_repo.add_edge(workflow_id, 'START', sorted_nodes[0].name, commit=self._commit)
             count += 1
             logger.info(f"   Created edge: START -> {sorted_nodes[0].name}")
         except Exception as e:
@@ -252,11 +271,13 @@ class PluginAutoSync:
         # node[i] -> node[i+1]
         for i in range(len(sorted_nodes) - 1):
             try:
-                self.workflow_repo.add_edge(
-                    workflow_id, 
-                    sorted_nodes[i].name, 
-                    sorted_nodes[i + 1].name
-                )
+                with self._write():
+                    self.workflow_repo.add_edge(
+                        workflow_id, 
+                        sorted_nodes[i].name, 
+                        sorted_nodes[i + 1].name,
+                        commit=self._commit
+                    )
                 count += 1
                 logger.info(f"   Created edge: {sorted_nodes[i].name} -> {sorted_nodes[i + 1].name}")
             except Exception as e:
@@ -264,7 +285,8 @@ class PluginAutoSync:
         
         # last_node -> END
         try:
-            self.workflow_repo.add_edge(workflow_id, sorted_nodes[-1].name, 'END')
+            with self._write():
+                self.workflow_repo.add_edge(workflow_id, sorted_nodes[-1].name, 'END', commit=self._commit)
             count += 1
             logger.info(f"   Created edge: {sorted_nodes[-1].name} -> END")
         except Exception as e:
@@ -306,7 +328,8 @@ class PluginAutoSync:
         
         # START -> first_node
         try:
-            self.workflow_repo.add_edge(workflow_id, 'START', sorted_nodes[0].name)
+            with self._write():
+                self.workflow_repo.add_edge(workflow_id, 'START', sorted_nodes[0].name, commit=self._commit)
             count += 1
             logger.info(f"   Created edge: START -> {sorted_nodes[0].name}")
         except Exception as e:
@@ -315,11 +338,13 @@ class PluginAutoSync:
         # node[i] -> node[i+1]
         for i in range(len(sorted_nodes) - 1):
             try:
-                self.workflow_repo.add_edge(
-                    workflow_id, 
-                    sorted_nodes[i].name, 
-                    sorted_nodes[i + 1].name
-                )
+                with self._write():
+                    self.workflow_repo.add_edge(
+                        workflow_id, 
+                        sorted_nodes[i].name, 
+                        sorted_nodes[i + 1].name,
+                        commit=self._commit
+                    )
                 count += 1
                 logger.info(f"   Created edge: {sorted_nodes[i].name} -> {sorted_nodes[i + 1].name}")
             except Exception as e:
@@ -327,7 +352,8 @@ class PluginAutoSync:
         
         # last_node -> END
         try:
-            self.workflow_repo.add_edge(workflow_id, sorted_nodes[-1].name, 'END')
+            with self._write():
+                self.workflow_repo.add_edge(workflow_id, sorted_nodes[-1].name, 'END', commit=self._commit)
             count += 1
             logger.info(f"   Created edge: {sorted_nodes[-1].name} -> END")
         except Exception as e:
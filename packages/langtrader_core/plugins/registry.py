@@ -47,6 +47,8 @@ class PluginRegistry:
         self._instances: Dict[str, NodePlugin] = {}
         self._metadata: Dict[str, NodeMetadata] = {}
         self._discovered_packages = set() # set of discovered packages
+        # SoA cache: parallel tuples of metadata fields, rebuilt lazily after register()
+        self._soa_cache: Optional[Dict[str, tuple]] = None
         logger.info("Plugin Registry initialized")
 
     def register(self,plugin_class: Type[NodePlugin]):
@@ -68,6 +70,7 @@ class PluginRegistry:
         # register plugin class
         self._plugins[name] = plugin_class
         self._metadata[name] = metadata
+        self._soa_cache = None
         
         logger.info(f"✅ Registered plugin: {name} (v{metadata.version}) by {metadata.author}")
     
@@ -159,6 +162,32 @@ class PluginRegistry:
         logger.info(f"✅ Listed {len(plugins)} plugins")
         return plugins
     
+    def _columns(self) -> Dict[str, tuple]:
+        # build the SoA view once per registry change
+        if self._soa_cache is None:
+            metadata = tuple(self._metadata.values())
+            self._soa_cache = {
+                "names": tuple(m.name for m in metadata),
+                "versions": tuple(m.version for m in metadata),
+                "authors": tuple(m.author for m in metadata),
+            }
+        return self._soa_cache
+    
+    @property
+    def names(self) -> tuple:
+        """registered plugin names, in registration order"""
+        return self._columns()["names"]
+    
+    @property
+    def versions(self) -> tuple:
+        """plugin versions, parallel to names"""
+        return self._columns()["versions"]
+    
+    @property
+    def authors(self) -> tuple:
+        """plugin authors, parallel to names"""
+        return self._columns()["authors"]
+    
     def create_instance(
         self, 
         name: str, 
@@ -34,6 +34,9 @@ class WorkflowBuilder:
     Workflow builder for the trading system.
     """
     
+    # workflows already synced in this process; bots sharing a workflow sync it once
+    _synced_workflow_ids: set = set()
+    
     def __init__(self, session: Session, bot_id: int = None):
         """
          initialize the workflow builder
@@ -54,6 +57,7 @@ class WorkflowBuilder:
         self.context: Optional[PluginContext] = None
         self.llm_factory: Optional[LLMFactory] = None
         self.checkpointer_context = None # checkpoint context
+        self.checkpointer = None # created once, reused by build()
 
     async def _create_checkpoint(self):
         """
@@ -75,6 +79,16 @@ class WorkflowBuilder:
 
         return checkpointer
 
+    async def prepare_checkpointer(self):
+        """
+        Create the checkpointer ahead of build()
+        Independent of the trader, so callers can await it concurrently
+        with exchange initialization; build() reuses the result.
+        """
+        if self.checkpointer is None:
+            self.checkpointer = await self._create_checkpoint()
+        return self.checkpointer
+
     async def cleanup(self):
         """clean sql connetions"""
         if self.checkpointer_context is not None:
@@ -101,11 +115,16 @@ class WorkflowBuilder:
         """同步插件到数据库"""
         try:
             logger.debug("🔄 Auto-syncing plugins...")
-            syncer = PluginAutoSync(self.session)
             registry.discover_plugins("langtrader_core.graph.nodes")
             
             target_workflow_id = self._get_target_workflow_id()
+            if target_workflow_id in WorkflowBuilder._synced_workflow_ids:
+                logger.debug(f"Workflow {target_workflow_id} already synced in this process, skipping")
+                return
+            
+            syncer = PluginAutoSync(self.session)
             stats = syncer.sync_if_needed(target_workflow_id)
+            WorkflowBuilder._synced_workflow_ids.add(target_workflow_id)
             
             if stats["added"] > 0:
                 logger.info(f"✅ Auto-registered {stats['added']} new plugins")
@@ -232,13 +251,15 @@ class WorkflowBuilder:
         """
         logger.info("🏗️  Building workflow from database...")
         
+        # 1. load config (callers normally loaded it already; avoid a second round of queries)
+        if self.bot is None:
+            self.load_bot_config()
+        
         self.context = context
         # 添加 bot 和 bot_id 到 context（供 DebateNode 获取 Tavily API Key）
         context.bot = self.bot
         context.bot_id = self.bot.id
         
-        # 1. load config
-        config = self.load_bot_config()
         # add llm factory to context
         if self.llm_factory:
             context.llm_factory = self.llm_factory
@@ -254,7 +275,7 @@ class WorkflowBuilder:
         # 5. add edges to graph
         self._add_edges_to_graph()
         # checkpointer
-        checkpointer =  await self._create_checkpoint()
+        checkpointer = await self.prepare_checkpointer()
         if checkpointer is None:
             logger.error(f'🚨🚨 Checkpoint not created!')
             raise  ValueError(f'🚨🚨 Checkpoint not created!')
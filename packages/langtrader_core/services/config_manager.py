@@ -8,7 +8,7 @@ from typing import Any, Dict, List, Optional
 from sqlmodel import Session, select, text
 from langtrader_core.utils import get_logger
 import time
-import json
+import orjson
 
 logger = get_logger("config_manager")
 
@@ -269,10 +269,10 @@ class SystemConfig:
             elif value_type == "boolean":
                 return value.lower() in ("true", "1", "yes", "on")
             elif value_type == "json":
-                return json.loads(value)
+                return orjson.loads(value)
             else:
                 return value
-        except (ValueError, json.JSONDecodeError) as e:
+        except (ValueError, orjson.JSONDecodeError) as e:
             logger.warning(f"Failed to parse config value '{value}' as {value_type}: {e}")
             return value
 
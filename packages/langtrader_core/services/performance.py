@@ -65,9 +65,10 @@ class PerformanceService:
     从 trade_history 表计算各类绩效指标
     """
     
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, repo: Optional[TradeHistoryRepository] = None):
         self.session = session
-        self.repo = TradeHistoryRepository(session)
+        # 可复用调用方已有的同一 session 的仓储
+        self.repo = repo or TradeHistoryRepository(session)
     
     def calculate_metrics(
         self, 
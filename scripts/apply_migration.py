@@ -42,7 +42,14 @@ async def apply_migration(migration_file_path: str = None):
     
     with engine.connect() as conn:
         # 执行迁移（按分号分割语句）
-        statements = [s.strip() for s in sql.split(';') if s.strip() and not s.strip().startswith('--')]
+        # 去掉每段开头的注释行，避免文件头注释把紧随其后的第一条语句一起跳过
+        statements = []
+        for chunk in sql.split(';'):
+            lines = chunk.strip().splitlines()
+            while lines and (not lines[0].strip() or lines[0].strip().startswith('--')):
+                lines.pop(0)
+            if lines:
+                statements.append('\n'.join(lines).strip())
         
         success_count = 0
         warning_count = 0
@@ -0,0 +1,15 @@
+-- ============================================================
+-- 迁移脚本: Bot 列表查询索引
+-- 版本: 013
+-- 日期: 2026-10-14
+-- 描述:
+--   GET /api/v1/bots 按 is_active / trading_mode 过滤并按 id 分页，
+--   复合索引 (is_active, trading_mode, id) 让过滤、排序和 LIMIT/OFFSET
+--   直接走索引，不再扫描全表。
+--   线上大表可改用 CREATE INDEX CONCURRENTLY 手动执行（不能在事务中运行）。
+-- ============================================================
+
+CREATE INDEX IF NOT EXISTS ix_bots_is_active_trading_mode_id
+ON public.bots (is_active, trading_mode, id);
+
+SELECT '✅ Bots list index created' AS status;
@@ -0,0 +1,15 @@
+-- ============================================================
+-- 迁移脚本: 交易历史统计索引
+-- 版本: 014
+-- 日期: 2026-10-14
+-- 描述:
+--   Dashboard 图表接口按 bot_id 和开仓时间范围在数据库中 GROUP BY 汇总，
+--   复合索引 (bot_id, opened_at) 让范围过滤直接走索引，
+--   只读取时间窗口内的行。
+--   线上大表可改用 CREATE INDEX CONCURRENTLY 手动执行（不能在事务中运行）。
+-- ============================================================
+
+CREATE INDEX IF NOT EXISTS ix_trade_history_bot_id_opened_at
+ON public.trade_history (bot_id, opened_at);
+
+SELECT '✅ Trade history stats index created' AS status;
@@ -3,6 +3,7 @@
 Pytest fixtures for LangTrader unit tests
 Provides shared test data and mock objects
 """
+import os
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -14,8 +15,11 @@ import pytest_asyncio
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "packages"))
 
+# 导入 langtrader_api 模块时会实例化全局 settings，需要 DATABASE_URL（测试不连接数据库）
+os.environ.setdefault("DATABASE_URL", "postgresql://test@localhost/test")
+
 from langtrader_core.graph.state import (
-    State, Account, Position, AIDecision, ExecutionResult, RunRecord
+    State, Account, Position, AIDecision, ExecutionResult
 )
 from langtrader_core.backtest.mock_trader import MockTrader, BacktestDataSource
 from langtrader_core.backtest.mock_performance import MockPerformanceService
@@ -0,0 +1,147 @@
+# tests/test_api_config.py
+"""
+测试 API 配置解析、API Key 校验和限流键
+"""
+import pytest
+from langtrader_api.config import Settings
+
+
+def make_settings(**kwargs) -> Settings:
+    """创建不读取 .env 的 Settings"""
+    return Settings(_env_file=None, DATABASE_URL="postgresql://test@localhost/test", **kwargs)
+
+
+class TestListParsing:
+    """测试 API_KEYS / CORS_ORIGINS 的解析"""
+
+    def test_comma_separated(self):
+        settings = make_settings(API_KEYS="key-a, key-b,,key-c ")
+        assert settings.API_KEYS == ["key-a", "key-b", "key-c"]
+
+    def test_single_value(self):
+        settings = make_settings(API_KEYS=" only-key ")
+        assert settings.API_KEYS == ["only-key"]
+
+    def test_empty_string(self):
+        settings = make_settings(API_KEYS="")
+        assert settings.API_KEYS == []
+
+    def test_json_array(self):
+        settings = make_settings(CORS_ORIGINS='["http://a.test", "http://b.test"]')
+        assert settings.CORS_ORIGINS == ["http://a.test", "http://b.test"]
+
+    def test_list_passthrough(self):
+        settings = make_settings(API_KEYS=["k1", "k2"])
+        assert settings.API_KEYS == ["k1", "k2"]
+
+    def test_env_comma_separated(self, monkeypatch):
+        """环境变量中的逗号分隔值不应被当作 JSON 解析"""
+        monkeypatch.setenv("API_KEYS", "env-a,env-b")
+        assert make_settings().API_KEYS == ["env-a", "env-b"]
+
+    def test_dotenv_extra_keys_ignored(self, tmp_path):
+        """.env 中与 docker-compose 共用的变量不应导致校验失败"""
+        env_file = tmp_path / ".env"
+        env_file.write_text("POSTGRES_USER=langtrader\nAPI_KEYS=file-a,file-b\n")
+        settings = Settings(_env_file=env_file, DATABASE_URL="postgresql://test@localhost/test")
+        assert settings.API_KEYS == ["file-a", "file-b"]
+
+    def test_api_keys_set(self):
+        settings = make_settings(API_KEYS="k1,k2,k1")
+        assert settings.api_keys_set == frozenset({"k1", "k2"})
+
+    def test_settings_frozen(self):
+        """Settings 加载后不可修改，保证 api_keys_set 缓存一致"""
+        from pydantic import ValidationError
+        settings = make_settings(API_KEYS="k1")
+        assert settings.api_keys_set == frozenset({"k1"})
+        with pytest.raises(ValidationError):
+            settings.API_KEYS = ["k2"]
+
+
+class TestApiKeyValidation:
+    """测试 is_valid_api_key"""
+
+    @pytest.fixture(autouse=True)
+    def patch_settings(self, monkeypatch):
+        from langtrader_api.auth import api_key
+        monkeypatch.setattr(api_key, "_API_KEYS", make_settings(API_KEYS="good-key,other-key").api_keys_set)
+
+    def test_valid_key(self):
+        from langtrader_api.auth import is_valid_api_key
+        assert is_valid_api_key("good-key")
+        assert is_valid_api_key("other-key")
+
+    def test_invalid_key(self):
+        from langtrader_api.auth import is_valid_api_key
+        assert not is_valid_api_key("good-ke")
+        assert not is_valid_api_key("bad-key")
+
+    def test_non_string_key(self):
+        from langtrader_api.auth import is_valid_api_key
+        assert not is_valid_api_key(None)
+        assert not is_valid_api_key("")
+        assert not is_valid_api_key(["good-key"])
+
+    def test_non_ascii_key(self):
+        from langtrader_api.auth import is_valid_api_key
+        assert not is_valid_api_key("密钥")
+
+
+class TestRateLimitKey:
+    """测试 get_api_key_or_ip 限流键"""
+
+    @staticmethod
+    def make_request(headers, client=("1.2.3.4", 5000)):
+        from starlette.requests import Request
+        return Request({"type": "http", "headers": headers, "client": client})
+
+    def test_api_key_header(self):
+        from langtrader_api.middleware.rate_limiter import get_api_key_or_ip
+        assert get_api_key_or_ip(self.make_request([(b"x-api-key", b"good-key")])) == "apikey:good-key"
+
+    def test_empty_key_falls_back_to_ip(self):
+        from langtrader_api.middleware.rate_limiter import get_api_key_or_ip
+        assert get_api_key_or_ip(self.make_request([(b"x-api-key", b"")])) == "ip:1.2.3.4"
+        assert get_api_key_or_ip(self.make_request([])) == "ip:1.2.3.4"
+
+    def test_missing_client(self):
+        from langtrader_api.middleware.rate_limiter import get_api_key_or_ip
+        assert get_api_key_or_ip(self.make_request([], client=None)) == "ip:127.0.0.1"
+
+
+class TestRateLimitHandler:
+    """测试 rate_limit_exceeded_handler 的 429 响应"""
+
+    @staticmethod
+    def make_exc(limit_item):
+        from types import SimpleNamespace
+        from slowapi.errors import RateLimitExceeded
+        return RateLimitExceeded(SimpleNamespace(limit=limit_item, error_message=None))
+
+    def test_retry_after_from_window(self):
+        import orjson
+        from limits import parse
+        from starlette.requests import Request
+        from langtrader_api.middleware.rate_limiter import limiter, rate_limit_exceeded_handler
+
+        item = parse("1/minute")
+        limiter.limiter.hit(item, "test-retry-after", "scope")
+        request = Request({"type": "http", "headers": [], "state": {"view_rate_limit": (item, ["test-retry-after", "scope"])}})
+        response = rate_limit_exceeded_handler(request, self.make_exc(item))
+
+        body = orjson.loads(response.body)
+        assert response.status_code == 429
+        assert body["code"] == "RATE_LIMIT_EXCEEDED"
+        assert body["detail"] == "Too many requests. 1 per 1 minute"
+        assert 1 <= int(body["retry_after"]) <= 60
+        assert response.headers["Retry-After"] == body["retry_after"]
+
+    def test_retry_after_default_without_limit_state(self):
+        from limits import parse
+        from starlette.requests import Request
+        from langtrader_api.middleware.rate_limiter import rate_limit_exceeded_handler
+
+        request = Request({"type": "http", "headers": []})
+        response = rate_limit_exceeded_handler(request, self.make_exc(parse("1/minute")))
+        assert response.headers["Retry-After"] == "60"
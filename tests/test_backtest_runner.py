@@ -0,0 +1,47 @@
+# tests/test_backtest_runner.py
+"""
+测试回测任务投递（Arq 队列与进程内后台任务回退）
+"""
+import pytest
+from fastapi import BackgroundTasks
+
+from langtrader_api.services import backtest_runner
+
+
+class FakeArqPool:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.jobs = []
+
+    async def enqueue_job(self, function, **kwargs):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.jobs.append((function, kwargs))
+
+
+@pytest.mark.asyncio
+async def test_runs_in_process_without_queue(monkeypatch):
+    monkeypatch.setattr(backtest_runner, "_arq_pool", None)
+    background_tasks = BackgroundTasks()
+    await backtest_runner.enqueue_backtest(background_tasks, task_id="t1", bot_id=1)
+    assert len(background_tasks.tasks) == 1
+    assert background_tasks.tasks[0].func is backtest_runner.run_backtest_task
+    assert background_tasks.tasks[0].kwargs == {"task_id": "t1", "bot_id": 1}
+
+
+@pytest.mark.asyncio
+async def test_enqueues_to_arq(monkeypatch):
+    pool = FakeArqPool()
+    monkeypatch.setattr(backtest_runner, "_arq_pool", pool)
+    background_tasks = BackgroundTasks()
+    await backtest_runner.enqueue_backtest(background_tasks, task_id="t1", bot_id=1)
+    assert pool.jobs == [("run_backtest_job", {"task_id": "t1", "_job_id": "t1", "bot_id": 1})]
+    assert background_tasks.tasks == []
+
+
+@pytest.mark.asyncio
+async def test_falls_back_when_enqueue_fails(monkeypatch):
+    monkeypatch.setattr(backtest_runner, "_arq_pool", FakeArqPool(fail=True))
+    background_tasks = BackgroundTasks()
+    await backtest_runner.enqueue_backtest(background_tasks, task_id="t1", bot_id=1)
+    assert len(background_tasks.tasks) == 1
@@ -0,0 +1,107 @@
+# tests/test_backtest_store.py
+"""
+测试进程内回测结果存储（排序、TTL 与容量淘汰）
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from langtrader_api.schemas.trades import BacktestResult
+from langtrader_api.services.backtest_store import BacktestStore, RedisBacktestStore
+
+
+def make_result(task_id: str, started_at: datetime = None) -> BacktestResult:
+    return BacktestResult(
+        task_id=task_id,
+        bot_id=1,
+        status="pending",
+        started_at=started_at or datetime.now(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_newest_first():
+    store = BacktestStore()
+    for task_id in ("a", "b", "c"):
+        await store.save(make_result(task_id))
+    assert [r.task_id for r in await store.list()] == ["c", "b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_update_keeps_position():
+    store = BacktestStore()
+    await store.save(make_result("a"))
+    await store.save(make_result("b"))
+    result = await store.get("a")
+    result.status = "completed"
+    await store.save(result)
+    assert [r.task_id for r in await store.list()] == ["b", "a"]
+    assert (await store.get("a")).status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_evicts_over_capacity():
+    store = BacktestStore(max_results=2)
+    for task_id in ("a", "b", "c"):
+        await store.save(make_result(task_id))
+    assert await store.get("a") is None
+    assert [r.task_id for r in await store.list()] == ["c", "b"]
+
+
+@pytest.mark.asyncio
+async def test_evicts_expired():
+    store = BacktestStore(ttl_seconds=60)
+    await store.save(make_result("old", datetime.now() - timedelta(minutes=5)))
+    await store.save(make_result("new"))
+    assert await store.get("old") is None
+    assert [r.task_id for r in await store.list()] == ["new"]
+
+
+@pytest.mark.asyncio
+async def test_filter_by_bot_and_status():
+    store = BacktestStore()
+    for task_id, bot_id in (("a", 1), ("b", 2), ("c", 1)):
+        result = make_result(task_id)
+        result.bot_id = bot_id
+        await store.save(result)
+    result = await store.get("a")
+    result.status = "completed"
+    await store.save(result)
+
+    assert [r.task_id for r in await store.list(bot_id=1)] == ["c", "a"]
+    assert [r.task_id for r in await store.list(bot_id=1, status="completed")] == ["a"]
+    assert [r.task_id for r in await store.list(status="pending")] == ["c", "b"]
+    assert await store.list(bot_id=3) == []
+
+
+@pytest.mark.asyncio
+async def test_eviction_updates_bot_index():
+    store = BacktestStore(max_results=2)
+    for task_id in ("a", "b", "c"):
+        await store.save(make_result(task_id))
+    assert [r.task_id for r in await store.list(bot_id=1)] == ["c", "b"]
+
+
+class DownRedis:
+    """from_url 返回的惰性客户端：Redis 不可达时每个命令都失败"""
+
+    def __init__(self):
+        self.closed = False
+
+    async def ping(self):
+        raise ConnectionError("Connection refused")
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_redis_unavailable_falls_back_to_memory():
+    client = DownRedis()
+    store = RedisBacktestStore(client)
+    await store.connect()
+    assert client.closed
+    await store.save(make_result("a"))
+    assert (await store.get("a")).task_id == "a"
+    assert [r.task_id for r in await store.list(bot_id=1)] == ["a"]
+    await store.close()
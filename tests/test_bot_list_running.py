@@ -0,0 +1,44 @@
+# tests/test_bot_list_running.py
+"""
+测试 BotManager.list_running（一次遍历取全部运行中 bot，顺带清理已退出的进程）
+"""
+from datetime import datetime, timedelta
+
+from langtrader_api.services.bot_manager import BotManager, ProcessInfo
+
+
+class FakeProcess:
+    def __init__(self, pid, returncode=None):
+        self.pid = pid
+        self.returncode = returncode
+
+    def poll(self):
+        return self.returncode
+
+
+def add_process(manager, bot_id, returncode=None, cycle=0):
+    manager._processes[bot_id] = ProcessInfo(
+        bot_id=bot_id,
+        process=FakeProcess(1000 + bot_id, returncode),
+        started_at=datetime.now() - timedelta(seconds=30),
+        cycle=cycle,
+    )
+
+
+def test_lists_running_and_cleans_up_finished():
+    manager = BotManager()
+    add_process(manager, 1, cycle=4)
+    add_process(manager, 2, returncode=0)
+    add_process(manager, 3)
+    add_process(manager, 4, returncode=1)
+
+    running = manager.list_running()
+    assert sorted(running) == [1, 3]
+    assert running[1]["cycle"] == 4
+    assert running[1]["pid"] == 1001
+    assert running[1]["uptime"] >= 30
+    assert sorted(manager._processes) == [1, 3]
+
+
+def test_empty_when_nothing_started():
+    assert BotManager().list_running() == {}
@@ -0,0 +1,93 @@
+# tests/test_bot_logs.py
+"""
+测试 BotManager 读取日志尾部（从文件末尾按块读取最后 N 行）与实时日志流
+"""
+import importlib
+
+import pytest
+
+from langtrader_api.services.bot_manager import BotManager
+
+# langtrader_api.services 会把同名的全局实例 bot_manager 导出，这里取模块本身
+bot_manager_module = importlib.import_module("langtrader_api.services.bot_manager")
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = BotManager()
+    manager._project_root = tmp_path
+    (tmp_path / "logs").mkdir()
+    return manager
+
+
+def test_returns_last_lines(manager):
+    content = "".join(f"line {i}\n" for i in range(1000))
+    (manager._project_root / "logs" / "bot_1.log").write_text(content, encoding="utf-8")
+    assert manager.get_logs(1, lines=3) == "line 997\nline 998\nline 999\n"
+
+
+@pytest.mark.parametrize("content", [
+    "a\nb\nc",
+    "a\r\nb\r\nc\r\n",
+    "中文\n日志\n" * 20 + "最后一行",
+    "\n\n\n",
+    "x" * 5000 + "\nshort\n",
+])
+def test_matches_readlines(manager, monkeypatch, content):
+    # 很小的块让读取跨越多个块、截断多字节字符
+    monkeypatch.setattr(bot_manager_module, "_TAIL_LINE_BYTES", 1)
+    path = manager._project_root / "logs" / "bot_1.log"
+    path.write_bytes(content.encode("utf-8"))
+    with open(path, encoding="utf-8") as f:
+        expected = "".join(f.readlines()[-2:])
+    assert manager.get_logs(1, lines=2) == expected
+
+
+def test_global_log_filters_bot_lines(manager):
+    lines = [f"bot_{i % 2} cycle {i}\n" for i in range(20)]
+    (manager._project_root / "logs" / "langtrader.log").write_text("".join(lines), encoding="utf-8")
+    assert manager.get_logs(1, lines=2) == "bot_1 cycle 17\nbot_1 cycle 19\n"
+    assert manager.get_logs(5, lines=2) == "bot_0 cycle 18\nbot_1 cycle 19\n"
+
+
+def test_missing_logs_return_none(manager):
+    assert manager.get_logs(1) is None
+
+
+@pytest.fixture
+def follow(manager, monkeypatch):
+    monkeypatch.setattr(bot_manager_module, "LOG_FOLLOW_INTERVAL", 0)
+    return manager.follow_logs(1, lines=2)
+
+
+def append(manager, data: bytes):
+    with open(manager._project_root / "logs" / "bot_1.log", "ab") as f:
+        f.write(data)
+
+
+@pytest.mark.asyncio
+async def test_follow_sends_tail_then_new_lines(manager, follow):
+    append(manager, b"a\nb\nc\n")
+    assert await anext(follow) == ["b", "c"]
+    assert await anext(follow) == []
+    append(manager, b"d\r\ne\n")
+    assert await anext(follow) == ["d", "e"]
+
+
+@pytest.mark.asyncio
+async def test_follow_holds_partial_line(manager, follow):
+    append(manager, b"a\nhalf")
+    assert await anext(follow) == ["a"]
+    append(manager, b" line\r")
+    assert await anext(follow) == []
+    append(manager, b"\nnext\n")
+    assert await anext(follow) == ["half line", "next"]
+
+
+@pytest.mark.asyncio
+async def test_follow_waits_for_file_and_handles_truncation(manager, follow):
+    assert await anext(follow) == []
+    append(manager, b"first\nsecond\nthird\n")
+    assert await anext(follow) == ["first", "second", "third"]
+    (manager._project_root / "logs" / "bot_1.log").write_bytes(b"rotated\n")
+    assert await anext(follow) == ["rotated"]
@@ -0,0 +1,155 @@
+# tests/test_bot_restart.py
+"""
+测试 BotManager 异步停止/重启（等待进程退出不阻塞事件循环，停止失败时不启动）
+"""
+import asyncio
+import importlib
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from langtrader_api.services.bot_manager import BotManager, ProcessInfo
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = BotManager()
+    calls = []
+    running = {1}
+
+    def stop_bot(bot_id, force=False):
+        calls.append(("stop", bot_id))
+        # 模拟等待进程退出
+        time.sleep(0.05)
+        running.discard(bot_id)
+        return True
+
+    def start_bot(bot_id, dry_run=False):
+        assert bot_id not in running, "old process still running"
+        calls.append(("start", bot_id))
+        running.add(bot_id)
+        return True
+
+    monkeypatch.setattr(manager, "stop_bot", stop_bot)
+    monkeypatch.setattr(manager, "start_bot", start_bot)
+    monkeypatch.setattr(manager, "is_running", lambda bot_id: bot_id in running)
+    manager.calls = calls
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_restart_stops_before_starting(manager):
+    assert await manager.restart_bot(1)
+    assert manager.calls == [("stop", 1), ("start", 1)]
+
+
+@pytest.mark.asyncio
+async def test_restart_not_running_only_starts(manager):
+    await manager.restart_bot(2)
+    assert manager.calls == [("start", 2)]
+
+
+@pytest.mark.asyncio
+async def test_stop_does_not_block_event_loop(manager):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    await manager.stop_bot_async(1)
+    task.cancel()
+    assert ticks > 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_restarts_are_serialized(manager):
+    await asyncio.gather(manager.restart_bot(1), manager.restart_bot(1))
+    assert manager.calls == [("stop", 1), ("start", 1), ("stop", 1), ("start", 1)]
+
+
+@pytest.mark.asyncio
+async def test_failed_stop_does_not_start(manager, monkeypatch):
+    monkeypatch.setattr(manager, "stop_bot", lambda bot_id, force=False: False)
+    with pytest.raises(RuntimeError):
+        await manager.restart_bot(1)
+    assert manager.calls == []
+
+
+class FakeProcess:
+    """kill 后 poll 立即返回退出码，wait 则等到测试放行才返回"""
+    pid = 12345
+
+    def __init__(self):
+        self.returncode = None
+        self.waiting = threading.Event()
+        self.release = threading.Event()
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self):
+        self.returncode = -9
+
+    def wait(self, timeout=None):
+        self.waiting.set()
+        self.release.wait(5)
+        return self.returncode
+
+
+@pytest.mark.asyncio
+async def test_is_running_during_stop(monkeypatch):
+    monkeypatch.setattr("langtrader_core.services.status_file.mark_bot_stopped", lambda bot_id: True)
+    manager = BotManager()
+    process = FakeProcess()
+    manager._processes[1] = ProcessInfo(bot_id=1, process=process, started_at=datetime.now())
+
+    stop = asyncio.create_task(manager.stop_bot_async(1, force=True))
+    assert await asyncio.to_thread(process.waiting.wait, 5)
+    # 进程已退出但 stop_bot 仍在线程中等待：事件循环上的 is_running 先清理掉记录
+    assert not manager.is_running(1)
+    process.release.set()
+    assert await stop
+    assert 1 not in manager._processes
+
+
+def test_bot_does_not_inherit_api_pool_size(monkeypatch, tmp_path):
+    # langtrader_api.services 以同名导出了 bot_manager 实例，这里取模块本身
+    bot_manager_module = importlib.import_module("langtrader_api.services.bot_manager")
+
+    manager = BotManager()
+    manager._project_root = tmp_path
+    script = tmp_path / bot_manager_module.settings.BOT_SCRIPT_PATH
+    script.parent.mkdir(parents=True, exist_ok=True)
+    script.touch()
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "40")
+    spawned = {}
+
+    def popen(cmd, env=None, **kwargs):
+        spawned.update(env)
+        kwargs["stdout"].close()
+        return FakeProcess()
+
+    monkeypatch.setattr(bot_manager_module.subprocess, "Popen", popen)
+    assert manager.start_bot(1)
+    assert spawned["BOT_ID"] == "1"
+    assert "DB_POOL_SIZE" not in spawned
+    assert "DB_MAX_OVERFLOW" not in spawned
+
+
+@pytest.mark.asyncio
+async def test_start_waits_for_restart(manager):
+    # restart 正在线程中等待旧进程退出时到达的 /start 要等 restart 完成后才执行
+    restart = asyncio.create_task(manager.restart_bot(1))
+    await asyncio.sleep(0.01)
+    with pytest.raises(AssertionError):
+        await manager.start_bot_async(1)
+    assert restart.done()
+    assert await restart
+    assert manager.calls == [("stop", 1), ("start", 1)]
@@ -0,0 +1,71 @@
+# tests/test_bot_status_file.py
+"""
+测试 BotManager 读取状态文件（按 mtime/size 缓存解析结果）
+"""
+import importlib
+import json
+import os
+
+import pytest
+
+from langtrader_api.services.bot_manager import BotManager
+
+# langtrader_api.services 会把同名的全局实例 bot_manager 导出，这里取模块本身
+bot_manager_module = importlib.import_module("langtrader_api.services.bot_manager")
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    manager = BotManager()
+    monkeypatch.setattr(manager, "_get_status_file_path", lambda bot_id: tmp_path / f"bot_{bot_id}.json")
+    return manager
+
+
+def write_status(manager, bot_id, data, mtime_ns=None):
+    path = manager._get_status_file_path(bot_id)
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_missing_file_returns_none(manager):
+    assert manager.read_bot_status(1) is None
+
+
+def test_unchanged_file_is_parsed_once(manager, monkeypatch):
+    write_status(manager, 1, {"cycle": 3})
+    calls = []
+    real_orjson = bot_manager_module.orjson
+
+    class CountingOrjson:
+        @staticmethod
+        def loads(data):
+            calls.append(1)
+            return real_orjson.loads(data)
+
+    monkeypatch.setattr(bot_manager_module, "orjson", CountingOrjson)
+    first = manager.read_bot_status(1)
+    assert manager.read_bot_status(1) is first
+    assert first == {"cycle": 3}
+    assert len(calls) == 1
+
+
+def test_rewritten_file_is_reloaded(manager):
+    write_status(manager, 1, {"cycle": 3}, mtime_ns=1_000_000_000)
+    assert manager.read_bot_status(1)["cycle"] == 3
+    write_status(manager, 1, {"cycle": 4}, mtime_ns=2_000_000_000)
+    assert manager.read_bot_status(1)["cycle"] == 4
+
+
+def test_partial_file_not_cached(manager):
+    manager._get_status_file_path(1).write_text('{"cycle": ', encoding="utf-8")
+    assert manager.read_bot_status(1) is None
+    assert 1 not in manager._status_cache
+
+
+def test_full_status_for_stopped_bot(manager):
+    write_status(manager, 1, {"cycle": 5, "balance": 100.0})
+    status = manager.get_bot_full_status(1)
+    assert status["is_running"] is False
+    assert status["process_info"] is None
+    assert status["runtime_status"]["cycle"] == 5
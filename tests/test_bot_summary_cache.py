@@ -0,0 +1,108 @@
+# tests/test_bot_summary_cache.py
+"""
+测试 list_bots 的 BotSummary 缓存（按 (id, updated_at) 失效与容量淘汰）以及 get_bot / list_bots 结果缓存
+"""
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from langtrader_api.routes.v1 import bots
+from langtrader_core.data.models.bot import Bot
+
+
+def make_bot(bot_id: int = 1, name: str = "bot", updated_at: datetime = datetime(2024, 1, 1)) -> Bot:
+    return Bot(
+        id=bot_id, name=name, prompt="p", exchange_id=1, workflow_id=1, llm_id=1,
+        is_active=True, trading_mode="paper", created_at=datetime(2024, 1, 1), updated_at=updated_at,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    bots._summary_cache.clear()
+    bots._detail_cache.clear()
+    bots._list_cache.clear()
+    yield
+    bots._summary_cache.clear()
+    bots._detail_cache.clear()
+    bots._list_cache.clear()
+
+
+def test_same_version_reuses_summary():
+    [first] = bots._bot_summaries([make_bot()])
+    assert bots._bot_summaries([make_bot()])[0] is first
+    assert first.name == "bot"
+
+
+def test_updated_at_invalidates():
+    bots._bot_summaries([make_bot()])
+    renamed = make_bot(name="renamed", updated_at=datetime(2024, 1, 1) + timedelta(seconds=1))
+    assert bots._bot_summaries([renamed])[0].name == "renamed"
+
+
+def test_mixed_hits_and_misses_keep_order():
+    [cached] = bots._bot_summaries([make_bot(2)])
+    summaries = bots._bot_summaries([make_bot(1), make_bot(2), make_bot(3)])
+    assert [summary.id for summary in summaries] == [1, 2, 3]
+    assert summaries[1] is cached
+
+
+def test_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(bots, "_SUMMARY_CACHE_SIZE", 2)
+    bots._bot_summaries([make_bot(1), make_bot(2)])
+    bots._bot_summaries([make_bot(1)])
+    bots._bot_summaries([make_bot(3)])
+    assert [key[0] for key in bots._summary_cache] == [1, 3]
+
+
+def test_write_invalidates_detail_and_lists():
+    generation = bots._bot_cache_generation
+    bots._bot_cache_put(bots._detail_cache, 1, "bot 1", generation)
+    bots._bot_cache_put(bots._detail_cache, 2, "bot 2", generation)
+    bots._bot_cache_put(bots._list_cache, (1, 20, True, None), "page 1", generation)
+    bots._bot_summaries([make_bot(1), make_bot(2)])
+    bots._invalidate_bot_cache(1)
+    assert [key[0] for key in bots._summary_cache] == [2]
+    assert bots._bot_cache_get(bots._detail_cache, 1) is None
+    assert bots._bot_cache_get(bots._detail_cache, 2) == "bot 2"
+    assert bots._bot_cache_get(bots._list_cache, (1, 20, True, None)) is None
+
+
+def test_read_started_before_write_is_not_cached():
+    generation = bots._bot_cache_generation
+    bots._invalidate_bot_cache(1)
+    bots._bot_cache_put(bots._detail_cache, 1, "stale", generation)
+    assert bots._bot_cache_get(bots._detail_cache, 1) is None
+
+
+def test_cached_result_expires(monkeypatch):
+    bots._bot_cache_put(bots._detail_cache, 1, "bot 1", bots._bot_cache_generation)
+    now = bots.time.monotonic()
+    monkeypatch.setattr(bots.time, "monotonic", lambda: now + bots._BOT_CACHE_TTL + 1)
+    assert bots._bot_cache_get(bots._detail_cache, 1) is None
+
+
+def test_invalidate_from_worker_thread_during_reads():
+    # 写接口在线程池中失效缓存，读接口同时在遍历/淘汰同一个 OrderedDict
+    stop = threading.Event()
+    errors = []
+    
+    def writer():
+        try:
+            while not stop.is_set():
+                bots._invalidate_bot_cache(1)
+        except Exception as e:
+            errors.append(e)
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for i in range(2000):
+            bots._bot_summaries([make_bot(1, updated_at=datetime(2024, 1, 1) + timedelta(seconds=i)), make_bot(2)])
+            bots._bot_cache_put(bots._detail_cache, 2, "bot 2", bots._bot_cache_generation)
+            bots._bot_cache_get(bots._detail_cache, 2)
+    finally:
+        stop.set()
+        thread.join()
+    assert errors == []
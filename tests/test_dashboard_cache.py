@@ -0,0 +1,111 @@
+# tests/test_dashboard_cache.py
+"""
+测试 Dashboard 聚合结果缓存（TTL 内复用、过期重算、跨天失效、异常不缓存）
+以及 bots-summary 的并发计算
+"""
+import threading
+import time
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from langtrader_api.routes.v1 import dashboard
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    dashboard._dashboard_cache.clear()
+    yield
+    dashboard._dashboard_cache.clear()
+
+
+class Loader:
+    def __init__(self, value="result"):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_reused_within_ttl():
+    load = Loader()
+    assert dashboard._cached(("equity", 1, 30), load) == "result"
+    assert dashboard._cached(("equity", 1, 30), load) == "result"
+    assert load.calls == 1
+    dashboard._cached(("equity", 1, 7), load)
+    assert load.calls == 2
+
+
+def test_recomputed_after_ttl(monkeypatch):
+    load = Loader()
+    dashboard._cached(("global",), load)
+    now = dashboard.time.monotonic()
+    monkeypatch.setattr(dashboard.time, "monotonic", lambda: now + dashboard._DASHBOARD_CACHE_TTL + 1)
+    dashboard._cached(("global",), load)
+    assert load.calls == 2
+
+
+def test_new_day_recomputes(monkeypatch):
+    load = Loader()
+    dashboard._cached(("overview",), load)
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date(2099, 1, 1)
+
+    monkeypatch.setattr(dashboard, "date", Tomorrow)
+    dashboard._cached(("overview",), load)
+    assert load.calls == 2
+
+
+def test_errors_not_cached():
+    def missing():
+        raise HTTPException(status_code=404, detail="Bot with id 9 not found")
+
+    with pytest.raises(HTTPException):
+        dashboard._cached(("equity", 9, 30), missing)
+    assert dashboard._dashboard_cache == {}
+
+
+class FakeRepos:
+    def __init__(self, bots):
+        self.bot = SimpleNamespace(get_active_bots_with_trade_counts=lambda: [(bot, bot.id) for bot in bots])
+        self.db = SimpleNamespace(get_bind=lambda: "engine")
+
+
+@pytest.mark.asyncio
+async def test_bots_summary_runs_concurrently(monkeypatch):
+    bots = [SimpleNamespace(id=i) for i in range(1, 13)]
+    lock = threading.Lock()
+    active = {"now": 0, "max": 0}
+
+    def summarize(bot, trades_count, bind):
+        assert bind == "engine"
+        assert trades_count == bot.id
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        return {
+            "id": bot.id, "name": f"b{bot.id}", "display_name": None, "trading_mode": "paper",
+            "performance": {}, "recent_trades_count": 0, "last_active_at": None,
+        }
+
+    monkeypatch.setattr(dashboard, "_summarize_bot", summarize)
+    monkeypatch.setattr(dashboard.bot_manager, "list_running", lambda: {})
+
+    response = await dashboard.get_all_bots_summary(api_key="k", repos=FakeRepos(bots))
+    assert [bot["id"] for bot in response.data] == list(range(1, 13))
+    assert 1 < active["max"] <= dashboard._SUMMARY_CONCURRENCY
+
+    # 第二次命中缓存，不再计算
+    monkeypatch.setattr(dashboard, "_summarize_bot", None)
+    response = await dashboard.get_all_bots_summary(api_key="k", repos=FakeRepos(bots))
+    assert len(response.data) == 12
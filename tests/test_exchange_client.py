@@ -0,0 +1,232 @@
+# tests/test_exchange_client.py
+"""
+测试 API 侧 ccxt 客户端缓存（按配置复用、配置变更、失效与关闭、使用中延迟关闭）、并发查询合并与结果/ticker 短时缓存
+"""
+import asyncio
+
+import pytest
+
+from langtrader_api.services import exchange_client
+
+
+class FakeExchange:
+    def __init__(self, ex):
+        self.ex = ex
+        self.calls = 0
+        self.ticker_calls = 0
+        self.closed = False
+        # 设置后 fetch_balance 会等待该事件，模拟慢查询
+        self.gate = None
+
+    async def fetch_balance(self, params=None):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.closed:
+            raise RuntimeError("session closed")
+        if self.ex.get("fail"):
+            raise ConnectionError("exchange down")
+        return {"total": {"USDT": 1.0}, "params": params}
+
+    async def fetch_positions(self, params=None):
+        self.calls += 1
+        return [{"symbol": "BTC/USDT:USDT", "contracts": 1.0, "markPrice": 0}]
+
+    async def fetch_tickers(self, symbols):
+        self.ticker_calls += 1
+        return {symbol: {"last": 100.0} for symbol in symbols}
+
+    async def close(self):
+        self.closed = True
+
+
+def make_ex(**kwargs):
+    ex = {"id": 1, "type": "binance", "apikey": "k", "secretkey": "s", "uid": None, "password": None, "testnet": False}
+    ex.update(kwargs)
+    return ex
+
+
+@pytest.fixture(autouse=True)
+def fake_ccxt(monkeypatch):
+    created = []
+
+    def create(ex):
+        created.append(FakeExchange(ex))
+        return created[-1]
+
+    monkeypatch.setattr(exchange_client, "create_ccxt_instance", create)
+    exchange_client._clients.clear()
+    exchange_client._inflight.clear()
+    exchange_client._results.clear()
+    exchange_client._tickers.clear()
+    yield created
+    exchange_client._clients.clear()
+    exchange_client._inflight.clear()
+    exchange_client._results.clear()
+    exchange_client._tickers.clear()
+    exchange_client._client_users.clear()
+    exchange_client._retired.clear()
+
+
+async def start_slow_fetch(fake_ccxt, ex):
+    """启动一个挂起在交易所调用中的余额查询，返回 (task, 客户端, 放行事件)"""
+    gate = asyncio.Event()
+    client = await exchange_client._get_client(ex)
+    client.gate = gate
+    task = asyncio.ensure_future(exchange_client.fetch_balance(ex))
+    while not client.calls:
+        await asyncio.sleep(0)
+    return task, client, gate
+
+
+@pytest.mark.asyncio
+async def test_client_reused_for_same_config(fake_ccxt):
+    await exchange_client.fetch_balance(make_ex())
+    await exchange_client.fetch_balance(make_ex(), fresh=True)
+    assert len(fake_ccxt) == 1
+    assert fake_ccxt[0].calls == 2
+
+
+@pytest.mark.asyncio
+async def test_config_change_creates_new_client(fake_ccxt):
+    await exchange_client.fetch_balance(make_ex())
+    await exchange_client.fetch_balance(make_ex(secretkey="rotated"))
+    assert len(fake_ccxt) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_clients(fake_ccxt):
+    await exchange_client.fetch_balance(make_ex())
+    await exchange_client.fetch_balance(make_ex(id=2))
+    await exchange_client.invalidate(1)
+    assert [key[0] for key in exchange_client._clients] == [2]
+    assert fake_ccxt[0].closed
+    await exchange_client.fetch_balance(make_ex())
+    assert len(fake_ccxt) == 3
+
+
+@pytest.mark.asyncio
+async def test_evicted_client_closed(fake_ccxt, monkeypatch):
+    monkeypatch.setattr(exchange_client, "_CLIENT_CACHE_SIZE", 1)
+    await exchange_client.fetch_balance(make_ex())
+    await exchange_client.fetch_balance(make_ex(id=2))
+    assert fake_ccxt[0].closed and not fake_ccxt[1].closed
+    await exchange_client.close_all()
+    assert fake_ccxt[1].closed and not exchange_client._clients
+
+
+@pytest.mark.asyncio
+async def test_evicted_client_in_use_closed_after_call(fake_ccxt, monkeypatch):
+    monkeypatch.setattr(exchange_client, "_CLIENT_CACHE_SIZE", 1)
+    task, client, gate = await start_slow_fetch(fake_ccxt, make_ex())
+    await exchange_client.fetch_balance(make_ex(id=2))
+    assert not client.closed
+    gate.set()
+    assert (await task)["total"] == {"USDT": 1.0}
+    assert client.closed
+    assert not exchange_client._client_users and not exchange_client._retired
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_call(fake_ccxt):
+    task, client, gate = await start_slow_fetch(fake_ccxt, make_ex())
+    await exchange_client.invalidate(1)
+    assert not client.closed
+    assert not exchange_client._inflight
+
+    # 失效后的新请求不复用旧查询，使用新客户端
+    assert (await exchange_client.fetch_balance(make_ex(secretkey="rotated")))["total"] == {"USDT": 1.0}
+    assert len(fake_ccxt) == 2
+
+    gate.set()
+    await task
+    assert client.closed
+    # 旧查询的结果不写入缓存
+    assert [key[4] for key in exchange_client._results] == ["rotated"]
+
+
+@pytest.mark.asyncio
+async def test_hyperliquid_passes_user(fake_ccxt):
+    balance = await exchange_client.fetch_balance(make_ex(type="hyperliquid", apikey="0xabc"))
+    assert balance["params"] == {"user": "0xabc"}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_fetch(fake_ccxt):
+    results = await asyncio.gather(*(exchange_client.fetch_balance(make_ex()) for _ in range(5)))
+    assert fake_ccxt[0].calls == 1
+    assert all(r is results[0] for r in results)
+    assert not exchange_client._inflight
+    await exchange_client.fetch_balance(make_ex(), fresh=True)
+    assert fake_ccxt[0].calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_failure_propagates_to_all(fake_ccxt):
+    results = await asyncio.gather(
+        *(exchange_client.fetch_balance(make_ex(fail=True)) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert fake_ccxt[0].calls == 1
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert not exchange_client._inflight
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_fetch(fake_ccxt):
+    first = asyncio.ensure_future(exchange_client.fetch_balance(make_ex()))
+    second = asyncio.ensure_future(exchange_client.fetch_balance(make_ex()))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert (await second)["total"] == {"USDT": 1.0}
+    assert fake_ccxt[0].calls == 1
+
+
+@pytest.mark.asyncio
+async def test_result_cached_within_ttl(fake_ccxt):
+    first = await exchange_client.fetch_balance(make_ex())
+    assert await exchange_client.fetch_balance(make_ex()) is first
+    assert fake_ccxt[0].calls == 1
+    await exchange_client.fetch_balance(make_ex(), fresh=True)
+    assert fake_ccxt[0].calls == 2
+
+
+@pytest.mark.asyncio
+async def test_result_expires_after_ttl(fake_ccxt, monkeypatch):
+    monkeypatch.setattr(exchange_client, "_RESULT_TTL", 0)
+    await exchange_client.fetch_balance(make_ex())
+    await exchange_client.fetch_balance(make_ex())
+    assert fake_ccxt[0].calls == 2
+
+
+@pytest.mark.asyncio
+async def test_failure_not_cached(fake_ccxt):
+    with pytest.raises(ConnectionError):
+        await exchange_client.fetch_balance(make_ex(fail=True))
+    assert not exchange_client._results
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_cached_results(fake_ccxt):
+    await exchange_client.fetch_balance(make_ex())
+    await exchange_client.fetch_balance(make_ex(id=2))
+    await exchange_client.invalidate(1)
+    assert [key[1] for key in exchange_client._results] == [2]
+
+
+@pytest.mark.asyncio
+async def test_tickers_cached_across_position_fetches(fake_ccxt):
+    first = await exchange_client.fetch_positions(make_ex())
+    exchange_client._results.clear()
+    second = await exchange_client.fetch_positions(make_ex(id=2))
+    assert first[0]["markPrice"] == second[0]["markPrice"] == 100.0
+    assert [client.ticker_calls for client in fake_ccxt] == [1, 0]
+
+
+@pytest.mark.asyncio
+async def test_fresh_positions_refetch_tickers(fake_ccxt):
+    await exchange_client.fetch_positions(make_ex())
+    await exchange_client.fetch_positions(make_ex(), fresh=True)
+    assert fake_ccxt[0].calls == 2
+    assert fake_ccxt[0].ticker_calls == 2
@@ -0,0 +1,40 @@
+"""
+Unit tests for debate role loading (system_configs debate.roles)
+"""
+import sys
+from pathlib import Path
+
+# Add project to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "packages"))
+
+from langtrader_core.data.default_configs import DEBATE_ROLES_JSON
+from langtrader_core.graph.nodes.debate_decision import DebateDecisionNode, DebateRole
+
+
+def load_roles(db_config):
+    # _load_debate_roles 不依赖实例状态，跳过 __init__ 的数据库/LLM 初始化
+    node = DebateDecisionNode.__new__(DebateDecisionNode)
+    return node._load_debate_roles(db_config)
+
+
+def test_default_roles_json_decodes():
+    roles = load_roles({'debate.roles': DEBATE_ROLES_JSON})
+    assert [r.id for r in roles] == ["analyst", "bull", "bear", "risk_manager"]
+    assert all(isinstance(r, DebateRole) for r in roles)
+    assert roles[0].focus
+
+
+def test_parsed_list_accepted():
+    roles = load_roles({'debate.roles': [{"id": "bull", "name": "多头", "priority": 2}]})
+    assert roles == [DebateRole(id="bull", name="多头", priority=2)]
+
+
+def test_invalid_config_falls_back_to_defaults():
+    for bad in ('not json', '[{"name": "missing id"}]'):
+        roles = load_roles({'debate.roles': bad})
+        assert [r.id for r in roles] == ["analyst", "bull", "bear", "risk_manager"]
+
+
+def test_missing_config_uses_defaults():
+    assert len(load_roles({})) == 4
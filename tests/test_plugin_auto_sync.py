@@ -0,0 +1,75 @@
+# tests/test_plugin_auto_sync.py
+"""
+测试插件自动同步（autocommit=False 时单个插件写入失败只跳过该插件，其余写入仍可提交）
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import JSON, DateTime, event, text
+from sqlmodel import Session, create_engine
+
+from langtrader_core.data.models.workflow import Workflow, WorkflowNode, NodeConfig, WorkflowEdge
+from langtrader_core.plugins.auto_sync import PluginAutoSync
+from langtrader_core.plugins.protocol import NodeMetadata
+from langtrader_core.plugins.registry import registry
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    models = (Workflow, WorkflowNode, NodeConfig, WorkflowEdge)
+    # SQLite 没有 ARRAY 类型，tags 列按 JSON 建表；时间列用普通 DateTime 存本地时间
+    monkeypatch.setattr(Workflow.__table__.c.tags, "type", JSON())
+    for model in models:
+        for column in model.__table__.c:
+            if column.name.endswith("_at"):
+                monkeypatch.setattr(column, "type", DateTime())
+    engine = create_engine("sqlite://")
+
+    # pysqlite 默认不支持 SAVEPOINT，需要自己发 BEGIN（SQLAlchemy 文档中的做法）
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+    for model in models:
+        model.__table__.create(engine)
+    with engine.begin() as connection:
+        # 模拟某个插件的节点写入失败
+        connection.execute(text(
+            "CREATE TRIGGER reject_bad BEFORE INSERT ON workflow_nodes WHEN NEW.name = 'bad' "
+            "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        ))
+    return engine
+
+
+@pytest.fixture
+def plugins(monkeypatch):
+    metadata = {
+        name: NodeMetadata(name=name, display_name=name, version="1.0.0", author="test",
+                           suggested_order=order, auto_register=True)
+        for order, name in enumerate(["first", "bad", "second"])
+    }
+    monkeypatch.setattr(registry, "_metadata", metadata)
+
+
+def test_failed_node_does_not_discard_transaction(engine, plugins):
+    with Session(engine) as db:
+        now = datetime.now()
+        workflow = Workflow(name="default", display_name="Default", version="1.0.0", created_at=now, updated_at=now)
+        db.add(workflow)
+        db.flush()
+
+        stats = PluginAutoSync(db).sync_if_needed(workflow.id, autocommit=False)
+        db.commit()
+
+    assert stats["added"] == 2
+    assert stats["failed"] == 1
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM workflows")).scalar() == 1
+        nodes = connection.execute(text("SELECT name FROM workflow_nodes ORDER BY execution_order")).scalars().all()
+        edges = connection.execute(text("SELECT from_node, to_node FROM workflow_edges ORDER BY id")).all()
+    assert nodes == ["first", "second"]
+    assert [tuple(edge) for edge in edges] == [("START", "first"), ("first", "second"), ("second", "END")]
@@ -0,0 +1,83 @@
+# tests/test_trade_stats.py
+"""
+测试 TradeHistoryRepository 的聚合统计（GROUP BY 在数据库中完成）
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlmodel import Session, create_engine
+
+import langtrader_core.data.models  # noqa: F401  注册 trade_history 外键引用的 bots 表
+from langtrader_core.data.models.trade_history import TradeHistory
+from langtrader_core.data.repositories.trade_history import TradeHistoryRepository
+
+NOW = datetime(2026, 10, 14, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def repo():
+    engine = create_engine("sqlite://")
+    TradeHistory.__table__.create(engine)
+    with Session(engine) as session:
+        yield TradeHistoryRepository(session)
+
+
+def add(repo, bot_id, symbol, status, pnl, hours_ago):
+    repo.session.add(TradeHistory(
+        bot_id=bot_id, symbol=symbol, side="long", action="open_long", amount=Decimal("1"),
+        status=status, pnl_usd=None if pnl is None else Decimal(str(pnl)),
+        opened_at=NOW - timedelta(hours=hours_ago),
+    ))
+    repo.session.commit()
+
+
+@pytest.fixture
+def trades(repo):
+    add(repo, 1, "BTC/USDT", "closed", 10, 1)
+    add(repo, 1, "BTC/USDT", "closed", -4, 2)
+    add(repo, 1, "ETH/USDT", "open", None, 3)
+    add(repo, 1, "ETH/USDT", "closed", None, 30)
+    add(repo, 1, "SOL/USDT", "closed", 5, 50)
+    add(repo, 2, "BTC/USDT", "closed", -20, 1)
+    add(repo, 2, "BTC/USDT", "open", None, 200)
+    return repo
+
+
+def test_daily_stats(trades):
+    stats = trades.daily_stats(1, NOW - timedelta(days=7))
+    assert stats["2026-10-14"] == {"trades": 3, "wins": 1, "losses": 1, "pnl": 6.0}
+    assert stats["2026-10-13"] == {"trades": 1, "wins": 0, "losses": 0, "pnl": 0.0}
+    assert stats["2026-10-12"]["pnl"] == 5.0
+    assert trades.daily_stats(1, NOW - timedelta(hours=2, minutes=30))["2026-10-14"]["trades"] == 2
+
+
+def test_symbol_stats_order(trades):
+    stats = trades.symbol_stats(1, NOW - timedelta(days=7))
+    # BTC 和 ETH 都是 2 笔，BTC 最近交易过排在前面
+    assert [symbol for symbol, _ in stats] == ["BTC/USDT", "ETH/USDT", "SOL/USDT"]
+    assert stats[0][1] == {"trades": 2, "wins": 1, "losses": 1, "pnl": 6.0}
+
+
+def test_overview_stats(trades):
+    stats = trades.overview_stats(NOW.replace(hour=0))
+    assert stats == {
+        "trades": 7,
+        "today_trades": 4,
+        "open_trades": 2,
+        "closed_trades": 4,
+        "winning_trades": 2,
+        "total_pnl": -9.0,
+        "today_pnl": -14.0,
+    }
+
+
+def test_closed_window_stats(trades):
+    all_time, recent = trades.closed_window_stats([None, NOW - timedelta(days=1)])
+    assert all_time == {"trades": 5, "pnl": -9.0, "wins": 2}
+    assert recent == {"trades": 3, "pnl": -14.0, "wins": 1}
+
+
+def test_closed_pnl_by_bot(trades):
+    assert trades.closed_pnl_by_bot() == [(1, 4, 11.0), (2, 1, -20.0)]
+    assert trades.count_by_status("open") == 2
@@ -0,0 +1,99 @@
+# tests/test_ws_status_publisher.py
+"""
+测试 WebSocket bot 状态推送（只向有订阅者的频道推送变化）
+"""
+import importlib
+
+import pytest
+
+from langtrader_api.websocket.manager import WSManager
+
+publisher_module = importlib.import_module("langtrader_api.websocket.status_publisher")
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+
+@pytest.fixture
+def statuses(monkeypatch):
+    statuses = {}
+
+    def full_status(bot_id):
+        return {
+            "bot_id": bot_id,
+            "is_running": statuses.get(bot_id, {}).get("state") == "running",
+            "process_info": None,
+            "runtime_status": statuses.get(bot_id),
+        }
+
+    monkeypatch.setattr(publisher_module.bot_manager, "get_bot_full_status", full_status)
+    return statuses
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = WSManager()
+    monkeypatch.setattr(publisher_module, "ws_manager", manager)
+    return manager
+
+
+async def connect(manager, connection_id, channel):
+    ws = FakeWebSocket()
+    await manager.connect(ws, connection_id, api_key="k")
+    await manager.subscribe(connection_id, channel)
+    ws.sent.clear()
+    return ws
+
+
+@pytest.mark.asyncio
+async def test_pushes_only_changes(manager, statuses):
+    ws = await connect(manager, "c1", "bot:1:status")
+    publisher = publisher_module.StatusPublisher()
+    statuses[1] = {"state": "running", "cycle": 1}
+
+    await publisher.publish_changes()
+    await publisher.publish_changes()
+    assert len(ws.sent) == 1
+    assert ws.sent[0]["event"] == "bot_started"
+    assert ws.sent[0]["channel"] == "bot:1:status"
+    assert ws.sent[0]["data"]["cycle"] == 1
+
+    statuses[1] = {"state": "running", "cycle": 2}
+    await publisher.publish_changes()
+    assert len(ws.sent) == 2
+    assert ws.sent[1]["data"]["cycle"] == 2
+
+
+@pytest.mark.asyncio
+async def test_skips_bots_without_subscribers(manager, statuses):
+    await connect(manager, "c1", "bot:1:trades")
+    publisher = publisher_module.StatusPublisher()
+    await publisher.publish_changes()
+    assert publisher._last == {}
+
+
+@pytest.mark.asyncio
+async def test_stops_tracking_after_unsubscribe(manager, statuses):
+    await connect(manager, "c1", "bot:1:status")
+    publisher = publisher_module.StatusPublisher()
+    await publisher.publish_changes()
+    assert 1 in publisher._last
+    await manager.disconnect("c1")
+    await publisher.publish_changes()
+    assert publisher._last == {}
+
+
+def test_stopped_bot_message(statuses):
+    statuses[2] = {"state": "error", "last_error": "boom"}
+    message = publisher_module.bot_status_message(2)
+    assert message.event.value == "bot_error"
+    assert message.data["status"] == "error"
+    assert message.data["message"] == "boom"